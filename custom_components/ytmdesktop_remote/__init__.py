@@ -5,38 +5,105 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform, CONF_HOST, CONF_PASSWORD
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
-from aioytmdesktopapi import YtmDesktop
-
+from .artwork import async_remove_artwork_cache
+from .client import ConnectionStats, YtmdClient, create_session
 from .const import DOMAIN
 from .coordinator import YtmdCoordinator
+from .history import PlayHistory
+from .hub import async_get_hub
+from .last_state import LastStateStore
+from .services import async_setup_services
+
+PLATFORMS: list[Platform] = [
+    Platform.BINARY_SENSOR,
+    Platform.MEDIA_PLAYER,
+    Platform.SENSOR,
+]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
-PLATFORMS: list[Platform] = [Platform.MEDIA_PLAYER]
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the YouTube Music Desktop Remote Control services."""
+    async_setup_services(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up YouTube Music Desktop Remote Control from a config entry."""
-    api = YtmDesktop(
-        async_get_clientsession(hass),
+    # Dedicated session for the API, the realtime channel uses the shared one
+    stats = ConnectionStats()
+    api = YtmdClient(
+        create_session(stats),
         entry.data[CONF_HOST],
         entry.data.get(CONF_PASSWORD, None),
+        stats,
     )
+    # The session is renewed while updates are suspended, close the latest
+    entry.async_on_unload(lambda: api.session.close())
 
-    coordinator = YtmdCoordinator(hass, api)
-    await coordinator.async_config_entry_first_refresh()
+    history = PlayHistory(hass, entry.entry_id)
+    await history.async_load()
 
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = coordinator
+    # All config entries are polled by the same hub
+    hub = async_get_hub(hass)
+    coordinator = YtmdCoordinator(
+        hass,
+        api,
+        async_get_clientsession(hass),
+        hub,
+        LastStateStore(hass, entry.entry_id),
+        history,
+    )
+    if coordinator.dormant:
+        # Left alone until a command needs it, only show the last known state
+        await coordinator.async_restore_last_state()
+    elif await coordinator.async_restore_last_state():
+        # Known desktop, do not hold up startup when it is off or slow.
+        # Entities show the last known state until the refresh is done.
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
+    hub.coordinators[entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # Suspended right away when all entities are disabled or it is dormant
+    coordinator.async_start()
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
     return True
 
 
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options by reloading the config entry."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        hub = hass.data[DOMAIN]
+        coordinator = hub.coordinators.pop(entry.entry_id)
+        hub.groups.async_unjoin(entry.entry_id)
         await coordinator.api.close()
+        if not hub.coordinators:
+            hass.data.pop(DOMAIN)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored state and history of a removed config entry."""
+    await LastStateStore(hass, entry.entry_id).async_remove()
+    await PlayHistory(hass, entry.entry_id).async_remove()
+    # The covers are shared, keep them while other entries remain
+    if all(
+        other.entry_id == entry.entry_id
+        for other in hass.config_entries.async_entries(DOMAIN)
+    ):
+        await async_remove_artwork_cache(hass)
@@ -0,0 +1,168 @@
+"""Artwork cache for the YouTube Music Desktop Remote Control integration.
+
+Covers are fetched once and kept in a size bounded LRU in memory with a
+bounded on-disk tier below it. They are served to the frontend through
+the media player image proxy, so clients do not each fetch them from the CDN.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+import hashlib
+import os
+import shutil
+
+import aiohttp
+import async_timeout
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.singleton import singleton
+
+from .const import (
+    ARTWORK_CACHE_MAX_BYTES,
+    ARTWORK_DISK_MAX_FILES,
+    ARTWORK_FETCH_TIMEOUT,
+    DOMAIN,
+    LOGGER,
+)
+
+DATA_ARTWORK_CACHE = f"{DOMAIN}_artwork"
+# Outside .storage, covers can be fetched again and do not belong in backups
+ARTWORK_CACHE_DIR = (".cache", DOMAIN, "artwork")
+
+Image = tuple[bytes, str]
+
+
+class ArtworkCache:
+    """Two tier cache for cover art."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        session: aiohttp.ClientSession,
+        path: str,
+        max_bytes: int = ARTWORK_CACHE_MAX_BYTES,
+        max_files: int = ARTWORK_DISK_MAX_FILES,
+    ) -> None:
+        self._hass = hass
+        self._session = session
+        self._path = path
+        self._max_bytes = max_bytes
+        self._max_files = max_files
+
+        self._memory: OrderedDict[str, Image] = OrderedDict()
+        self._memory_bytes = 0
+        self._loading: dict[str, asyncio.Task[Image | None]] = {}
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.fetches = 0
+
+    async def async_get(self, url: str) -> tuple[bytes | None, str | None]:
+        """Return the image and its content type."""
+        if (image := self._memory.get(url)) is not None:
+            self._memory.move_to_end(url)
+            self.memory_hits += 1
+            return image
+
+        # Concurrent requests for the same cover share a single load
+        if (task := self._loading.get(url)) is None:
+            task = self._hass.async_create_task(self._async_load(url))
+            self._loading[url] = task
+            task.add_done_callback(lambda _: self._loading.pop(url, None))
+
+        if (image := await asyncio.shield(task)) is None:
+            return None, None
+        return image
+
+    @callback
+    def async_prefetch(self, url: str) -> None:
+        """Load the image in the background, if not cached already."""
+        if url in self._memory or url in self._loading:
+            return
+        self._hass.async_create_background_task(
+            self.async_get(url), f"{DOMAIN} prefetch artwork"
+        )
+
+    async def _async_load(self, url: str) -> Image | None:
+        filename = os.path.join(self._path, hashlib.sha256(url.encode()).hexdigest())
+
+        image = await self._hass.async_add_executor_job(_read_file, filename)
+        if image is not None:
+            self.disk_hits += 1
+        else:
+            if (image := await self._async_fetch(url)) is None:
+                return None
+            await self._hass.async_add_executor_job(
+                _write_file, self._path, filename, image, self._max_files
+            )
+
+        self._store_in_memory(url, image)
+        return image
+
+    async def _async_fetch(self, url: str) -> Image | None:
+        self.fetches += 1
+        try:
+            async with async_timeout.timeout(ARTWORK_FETCH_TIMEOUT):
+                async with self._session.get(url) as response:
+                    response.raise_for_status()
+                    content = await response.read()
+                    content_type = response.content_type
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            LOGGER.debug("Unable to fetch artwork %s: %s", url, err)
+            return None
+        return content, content_type
+
+    def _store_in_memory(self, url: str, image: Image) -> None:
+        self._memory[url] = image
+        self._memory_bytes += len(image[0])
+        while self._memory_bytes > self._max_bytes and len(self._memory) > 1:
+            _, (content, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(content)
+
+
+def _read_file(filename: str) -> Image | None:
+    try:
+        with open(filename, "rb") as file:
+            data = file.read()
+    except FileNotFoundError:
+        return None
+
+    # Mark as recently used for disk eviction
+    os.utime(filename)
+    content_type, _, content = data.partition(b"\n")
+    return content, content_type.decode()
+
+
+def _write_file(path: str, filename: str, image: Image, max_files: int) -> None:
+    content, content_type = image
+    os.makedirs(path, exist_ok=True)
+    with open(filename, "wb") as file:
+        file.write(content_type.encode() + b"\n" + content)
+
+    entries = list(os.scandir(path))
+    if len(entries) > max_files:
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[: len(entries) - max_files]:
+            os.remove(entry.path)
+
+
+@callback
+@singleton(DATA_ARTWORK_CACHE)
+def async_get_artwork_cache(hass: HomeAssistant) -> ArtworkCache:
+    """Get the artwork cache shared by all config entries."""
+    return ArtworkCache(
+        hass,
+        async_get_clientsession(hass),
+        hass.config.path(*ARTWORK_CACHE_DIR),
+    )
+
+
+async def async_remove_artwork_cache(hass: HomeAssistant) -> None:
+    """Remove the cached covers from disk."""
+    hass.data.pop(DATA_ARTWORK_CACHE, None)
+    await hass.async_add_executor_job(
+        shutil.rmtree, hass.config.path(*ARTWORK_CACHE_DIR), True
+    )
@@ -0,0 +1,40 @@
+"""Binary sensors for the YouTube Music Desktop Remote Control integration."""
+
+from __future__ import annotations
+
+from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+from .coordinator import YtmdCoordinator
+from .entity import YtmdFieldEntity
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    coordinator: YtmdCoordinator = hass.data[DOMAIN].coordinators[config_entry.entry_id]
+    async_add_entities([YtmdPlayingBinarySensor(coordinator, config_entry.entry_id)])
+
+
+class YtmdPlayingBinarySensor(YtmdFieldEntity, BinarySensorEntity):
+    """Binary sensor that is on while YTMD plays."""
+
+    _attr_icon = "mdi:play"
+    _attr_name = "Playing"
+
+    def __init__(self, coordinator: YtmdCoordinator, configentry_id: str) -> None:
+        super().__init__(coordinator, configentry_id)
+        self._attr_unique_id = f"{configentry_id}_playing"
+
+    def _read_value(self) -> bool:
+        projection = self.coordinator.projection
+        return projection is not None and projection.playing
+
+    @property
+    def is_on(self) -> bool:
+        return self._value
@@ -0,0 +1,65 @@
+"""Circuit breaker for the YouTube Music Desktop Remote Control integration."""
+
+from __future__ import annotations
+
+import datetime
+from enum import StrEnum
+
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_PROBE_INTERVAL_MAX,
+    BREAKER_PROBE_INTERVAL_MIN,
+)
+
+
+class BreakerState(StrEnum):
+    """State of the circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+
+
+class CircuitBreaker:
+    """Stop regular polling of a YTMD instance that keeps failing.
+
+    While open the instance only gets probed, with a growing interval.
+    The first successful request closes the breaker again.
+    """
+
+    def __init__(
+        self,
+        threshold: int = BREAKER_FAILURE_THRESHOLD,
+        probe_interval_min: datetime.timedelta = BREAKER_PROBE_INTERVAL_MIN,
+        probe_interval_max: datetime.timedelta = BREAKER_PROBE_INTERVAL_MAX,
+    ) -> None:
+        self._threshold = threshold
+        self._probe_interval_min = probe_interval_min
+        self._probe_interval_max = probe_interval_max
+        self._probe_interval = probe_interval_min
+
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.opened = 0
+
+    def failed(self) -> datetime.timedelta | None:
+        """Register a failure, returns the probe interval when open."""
+        self.failures += 1
+        if self.failures < self._threshold:
+            return None
+
+        if self.state is BreakerState.CLOSED:
+            self.state = BreakerState.OPEN
+            self.opened += 1
+            self._probe_interval = self._probe_interval_min
+            return self._probe_interval
+
+        self._probe_interval = min(self._probe_interval * 2, self._probe_interval_max)
+        return self._probe_interval
+
+    def succeeded(self) -> bool:
+        """Register a success, returns True when this closed the breaker."""
+        self.failures = 0
+        if self.state is BreakerState.CLOSED:
+            return False
+        self.state = BreakerState.CLOSED
+        return True
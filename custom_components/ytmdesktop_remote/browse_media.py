@@ -0,0 +1,225 @@
+"""Media browser for the YouTube Music Desktop Remote Control integration.
+
+The queue and playlists are requested when first browsed and the browse
+tree is kept until the track changes. Long queues are split in pages, a page
+is only built when expanded. Thumbnails are served from the artwork cache,
+the frontend might still show them after the track changed.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable
+import hashlib
+from typing import Any
+
+import aioytmdesktopapi
+
+from homeassistant.components.media_player import (
+    BrowseError,
+    BrowseMedia,
+    MediaClass,
+    MediaType,
+)
+
+from .const import BROWSE_MAX_COVERS, BROWSE_PAGE_SIZE
+from .coordinator import YtmdCoordinator
+
+ROOT = "root"
+QUEUE = "queue"
+QUEUE_PAGE = "queue_page"
+PLAYLISTS = "playlists"
+
+# Builds the image proxy url from a content type, content id and image id
+ThumbnailUrl = Callable[[str, str, str], str]
+
+
+def queue_index(media_content_id: str) -> int | None:
+    """Index of the track in the queue, None if the id is not a queued track."""
+    kind, _, index = media_content_id.partition("/")
+    if kind != QUEUE or not index.isdigit():
+        return None
+    return int(index)
+
+
+class MediaBrowser:
+    """Browse tree of a YTMD instance, kept while the same track plays."""
+
+    def __init__(
+        self,
+        coordinator: YtmdCoordinator,
+        thumbnail_url: ThumbnailUrl,
+        page_size: int = BROWSE_PAGE_SIZE,
+        max_covers: int = BROWSE_MAX_COVERS,
+    ) -> None:
+        self._coordinator = coordinator
+        self._thumbnail_url = thumbnail_url
+        self._page_size = page_size
+        self._max_covers = max_covers
+
+        self._tree_key: tuple[Any, ...] | None = None
+        self._nodes: dict[str, BrowseMedia] = {}
+        self._queue: list[dict[str, Any]] | None = None
+        # Least recently used first
+        self._covers: OrderedDict[str, str] = OrderedDict()
+
+    def cover_url(self, media_image_id: str) -> str | None:
+        """Url of a thumbnail handed out while browsing."""
+        if (url := self._covers.get(media_image_id)) is not None:
+            self._covers.move_to_end(media_image_id)
+        return url
+
+    async def async_browse(self, media_content_id: str | None) -> BrowseMedia:
+        media_content_id = media_content_id or ROOT
+        self._invalidate_on_track_change()
+        if (node := self._nodes.get(media_content_id)) is not None:
+            return node
+
+        kind, _, page = media_content_id.partition("/")
+        if media_content_id == ROOT:
+            node = self._root()
+        elif media_content_id == QUEUE:
+            node = await self._async_queue(None)
+        elif kind == QUEUE_PAGE and page.isdigit():
+            node = await self._async_queue(int(page))
+        elif media_content_id == PLAYLISTS:
+            node = await self._async_playlists()
+        else:
+            raise BrowseError(f"Media not found: {media_content_id}")
+
+        self._nodes[media_content_id] = node
+        return node
+
+    def _invalidate_on_track_change(self) -> None:
+        state = self._coordinator.api.state or {}
+        track = state.get("track") or {}
+        queue = state.get("queue") or {}
+        tree_key = (
+            track.get("id"),
+            track.get("title"),
+            queue.get("currentIndex"),
+            len(queue.get("list") or ()),
+        )
+        if tree_key != self._tree_key:
+            self._tree_key = tree_key
+            self._nodes.clear()
+            self._queue = None
+
+    def _root(self) -> BrowseMedia:
+        return BrowseMedia(
+            media_class=MediaClass.DIRECTORY,
+            media_content_id=ROOT,
+            media_content_type=MediaType.APPS,
+            title="YouTube Music Desktop",
+            can_play=False,
+            can_expand=True,
+            children=[
+                _directory(QUEUE, "Queue", MediaType.PLAYLIST),
+                _directory(PLAYLISTS, "Playlists", MediaType.PLAYLIST),
+            ],
+            children_media_class=MediaClass.DIRECTORY,
+        )
+
+    async def _async_queue(self, page: int | None) -> BrowseMedia:
+        queue = await self._async_get_queue()
+        pages = max((len(queue) + self._page_size - 1) // self._page_size, 1)
+
+        if page is None and pages > 1:
+            # Only the pages, their tracks are built when expanded
+            children = [
+                _directory(
+                    f"{QUEUE_PAGE}/{number}",
+                    f"Tracks {number * self._page_size + 1}-"
+                    f"{min((number + 1) * self._page_size, len(queue))}",
+                    MediaType.PLAYLIST,
+                )
+                for number in range(pages)
+            ]
+            return _directory(QUEUE, "Queue", MediaType.PLAYLIST, children)
+
+        if page is not None and page >= pages:
+            raise BrowseError(f"Media not found: {QUEUE_PAGE}/{page}")
+        start = (page or 0) * self._page_size
+        children = [
+            self._track(index, queue[index])
+            for index in range(start, min(start + self._page_size, len(queue)))
+        ]
+        media_content_id = QUEUE if page is None else f"{QUEUE_PAGE}/{page}"
+        node = _directory(media_content_id, "Queue", MediaType.PLAYLIST, children)
+        node.children_media_class = MediaClass.TRACK
+        return node
+
+    async def _async_get_queue(self) -> list[dict[str, Any]]:
+        if self._queue is None:
+            with self._coordinator.stats.measure("browse"):
+                try:
+                    queue = await self._coordinator.api.queue()
+                except aioytmdesktopapi.RequestError as err:
+                    raise BrowseError(f"Unable to get the queue: {err}") from err
+            self._queue = queue.get("list") or []
+        return self._queue
+
+    def _track(self, index: int, item: dict[str, Any]) -> BrowseMedia:
+        media_content_id = f"{QUEUE}/{index}"
+        thumbnail = None
+        if cover := item.get("cover"):
+            media_image_id = hashlib.sha256(cover.encode()).hexdigest()
+            self._covers[media_image_id] = cover
+            self._covers.move_to_end(media_image_id)
+            if len(self._covers) > self._max_covers:
+                self._covers.popitem(last=False)
+            thumbnail = self._thumbnail_url(
+                MediaType.TRACK, media_content_id, media_image_id
+            )
+        title = item.get("title") or ""
+        if author := item.get("author"):
+            title = f"{title} - {author}"
+        return BrowseMedia(
+            media_class=MediaClass.TRACK,
+            media_content_id=media_content_id,
+            media_content_type=MediaType.TRACK,
+            title=title,
+            can_play=True,
+            can_expand=False,
+            thumbnail=thumbnail,
+        )
+
+    async def _async_playlists(self) -> BrowseMedia:
+        with self._coordinator.stats.measure("browse"):
+            try:
+                playlists = await self._coordinator.api.playlists()
+            except aioytmdesktopapi.RequestError as err:
+                raise BrowseError(f"Unable to get the playlists: {err}") from err
+
+        # YTMD has no command to start a playlist, they can only be listed
+        children = [
+            BrowseMedia(
+                media_class=MediaClass.PLAYLIST,
+                media_content_id=f"{PLAYLISTS}/{index}",
+                media_content_type=MediaType.PLAYLIST,
+                title=name,
+                can_play=False,
+                can_expand=False,
+            )
+            for index, name in enumerate(playlists)
+        ]
+        node = _directory(PLAYLISTS, "Playlists", MediaType.PLAYLIST, children)
+        node.children_media_class = MediaClass.PLAYLIST
+        return node
+
+
+def _directory(
+    media_content_id: str,
+    title: str,
+    media_content_type: str,
+    children: list[BrowseMedia] | None = None,
+) -> BrowseMedia:
+    return BrowseMedia(
+        media_class=MediaClass.DIRECTORY,
+        media_content_id=media_content_id,
+        media_content_type=media_content_type,
+        title=title,
+        can_play=False,
+        can_expand=True,
+        children=children,
+    )
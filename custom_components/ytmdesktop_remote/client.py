@@ -0,0 +1,241 @@
+"""Client for the YouTube Music Desktop Remote Control integration."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+from aiosignal import Signal
+import aioytmdesktopapi
+from aioytmdesktopapi.player import Player
+from aioytmdesktopapi.track import Track
+
+from homeassistant.util.json import json_loads
+
+from .const import API_CONNECTION_LIMIT, API_KEEPALIVE_TIMEOUT, LOGGER, YTMD_PORT
+from .projection import YtmdState
+
+# Trace callbacks get the session, the trace context and the params
+TraceCallback = Callable[..., Awaitable[None]]
+
+
+@dataclass
+class ConnectionStats:
+    """Statistics of the connections to a YTMD instance."""
+
+    connections_created: int = 0
+    connections_reused: int = 0
+    retries: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+
+
+def create_session(stats: ConnectionStats) -> aiohttp.ClientSession:
+    """Create a session with a connector tuned for talking to a single YTMD."""
+
+    async def on_connection_create_end(
+        session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        stats.connections_created += 1
+
+    async def on_connection_reuseconn(
+        session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        stats.connections_reused += 1
+
+    async def on_request_chunk_sent(
+        session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceRequestChunkSentParams,
+    ) -> None:
+        stats.bytes_sent += len(params.chunk)
+
+    async def on_response_chunk_received(
+        session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceResponseChunkReceivedParams,
+    ) -> None:
+        stats.bytes_received += len(params.chunk)
+
+    trace_config = aiohttp.TraceConfig()
+    callbacks: list[tuple[Signal, TraceCallback]] = [
+        (trace_config.on_connection_create_end, on_connection_create_end),
+        (trace_config.on_connection_reuseconn, on_connection_reuseconn),
+        (trace_config.on_request_chunk_sent, on_request_chunk_sent),
+        (trace_config.on_response_chunk_received, on_response_chunk_received),
+    ]
+    for signal, trace_callback in callbacks:
+        signal.append(trace_callback)
+
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=API_CONNECTION_LIMIT,
+            keepalive_timeout=API_KEEPALIVE_TIMEOUT,
+        ),
+        trace_configs=[trace_config],
+    )
+
+
+def _is_stale_connection(err: aioytmdesktopapi.RequestError) -> bool:
+    # The library hides the original exception, but it is still the context
+    cause = err.__context__
+    return isinstance(cause, aiohttp.ServerDisconnectedError) or (
+        isinstance(cause, aiohttp.ClientOSError)
+        and not isinstance(cause, aiohttp.ClientConnectorError)
+    )
+
+
+class YtmdClient(aioytmdesktopapi.YtmDesktop):
+    """YtmDesktop client that can also be fed state from the realtime channel."""
+
+    def __init__(
+        self,
+        clientsession: aiohttp.ClientSession,
+        host: str,
+        password: str | None = None,
+        stats: ConnectionStats | None = None,
+    ) -> None:
+        super().__init__(clientsession, host, password)
+        self.state: dict[str, Any] | None = None
+        self.projection: YtmdState | None = None
+        self.stats = stats or ConnectionStats()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Session the requests are made with, see renew_session."""
+        return self._clientsession
+
+    def renew_session(self) -> aiohttp.ClientSession:
+        """Replace the session with a new one, returns the old one to close.
+
+        Closing the old session closes its kept alive connections, the new
+        one only connects on the next request. Only for a client with a
+        session of its own, made with create_session.
+        """
+        session = self._clientsession
+        self._clientsession = create_session(self.stats)
+        return session
+
+    async def update(self):
+        if response := await self._request("get", ""):
+            self.apply_state(response)
+
+    async def _request(self, method: str, path: str, data: dict | None = None):
+        try:
+            return await self._request_once(method, path, data)
+        except aioytmdesktopapi.RequestError as err:
+            if method != "get" or not _is_stale_connection(err):
+                raise
+            # YTMD closed the kept alive connection right when it got reused.
+            # It might have handled the request already, so only the state
+            # is requested again. A command like track-next would be done
+            # twice.
+            LOGGER.debug("Retrying %s %s on new connection: %s", method, path, err)
+            self.stats.retries += 1
+            return await self._request_once(method, path, data)
+
+    async def _request_once(self, method: str, path: str, data: dict | None = None):
+        """Same as the request of aioytmdesktopapi, but decodes the body once.
+
+        aioytmdesktopapi decodes every response as text for its debug log
+        and then once more as JSON with the standard library. Here the body
+        is read once and parsed with orjson, through Home Assistant.
+        """
+        if self._clientsession.closed:
+            # Home Assistant is shutting down
+            return None
+        headers = {"Content-Type": "application/json"}
+        if self._password:
+            headers["Authorization"] = f"Bearer {self._password}"
+        url = f"http://{self._host}:{YTMD_PORT}/query{path}"
+        try:
+            async with self._clientsession.request(
+                method, url, json=data, headers=headers
+            ) as resp:
+                body = await resp.read()
+        except aiohttp.ClientError as err:
+            raise aioytmdesktopapi.RequestError(
+                f"Error requesting data from {self._host}: {err}"
+            ) from None
+        LOGGER.debug("%s %s %s: %s %s", method, url, data, resp.status, body)
+        if resp.status == 401:
+            raise aioytmdesktopapi.Unauthorized(f"{resp.status}: {body.decode()}")
+        if resp.status != 200:
+            raise aioytmdesktopapi.RequestError(f"{resp.status}: {body.decode()}")
+        return json_loads(body)
+
+    async def probe(self) -> None:
+        """Check YTMD can be reached and accepts the password, in a single request.
+
+        Only commands need authentication. Showing the hidden lyrics window
+        is a command that does not affect playback.
+        """
+        await self._request("post", "", {"command": "show-lyrics-hidden"})
+
+    async def queue(self) -> dict[str, Any]:
+        """Queue of YTMD, only requested when the state did not include it."""
+        if self.state is not None and "queue" in self.state:
+            return self.state["queue"]
+        return await self._request("get", "/queue")
+
+    async def playlists(self) -> list[str]:
+        """Names of the playlists of the user."""
+        response = await self._request("get", "/playlist")
+        return response["list"]
+
+    async def set_queue(self, index: int) -> None:
+        """Play the track at the index in the queue."""
+        # SendCommand drops falsy values, so the first track could not be picked
+        await self._request("post", "", {"command": "player-set-queue", "value": index})
+
+    async def set_volume(self, percent: int) -> None:
+        """Set the volume in percent."""
+        # SendCommand drops falsy values, so it could not mute
+        await self._request(
+            "post", "", {"command": "player-set-volume", "value": percent}
+        )
+
+    async def set_seekbar(self, position: int) -> None:
+        """Seek to the position in seconds."""
+        # SendCommand drops falsy values, so it could not seek to the start
+        await self._request(
+            "post", "", {"command": "player-set-seekbar", "value": position}
+        )
+
+    @property
+    def next_cover(self) -> str | None:
+        """Cover of the next track in the queue, if YTMD included the queue."""
+        try:
+            queue = self.state["queue"]  # type: ignore[index]
+            return queue["list"][queue["currentIndex"] + 1]["cover"]
+        except (KeyError, IndexError, TypeError):
+            return None
+
+    @property
+    def player(self) -> Player | None:
+        """Player of aioytmdesktopapi, only built when something asks for it.
+
+        The integration reads the projection, this is left for scripts
+        and other users of the aioytmdesktopapi objects.
+        """
+        if self._player is None and self.state is not None:
+            # aioytmdesktopapi leaves the type of this to be inferred as None
+            self._player = Player(self.state["player"], self._request)  # type: ignore[assignment]
+        return self._player
+
+    @property
+    def track(self) -> Track | None:
+        """Track of aioytmdesktopapi, only built when something asks for it."""
+        if self._track is None and self.state is not None:
+            self._track = Track(self.state["track"], self._request)  # type: ignore[assignment]
+        return self._track
+
+    def apply_state(self, state: dict[str, Any]) -> None:
+        """Apply a full state payload, same format as the /query endpoint returns."""
+        self.state = state
+        self.projection = YtmdState.from_payload(state)
+        self._player = None
+        self._track = None
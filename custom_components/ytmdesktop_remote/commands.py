@@ -0,0 +1,158 @@
+"""Command dispatcher for the YouTube Music Desktop Remote Control integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import COMMAND_CONCURRENCY, COMMAND_QUEUE_SIZE, DOMAIN
+from .stats import RequestStats
+
+# Number of wait times to keep for the metrics
+WAIT_TIME_SAMPLES = 100
+
+
+@dataclass
+class QueuedCommand:
+    """Command waiting to be sent."""
+
+    send: Callable[[], Awaitable[None]]
+    key: str | None
+    queued_at: float
+    refresh: bool = True
+    waiters: list[asyncio.Future[None]] = field(default_factory=list)
+
+
+class CommandDispatcher:
+    """Send commands to YTMD in order with a limited number in flight.
+
+    Commands with a key, like setting the volume, replace a pending command
+    with the same key so only the latest value gets sent. When all commands
+    are done `on_idle` is called once, e.g. to refresh the state. Commands
+    sent with `refresh=False`, like the steps of a volume fade, do not
+    trigger it by themselves. Only the time a command takes to be sent is
+    recorded in the "command" statistics, not the time it waited in the queue.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        on_idle: Callable[[], Awaitable[None]],
+        max_concurrent: int = COMMAND_CONCURRENCY,
+        max_queued: int = COMMAND_QUEUE_SIZE,
+        stats: RequestStats | None = None,
+    ) -> None:
+        self._hass = hass
+        self._on_idle = on_idle
+        self._max_concurrent = max_concurrent
+        self._max_queued = max_queued
+        self.stats = stats or RequestStats()
+
+        self._queue: deque[QueuedCommand] = deque()
+        self._pending_by_key: dict[str, QueuedCommand] = {}
+        self._in_flight = 0
+        self._idle_pending = False
+
+        self.sent = 0
+        self.replaced = 0
+        self.rejected = 0
+        self.max_depth = 0
+        self._wait_times: deque[float] = deque(maxlen=WAIT_TIME_SAMPLES)
+
+    @property
+    def depth(self) -> int:
+        """Number of commands waiting to be sent."""
+        return len(self._queue)
+
+    @property
+    def busy(self) -> bool:
+        return bool(self._queue) or self._in_flight > 0
+
+    async def async_send(
+        self,
+        send: Callable[[], Awaitable[None]],
+        key: str | None = None,
+        refresh: bool = True,
+    ) -> None:
+        """Queue a command and wait until it, or the command replacing it, was sent."""
+        future: asyncio.Future[None] = self._hass.loop.create_future()
+
+        if key is not None and (queued := self._pending_by_key.get(key)) is not None:
+            queued.send = send
+            queued.refresh = queued.refresh or refresh
+            self.replaced += 1
+        else:
+            if len(self._queue) >= self._max_queued:
+                self.rejected += 1
+                raise HomeAssistantError("Too many commands queued for YTMD")
+            queued = QueuedCommand(send, key, monotonic(), refresh)
+            self._queue.append(queued)
+            if key is not None:
+                self._pending_by_key[key] = queued
+            self.max_depth = max(self.max_depth, len(self._queue))
+
+        queued.waiters.append(future)
+        self._async_start_next()
+        await future
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop all pending commands."""
+        while self._queue:
+            for waiter in self._queue.popleft().waiters:
+                waiter.cancel()
+        self._pending_by_key.clear()
+
+    def metrics(self) -> dict[str, Any]:
+        wait_times = self._wait_times
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "in_flight": self._in_flight,
+            "sent": self.sent,
+            "replaced": self.replaced,
+            "rejected": self.rejected,
+            "wait_time_avg": sum(wait_times) / len(wait_times) if wait_times else None,
+            "wait_time_max": max(wait_times, default=None),
+        }
+
+    @callback
+    def _async_start_next(self) -> None:
+        while self._queue and self._in_flight < self._max_concurrent:
+            queued = self._queue.popleft()
+            if queued.key is not None:
+                del self._pending_by_key[queued.key]
+            self._in_flight += 1
+            self._hass.async_create_task(
+                self._async_run(queued), f"{DOMAIN} send command"
+            )
+
+    async def _async_run(self, queued: QueuedCommand) -> None:
+        self._wait_times.append(monotonic() - queued.queued_at)
+        try:
+            with self.stats.measure("command"):
+                await queued.send()
+        except Exception as err:  # pylint: disable=broad-except
+            for waiter in queued.waiters:
+                if not waiter.done():
+                    waiter.set_exception(err)
+        else:
+            self.sent += 1
+            for waiter in queued.waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+        finally:
+            self._in_flight -= 1
+            self._idle_pending = self._idle_pending or queued.refresh
+            self._async_start_next()
+
+        if not self.busy and self._idle_pending:
+            self._idle_pending = False
+            await self._on_idle()
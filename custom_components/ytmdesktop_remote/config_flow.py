@@ -7,20 +7,22 @@ from typing import Any
 import voluptuous as vol  # type: ignore[import]
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 import aioytmdesktopapi
 
-from .const import DOMAIN
+from .const import CONF_DORMANT, DOMAIN
+from .discovery import async_get_scanner
+from .probe import async_get_probe_cache
 
 _LOGGER = logging.getLogger(__name__)
 
+# Without a host the local network is searched for YTMD
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
-        vol.Required("host"): str,
+        vol.Optional("host"): str,
         vol.Optional("password"): str,
     }
 )
@@ -32,17 +34,9 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user.
     """
     try:
-        async with aioytmdesktopapi.YtmDesktop(
-            async_get_clientsession(hass), data["host"], data.get("password", None)
-        ) as api:
-            await api.initialize()
-
-            # There is no explicit way to check if authenticated.
-            # Only commands need to have authentication so lets send a dummy command
-            # Turns out Play and Pause are both toggles, so send it twice
-            # to get the player back in the same state :/
-            await api.send_command.track_pause()
-            await api.send_command.track_pause()
+        await async_get_probe_cache(hass).async_probe(
+            data["host"], data.get("password", None)
+        )
     except aioytmdesktopapi.Unauthorized:
         raise InvalidAuth
     except aioytmdesktopapi.RequestError:
@@ -59,16 +53,45 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     reauth_entry: config_entries.ConfigEntry | None = None
 
+    def __init__(self) -> None:
+        """Initialize the config flow."""
+        self._discovered_hosts: list[str] | None = None
+        self._picked_host: str | None = None
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle the initial step."""
+        if user_input is None and self._discovered_hosts is None:
+            # Offer the hosts of a recent scan right away, otherwise scan
+            # while the user gets to enter a host
+            scanner = async_get_scanner(self.hass)
+            if (hosts := scanner.cached_hosts) is not None:
+                self._discovered_hosts = self._async_unconfigured(hosts)
+                if self._discovered_hosts:
+                    return await self.async_step_pick_device()
+            else:
+                scanner.async_start_scan()
+
         if user_input is None:
             return self.async_show_form(
                 step_id="user",
-                data_schema=STEP_USER_DATA_SCHEMA,
+                data_schema=self.add_suggested_values_to_schema(
+                    STEP_USER_DATA_SCHEMA, {"host": self._picked_host}
+                ),
             )
 
+        if not user_input.get("host"):
+            return await self.async_step_search()
+
         errors = {}
 
         try:
@@ -98,11 +121,51 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    async def async_step_search(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Search the local network, the scan might already be done."""
+        hosts = await async_get_scanner(self.hass).async_scan()
+        self._discovered_hosts = self._async_unconfigured(hosts)
+        if self._discovered_hosts:
+            return await self.async_step_pick_device()
+        return self.async_show_form(
+            step_id="user",
+            data_schema=STEP_USER_DATA_SCHEMA,
+            errors={"base": "no_devices_found"},
+        )
+
+    @callback
+    def _async_unconfigured(self, hosts: list[str]) -> list[str]:
+        configured = {entry.data["host"] for entry in self._async_current_entries()}
+        return [host for host in hosts if host not in configured]
+
+    async def async_step_pick_device(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Pick one of the discovered desktops, or none to enter a host."""
+        if user_input is not None:
+            self._picked_host = user_input.get("host")
+            return await self.async_step_user()
+
+        assert self._discovered_hosts is not None
+        return self.async_show_form(
+            step_id="pick_device",
+            data_schema=vol.Schema(
+                {vol.Optional("host"): vol.In(self._discovered_hosts)}
+            ),
+        )
+
     async def async_step_reauth(self, user_input=None):
         """Perform reauth upon an API authentication error."""
         self.reauth_entry = self.hass.config_entries.async_get_entry(
             self.context["entry_id"]
         )
+        # The password got rejected since it was checked, do not trust that
+        assert self.reauth_entry is not None
+        async_get_probe_cache(self.hass).async_invalidate(
+            self.reauth_entry.data["host"], self.reauth_entry.data.get("password")
+        )
 
         return await self.async_step_reauth_confirm()
 
@@ -118,6 +181,33 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return await self.async_step_user(self.reauth_entry.data)
 
 
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle the options of YouTube Music Desktop Remote Control."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_DORMANT,
+                        default=self.config_entry.options.get(CONF_DORMANT, False),
+                    ): bool,
+                }
+            ),
+        )
+
+
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
 
@@ -6,7 +6,120 @@ DOMAIN = "ytmdesktop_remote"
 
 LOGGER = logging.getLogger(__package__)
 
+# Option to suspend all updates, until it is turned off again
+CONF_DORMANT = "dormant"
 
+
+# Polling interval while playing.
 # Using timedelta of 5 seconds often gives Server Disconnect exceptions
 # maybe YTMD has a 5 second timeout that conflicts occasionally?
-COORDINATOR_UPDATE_INTERVAL = timedelta(seconds=6)
+POLL_INTERVAL_PLAYING = timedelta(seconds=6)
+
+# When a track is about to end poll right after the predicted end
+# so the next track shows up quickly, but never faster than the minimum
+POLL_TRACK_END_MARGIN = timedelta(seconds=0.5)
+POLL_INTERVAL_MIN = timedelta(seconds=1)
+
+# While paused, idle or failing the interval doubles up to the maximum
+POLL_INTERVAL_MAX = timedelta(seconds=60)
+
+# Each config entry gets its own connection to YTMD.
+# YTMD closes idle connections after about 5 seconds, close them earlier
+# so a connection is not reused right when YTMD closes it.
+API_CONNECTION_LIMIT = 1
+API_KEEPALIVE_TIMEOUT = 4
+
+# Port of the YTMD Remote Control server, both REST API and realtime channel
+YTMD_PORT = 9863
+
+# Seconds without any entity listening before the updates are suspended,
+# entities are removed and added again when they get reloaded
+IDLE_SUSPEND_DELAY = 30
+
+# Delays in seconds between attempts to reconnect the realtime channel
+REALTIME_RECONNECT_MIN_DELAY = 1
+REALTIME_RECONNECT_MAX_DELAY = 60
+
+# Difference in seconds between the reported and extrapolated media position
+# before the position gets updated. YTMD reports whole seconds.
+POSITION_DRIFT_THRESHOLD = 2
+
+# Minimum seconds between seek commands, dragging the seek bar sends the
+# latest position at this rate. After this many seeks in a row that YTMD
+# ignored, seeking is no longer offered.
+SEEK_MIN_INTERVAL = 0.3
+SEEK_IGNORED_LIMIT = 2
+
+# Seconds between the volume steps of a fade, YTMD handles commands one by
+# one so faster steps would queue up. Fades last at most an hour.
+FADE_STEP_INTERVAL = 0.5
+FADE_MAX_DURATION = 3600
+
+# Artwork cache limits, memory in bytes and number of files on disk
+ARTWORK_CACHE_MAX_BYTES = 10 * 1024 * 1024
+ARTWORK_DISK_MAX_FILES = 200
+ARTWORK_FETCH_TIMEOUT = 10
+
+# Tracks per page when browsing the queue, longer queues are split in pages
+BROWSE_PAGE_SIZE = 100
+# Thumbnails handed out while browsing stay resolvable, also after the track
+# changed, up to this many covers. The least recently used are dropped first.
+BROWSE_MAX_COVERS = 500
+
+# Commands in flight at the same time and max number of queued commands per YTMD instance
+# YTMD does not handle concurrent requests well, so send them one by one
+COMMAND_CONCURRENCY = 1
+COMMAND_QUEUE_SIZE = 20
+
+# All config entries are polled from a single timer on the hub.
+# Polls due within the same slot (seconds) run together, each poll is delayed
+# by a random part of its interval so instances do not poll in lockstep.
+HUB_TIMER_RESOLUTION = 0.25
+HUB_POLL_JITTER = 0.1
+# State requests in flight at the same time over all YTMD instances
+HUB_MAX_CONCURRENT_POLLS = 4
+
+# Commands to a group are sent to all members at the same time, each
+# member gets this many seconds, so one slow desktop does not hold up the rest
+GROUP_MEMBER_TIMEOUT = 5
+
+# Request statistics keep the latency of the most recent requests,
+# the histogram has buckets with these upper bounds in seconds
+STATS_SAMPLES = 200
+STATS_LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2)
+
+# After this many failed polls in a row YTMD is considered unreachable,
+# e.g. the desktop is asleep, and it only gets probed now and then.
+# The probe interval doubles up to the maximum.
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_PROBE_INTERVAL_MIN = timedelta(seconds=30)
+BREAKER_PROBE_INTERVAL_MAX = timedelta(minutes=10)
+
+# The request timeout in seconds follows the observed latency once there
+# are enough samples, until then the default is used
+REQUEST_TIMEOUT_DEFAULT = 2
+REQUEST_TIMEOUT_MIN = 0.5
+REQUEST_TIMEOUT_MAX = 5
+REQUEST_TIMEOUT_LATENCY_FACTOR = 3
+REQUEST_TIMEOUT_MIN_SAMPLES = 10
+
+# Delay in seconds before saving a changed last known state
+LAST_STATE_SAVE_DELAY = 30
+
+# Seconds a successful or unauthorized probe result is reused by the config flow
+PROBE_CACHE_TTL = 30
+
+# Discovery scans the /24 around each network adapter for YTMD.
+# Hosts are checked in parallel, each gets a short time to respond.
+DISCOVERY_MAX_CONCURRENT = 64
+DISCOVERY_HOST_TIMEOUT = 0.5
+# Seconds the found hosts are reused by the config flow
+DISCOVERY_CACHE_TTL = 300
+
+# Fired when the track playing on YTMD changes
+EVENT_TRACK_CHANGED = f"{DOMAIN}_track_changed"
+
+# Number of recent plays kept per YTMD instance. The history file is
+# appended to, and rewritten when it got this many times as many lines.
+HISTORY_SIZE = 100
+HISTORY_COMPACT_FACTOR = 2
@@ -1,31 +1,144 @@
 """Coordinator for the YouTube Music Desktop Remote Control integration."""
 
+from __future__ import annotations
+
 from dataclasses import dataclass
 import datetime
+from typing import Any, NamedTuple
+
+import aiohttp
 import aioytmdesktopapi
 import async_timeout
 
+from homeassistant.core import CALLBACK_TYPE, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 from homeassistant.util.dt import utcnow
 
-from .const import COORDINATOR_UPDATE_INTERVAL, LOGGER
+from .breaker import BreakerState, CircuitBreaker
+from .client import YtmdClient
+from .commands import CommandDispatcher
+from .const import (
+    CONF_DORMANT,
+    DOMAIN,
+    EVENT_TRACK_CHANGED,
+    IDLE_SUSPEND_DELAY,
+    LOGGER,
+    POLL_INTERVAL_MAX,
+    POLL_INTERVAL_MIN,
+    POLL_INTERVAL_PLAYING,
+    POLL_TRACK_END_MARGIN,
+    REQUEST_TIMEOUT_DEFAULT,
+    REQUEST_TIMEOUT_LATENCY_FACTOR,
+    REQUEST_TIMEOUT_MAX,
+    REQUEST_TIMEOUT_MIN,
+    REQUEST_TIMEOUT_MIN_SAMPLES,
+)
+from .fade import VolumeFader
+from .hub import YtmdHub
+from .last_state import LastStateStore
+from .history import Play, PlayHistory
+from .idle import IdleReason, IdleTracker
+from .position import PositionModel
+from .projection import YtmdState
+from .realtime import YtmdRealtime
+from .seek import SeekController
+from .stats import RequestStats
+
+
+class StateSnapshot(NamedTuple):
+    """The parts of the state that end up in Home Assistant.
+
+    The raw seekbar position is not part of it since that changes every
+    second while playing, the position model decides when it matters.
+    """
+
+    available: bool
+    breaker_state: BreakerState
+    seek_supported: bool
+    # Compares without the seekbar position
+    projection: YtmdState | None
+    position: float | None
+    position_updated_at: datetime.datetime | None
+
+    @classmethod
+    def create(
+        cls,
+        available: bool,
+        breaker_state: BreakerState,
+        seek_supported: bool,
+        projection: YtmdState | None,
+        position: PositionModel,
+    ) -> StateSnapshot:
+        return cls(
+            available,
+            breaker_state,
+            seek_supported,
+            projection,
+            position.position,
+            position.updated_at,
+        )
 
 
 @dataclass
 class CoordinatorData:
     api: aioytmdesktopapi.YtmDesktop
     last_updated: datetime.datetime
+    # When the state was requested, anything that happened
+    # on the desktop before this time is reflected in the data
+    requested_at: datetime.datetime
+
+
+class PollScheduler:
+    """Determine the polling interval based on the player state."""
+
+    def __init__(self) -> None:
+        self._backoff = POLL_INTERVAL_PLAYING
+
+    def updated(self, state: YtmdState | None) -> datetime.timedelta:
+        """Interval to use after a successful update."""
+        if state is None or not state.playing:
+            return self._back_off()
+
+        self._backoff = POLL_INTERVAL_PLAYING
+        if state.duration:
+            remaining = datetime.timedelta(
+                seconds=state.duration - state.seekbar_position
+            )
+            if remaining + POLL_TRACK_END_MARGIN < POLL_INTERVAL_PLAYING:
+                return max(remaining + POLL_TRACK_END_MARGIN, POLL_INTERVAL_MIN)
+        return POLL_INTERVAL_PLAYING
+
+    def failed(self) -> datetime.timedelta:
+        """Interval to use after a failed update."""
+        return self._back_off()
+
+    def reset(self) -> None:
+        self._backoff = POLL_INTERVAL_PLAYING
+
+    def _back_off(self) -> datetime.timedelta:
+        interval = self._backoff
+        self._backoff = min(self._backoff * 2, POLL_INTERVAL_MAX)
+        return interval
 
 
 class YtmdCoordinator(DataUpdateCoordinator):
     """My custom coordinator."""
 
-    def __init__(self, hass, api: aioytmdesktopapi.YtmDesktop):
+    def __init__(
+        self,
+        hass,
+        api: YtmdClient,
+        session: aiohttp.ClientSession,
+        hub: YtmdHub,
+        last_state: LastStateStore | None = None,
+        history: PlayHistory | None = None,
+    ):
         """Initialize my coordinator."""
         super().__init__(
             hass,
@@ -33,24 +146,370 @@ class YtmdCoordinator(DataUpdateCoordinator):
             # Name of the data. For logging purposes.
             name="YouTube Music Desktop Remote Control",
             # Polling interval. Will only be polled if there are subscribers.
-            update_interval=COORDINATOR_UPDATE_INTERVAL,
+            # Adjusted after every update, see PollScheduler.
+            update_interval=POLL_INTERVAL_PLAYING,
             request_refresh_debouncer=Debouncer(
                 hass, LOGGER, cooldown=1.0, immediate=False
             ),
         )
         self.api = api
+        self.hub = hub
+        self.last_state = last_state
+        self.history = history
+        self._current_play: Play | None = None
+        self.stats = RequestStats()
+        self.breaker = CircuitBreaker()
+        self.poll_scheduler = PollScheduler()
+        self.position = PositionModel()
+        # One refresh after a batch of commands is enough
+        self.commands = CommandDispatcher(
+            hass, self.async_request_refresh, stats=self.stats
+        )
+        self.seek = SeekController(hass, api, self.commands, self.position)
+        self.fader = VolumeFader(hass, api, self.commands)
+
+        self._last_snapshot: StateSnapshot | None = None
+        self._notify_requested_after: datetime.datetime | None = None
+        self.notifications_sent = 0
+        self.notifications_skipped = 0
+        self.realtime = YtmdRealtime(
+            hass,
+            session,
+            api.host,
+            self._async_handle_realtime_state,
+            self._async_handle_realtime_connection,
+            self.stats,
+        )
+
+        self.idle = IdleTracker()
+        self._started = False
+        self._unsub_suspend: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start updating, once the entities had the chance to listen.
+
+        Pushed updates are received on the realtime channel, polling is only
+        used as fallback. Nothing is started when nothing listens or the
+        config entry is dormant.
+        """
+        self._started = True
+        if (reason := self._idle_reason()) is not None:
+            self._async_suspend(reason)
+        else:
+            self.realtime.async_start()
+
+    @property
+    def dormant(self) -> bool:
+        """The config entry is set to dormant in its options."""
+        return self.config_entry is not None and self.config_entry.options.get(
+            CONF_DORMANT, False
+        )
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> CALLBACK_TYPE:
+        """Listen for data updates, updates are suspended while nothing listens."""
+        remove = super().async_add_listener(update_callback, context)
+        self._async_update_idle()
+
+        @callback
+        def remove_listener() -> None:
+            remove()
+            self._async_update_idle()
+
+        return remove_listener
+
+    def _idle_reason(self) -> IdleReason | None:
+        if self.dormant:
+            return IdleReason.DORMANT
+        if not self._listeners:
+            return IdleReason.NO_LISTENERS
+        return None
+
+    @callback
+    def _async_update_idle(self) -> None:
+        if not self._started or self._shutdown_requested:
+            return
+        if self._idle_reason() is None:
+            if self._unsub_suspend is not None:
+                self._unsub_suspend()
+                self._unsub_suspend = None
+            if self.idle.suspended:
+                self._async_resume()
+        elif not self.idle.suspended and self._unsub_suspend is None:
+            # Entities are removed and added again when they get reloaded
+            self._unsub_suspend = async_call_later(
+                self.hass, IDLE_SUSPEND_DELAY, self._async_handle_suspend_timer
+            )
+
+    @callback
+    def _async_handle_suspend_timer(self, _now: datetime.datetime) -> None:
+        self._unsub_suspend = None
+        if (reason := self._idle_reason()) is not None:
+            self._async_suspend(reason)
+
+    @callback
+    def _async_suspend(self, reason: IdleReason) -> None:
+        """Stop polling and close the realtime channel."""
+        LOGGER.debug("Suspending updates of YTMD at %s: %s", self.api.host, reason)
+        self.idle.suspend(reason)
+        # Also drops the refresh requested when the entities got added
+        self._unschedule_refresh()
+        # Cancelled right away, so a resume can start it again
+        self.realtime.async_cancel()
+        # Kept alive REST connections would only close after
+        # API_KEEPALIVE_TIMEOUT, the next request opens a new one
+        self.hass.async_create_task(
+            self.api.renew_session().close(), f"{DOMAIN} close connections"
+        )
+
+    @callback
+    def _async_resume(self) -> None:
+        """Refresh right away and start updating again."""
+        LOGGER.debug("Resuming updates of YTMD at %s", self.api.host)
+        self.idle.resume()
+        # Realtime channel was closed without a disconnect, poll until it is back
+        self.poll_scheduler.reset()
+        self.update_interval = POLL_INTERVAL_PLAYING
+        self.realtime.async_start()
+        self.hass.async_create_task(self.async_refresh(), f"{DOMAIN} resume")
+
+    async def async_restore_last_state(self) -> bool:
+        """Use the last known state until the first refresh is done."""
+        if self.last_state is None:
+            return False
+        if (state := await self.last_state.async_load()) is None:
+            return False
+        self.api.apply_state(state)
+        return True
+
+    async def async_shutdown(self) -> None:
+        """Stop the realtime channel, pending commands and scheduled refreshes."""
+        self.commands.async_cancel()
+        self.seek.async_cancel()
+        self.fader.async_cancel()
+        await self.realtime.async_stop()
+        await super().async_shutdown()
+        # Entities removed while stopping could have started the timer
+        if self._unsub_suspend is not None:
+            self._unsub_suspend()
+            self._unsub_suspend = None
+        if self.last_state is not None:
+            await self.last_state.async_flush()
+        if self.history is not None:
+            await self.history.async_flush()
+
+    @property
+    def projection(self) -> YtmdState | None:
+        """Fields of the latest state the entities use, None until it is known."""
+        return self.api.projection
+
+    @property
+    def has_listeners(self) -> bool:
+        return bool(self._listeners)
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule the next poll on the hub instead of a timer of our own."""
+        if self.update_interval is None:
+            return
+
+        if self.idle.suspended:
+            return
+        # Only polling is disabled, pushed updates keep coming in
+        if self.config_entry is not None and self.config_entry.pref_disable_polling:
+            return
+
+        self._async_unsub_refresh()
+        self._unsub_refresh = self.hub.async_schedule(self, self.update_interval)
+
+    async def async_handle_scheduled_refresh(self) -> None:
+        """Poll when the hub says it is time."""
+        # _async_refresh cancels the poll still scheduled on the hub, if any,
+        # and schedules the next one through hub.async_schedule once done
+        await self._async_refresh(log_failures=True, scheduled=True)
+
+    @callback
+    def _async_handle_realtime_connection(self, connected: bool) -> None:
+        if connected:
+            self.update_interval = None
+            self._async_unsub_refresh()
+            # YTMD might have been updated while it was away
+            if self.realtime.connects > 1:
+                self.seek.async_reset_support()
+            return
+
+        # Stream dropped, fall back to polling
+        self.poll_scheduler.reset()
+        self.update_interval = POLL_INTERVAL_PLAYING
+        if self._listeners:
+            self._schedule_refresh()
+
+    @callback
+    def _async_handle_realtime_state(self, state: dict[str, Any]) -> None:
+        self.api.apply_state(state)
+        self._async_succeeded()
+        # Pushed state is fresh, no need to correct for latency
+        now = utcnow()
+        self._update_position(now)
+        self.async_set_updated_data(CoordinatorData(self.api, now, now))
+
+    async def async_request_refresh(self) -> None:
+        """Request a refresh, listeners always get notified of the result.
+
+        This allows entities to confirm the effect of their commands
+        even when the state did not change.
+        """
+        if self._notify_requested_after is None:
+            self._notify_requested_after = utcnow()
+        if self.idle.suspended:
+            # Nothing else is updating, e.g. a command while dormant
+            await self.async_refresh()
+            return
+        await super().async_request_refresh()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update listeners, unless nothing they show has changed."""
+        if self.last_update_success:
+            self._async_check_track_change()
+        snapshot = StateSnapshot.create(
+            self.last_update_success,
+            self.breaker.state,
+            self.seek.supported,
+            self.projection,
+            self.position,
+        )
+        requested = (
+            self._notify_requested_after is not None
+            and self.data is not None
+            and self.data.requested_at >= self._notify_requested_after
+        )
+        if snapshot == self._last_snapshot and not requested:
+            self.notifications_skipped += 1
+            return
+
+        if requested:
+            self._notify_requested_after = None
+        self._last_snapshot = snapshot
+        if self.last_state is not None and self.last_update_success:
+            self.last_state.async_update(self.projection)
+        self.notifications_sent += 1
+        super().async_update_listeners()
+
+    @callback
+    def _async_check_track_change(self) -> None:
+        if (play := Play.from_state(self.projection, utcnow())) is None:
+            return
+        previous = self._current_play
+        if play.same_track(previous):
+            return
+        self._current_play = play
+        if previous is None and self.history is not None:
+            # First state since startup, might still be the last recorded play
+            if play.same_track(self.history.last):
+                return
+            previous = self.history.last
+
+        if self.history is not None:
+            self.history.async_add(play)
+        self.hass.bus.async_fire(
+            EVENT_TRACK_CHANGED,
+            {
+                "entry_id": self.config_entry.entry_id if self.config_entry else None,
+                "previous": previous.as_dict() if previous else None,
+                "current": play.as_dict(),
+            },
+        )
+
+    def _update_position(self, sampled_at: datetime.datetime) -> bool:
+        if (projection := self.projection) is None:
+            return self.position.update(None, sampled_at, False)
+        if not self.seek.async_process_sample(projection, sampled_at):
+            return False
+        return self.position.update(
+            projection.seekbar_position, sampled_at, projection.playing
+        )
 
     async def _async_update_data(self):
         """Fetch data from API endpoint."""
+        try:
+            # Limits the requests in flight over all instances, the wait for
+            # a turn is not part of the request timeout
+            async with self.hub.poll_limit:
+                with self.stats.measure(
+                    "initialize" if self.data is None else "update", round_trip=True
+                ):
+                    data = await self._async_fetch_data()
+        except Exception:
+            self._set_poll_interval(self._async_failed())
+            raise
+        self._async_succeeded()
+        self._set_poll_interval(self.poll_scheduler.updated(self.projection))
+        return data
+
+    @property
+    def request_timeout(self) -> float:
+        """Request timeout in seconds, based on the observed latency.
+
+        Polls stop while the realtime channel is connected, its pings keep
+        the latency up to date for the first poll after it drops.
+        """
+        latency = self.stats.round_trip
+        if len(latency) < REQUEST_TIMEOUT_MIN_SAMPLES or not (
+            p99 := latency.percentile(99)
+        ):
+            return REQUEST_TIMEOUT_DEFAULT
+        timeout = p99 * REQUEST_TIMEOUT_LATENCY_FACTOR
+        return min(max(timeout, REQUEST_TIMEOUT_MIN), REQUEST_TIMEOUT_MAX)
+
+    @callback
+    def _async_failed(self) -> datetime.timedelta:
+        """Interval to use after a failed update."""
+        was_closed = self.breaker.state is BreakerState.CLOSED
+        if (probe_interval := self.breaker.failed()) is None:
+            return self.poll_scheduler.failed()
+        if was_closed:
+            LOGGER.info(
+                "YTMD at %s is unreachable, only probing it from now on",
+                self.api.host,
+            )
+            # The probes find out when it is back, instead of the realtime
+            # channel trying to reconnect every REALTIME_RECONNECT_MAX_DELAY
+            if not self.realtime.connected:
+                self.realtime.async_cancel()
+        return probe_interval
+
+    @callback
+    def _async_succeeded(self) -> None:
+        if self.breaker.succeeded():
+            LOGGER.info("YTMD at %s is reachable again", self.api.host)
+            self.poll_scheduler.reset()
+            self.seek.async_reset_support()
+            if self._started and not self.idle.suspended:
+                self.realtime.async_start()
+
+    def _set_poll_interval(self, interval: datetime.timedelta) -> None:
+        # No polling while the realtime channel pushes the updates
+        if not self.realtime.connected:
+            self.update_interval = interval
+
+    async def _async_fetch_data(self) -> CoordinatorData:
         try:
             # Note: asyncio.TimeoutError and aiohttp.ClientError are already
             # handled by the data update coordinator.
-            async with async_timeout.timeout(2):
+            async with async_timeout.timeout(self.request_timeout):
+                request_start = utcnow()
                 if self.data is None:
                     await self.api.initialize()
                 else:
                     await self.api.update()
-                return CoordinatorData(self.api, utcnow())
+                now = utcnow()
+                # Assume the server sampled the state halfway the roundtrip
+                self._update_position(request_start + (now - request_start) / 2)
+                return CoordinatorData(self.api, now, request_start)
         except aioytmdesktopapi.Unauthorized as err:
             # Raising ConfigEntryAuthFailed will cancel future updates
             # and start a config flow with SOURCE_REAUTH (async_step_reauth)
@@ -0,0 +1,49 @@
+"""Diagnostics support for the YouTube Music Desktop Remote Control integration."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import YtmdCoordinator
+
+TO_REDACT = {CONF_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: YtmdCoordinator = hass.data[DOMAIN].coordinators[entry.entry_id]
+
+    return {
+        "entry": async_redact_data(entry.data, TO_REDACT),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "realtime_connected": coordinator.realtime.connected,
+            "breaker_state": coordinator.breaker.state,
+            "breaker_opened": coordinator.breaker.opened,
+            "consecutive_failures": coordinator.breaker.failures,
+            "request_timeout": coordinator.request_timeout,
+            "notifications_sent": coordinator.notifications_sent,
+            "notifications_skipped": coordinator.notifications_skipped,
+            "update_interval": (
+                coordinator.update_interval.total_seconds()
+                if coordinator.update_interval
+                else None
+            ),
+        },
+        "commands": coordinator.commands.metrics(),
+        "seek": coordinator.seek.metrics(),
+        "fade": coordinator.fader.metrics(),
+        "idle": coordinator.idle.metrics(),
+        "requests": coordinator.stats.as_dict(),
+        "connections": asdict(coordinator.api.stats),
+        "hub": coordinator.hub.metrics(),
+    }
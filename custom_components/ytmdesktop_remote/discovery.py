@@ -0,0 +1,140 @@
+"""Discovery for the YouTube Music Desktop Remote Control integration.
+
+YTMD does not announce itself with zeroconf or SSDP, so the local networks
+get scanned for a host serving the YTMD REST API. Only the /24 around each
+network adapter is scanned, so it is done in a few seconds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import ipaddress
+from time import monotonic
+
+import aiohttp
+
+from homeassistant.components import network
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.singleton import singleton
+
+from .const import (
+    DISCOVERY_CACHE_TTL,
+    DISCOVERY_HOST_TIMEOUT,
+    DISCOVERY_MAX_CONCURRENT,
+    DOMAIN,
+    LOGGER,
+    YTMD_PORT,
+)
+
+DATA_DISCOVERY = f"{DOMAIN}_discovery"
+
+
+def _scan_networks(
+    adapters: Iterable[network.Adapter],
+) -> list[ipaddress.IPv4Network]:
+    networks: list[ipaddress.IPv4Network] = []
+    for adapter in adapters:
+        if not adapter["enabled"]:
+            continue
+        for address in adapter["ipv4"]:
+            interface = ipaddress.IPv4Interface(
+                f"{address['address']}/{address['network_prefix']}"
+            )
+            if interface.network.prefixlen < 24:
+                # Do not scan whole /16s, stick to the neighbours
+                interface = ipaddress.IPv4Interface(f"{interface.ip}/24")
+            if interface.network not in networks:
+                networks.append(interface.network)
+    return networks
+
+
+class YtmdScanner:
+    """Find YTMD instances on the local networks."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        session: aiohttp.ClientSession,
+        port: int = YTMD_PORT,
+        ttl: float = DISCOVERY_CACHE_TTL,
+    ) -> None:
+        self._hass = hass
+        self._session = session
+        self._port = port
+        self._ttl = ttl
+        self._hosts: list[str] | None = None
+        self._expires = 0.0
+        self._scanning: asyncio.Task[list[str]] | None = None
+
+    @property
+    def cached_hosts(self) -> list[str] | None:
+        """Hosts found by a recent scan, None when it needs a new scan."""
+        if self._hosts is not None and self._expires > monotonic():
+            return self._hosts
+        return None
+
+    async def async_scan(self) -> list[str]:
+        """Hosts running YTMD, scanned at most once per cache period."""
+        if (hosts := self.cached_hosts) is not None:
+            return hosts
+        return await asyncio.shield(self._async_start_scan())
+
+    @callback
+    def async_start_scan(self) -> None:
+        """Start scanning in the background, unless the found hosts are recent."""
+        if self.cached_hosts is None:
+            self._async_start_scan()
+
+    @callback
+    def _async_start_scan(self) -> asyncio.Task[list[str]]:
+        if self._scanning is None:
+            # Nothing should wait for a scan nobody asked the result of yet
+            self._scanning = self._hass.async_create_background_task(
+                self._async_scan(), f"{DOMAIN} discovery"
+            )
+            self._scanning.add_done_callback(self._async_scan_done)
+        return self._scanning
+
+    @callback
+    def _async_scan_done(self, task: asyncio.Task[list[str]]) -> None:
+        self._scanning = None
+        if not task.cancelled() and task.exception() is None:
+            self._hosts = task.result()
+            self._expires = monotonic() + self._ttl
+
+    async def _async_scan(self) -> list[str]:
+        networks = _scan_networks(await network.async_get_adapters(self._hass))
+        hosts = [str(host) for net in networks for host in net.hosts()]
+        LOGGER.debug("Scanning %s hosts for YTMD on %s", len(hosts), networks)
+
+        limit = asyncio.Semaphore(DISCOVERY_MAX_CONCURRENT)
+
+        async def check(host: str) -> bool:
+            async with limit:
+                return await self._async_is_ytmd(host)
+
+        found = await asyncio.gather(*(check(host) for host in hosts))
+        return [host for host, is_ytmd in zip(hosts, found) if is_ytmd]
+
+    async def _async_is_ytmd(self, host: str) -> bool:
+        try:
+            async with self._session.get(
+                f"http://{host}:{self._port}/query",
+                timeout=aiohttp.ClientTimeout(total=DISCOVERY_HOST_TIMEOUT),
+            ) as response:
+                if response.status != 200:
+                    return False
+                # YTMD responds with a text/json content type
+                state = await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            return False
+        return isinstance(state, dict) and "player" in state
+
+
+@callback
+@singleton(DATA_DISCOVERY)
+def async_get_scanner(hass: HomeAssistant) -> YtmdScanner:
+    """Get the scanner shared by all config flows."""
+    return YtmdScanner(hass, async_get_clientsession(hass))
@@ -0,0 +1,53 @@
+"""Base entities for the YouTube Music Desktop Remote Control integration."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import YtmdCoordinator
+
+
+def ytmd_device_info(configentry_id: str) -> DeviceInfo:
+    return {
+        "name": "YouTube Music Desktop",
+        "identifiers": {(DOMAIN, configentry_id)},
+    }
+
+
+class YtmdFieldEntity(CoordinatorEntity, ABC):
+    """Entity showing a single field of the coordinator state.
+
+    The coordinator notifies all entities when anything they show changed.
+    The state is only written when this entity's own field changed, so e.g.
+    a volume change does not write the title sensor.
+    """
+
+    coordinator: YtmdCoordinator
+    _attr_has_entity_name = True
+
+    def __init__(self, coordinator: YtmdCoordinator, configentry_id: str) -> None:
+        super().__init__(coordinator)
+        self._attr_device_info = ytmd_device_info(configentry_id)
+        self._value = self._read_value()
+        self._written: tuple[bool, Any] | None = None
+
+    @abstractmethod
+    def _read_value(self) -> Any:
+        """Read the field from the coordinator."""
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._value = self._read_value()
+        if (self.available, self._value) != self._written:
+            self.async_write_ha_state()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        self._written = (self.available, self._value)
+        super().async_write_ha_state()
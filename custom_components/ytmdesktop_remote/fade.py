@@ -0,0 +1,147 @@
+"""Volume fades for the YouTube Music Desktop Remote Control integration.
+
+A fade runs as a single task that steps the volume at the rate YTMD keeps
+up with. The steps do not refresh the state, only the final step does.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from functools import partial
+import math
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .client import YtmdClient
+from .commands import CommandDispatcher
+from .const import DOMAIN, FADE_STEP_INTERVAL, LOGGER
+
+
+class VolumeFader:
+    """Ramp the volume of YTMD to a target over a duration.
+
+    A new fade or any other command cancels the running fade, the volume
+    stays where the fade got to.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: YtmdClient,
+        commands: CommandDispatcher,
+        interval: float = FADE_STEP_INTERVAL,
+    ) -> None:
+        self._hass = hass
+        self._api = api
+        self._commands = commands
+        self._interval = interval
+        self._task: asyncio.Task[None] | None = None
+
+        self.started = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.steps = 0
+
+    @property
+    def fading(self) -> bool:
+        return self._task is not None
+
+    @callback
+    def async_start(
+        self,
+        start: int,
+        target: int,
+        duration: float,
+        on_step: Callable[[int], None],
+    ) -> None:
+        """Start fading from the current volume, `on_step` gets each volume sent."""
+        self.async_cancel()
+        self.started += 1
+        # Fades can take long, nothing should wait for them to finish
+        self._task = self._hass.async_create_background_task(
+            self._async_fade(start, target, duration, on_step),
+            f"{DOMAIN} fade volume",
+        )
+
+    @callback
+    def async_cancel(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        self._task = None
+        self.cancelled += 1
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "fading": self.fading,
+            "started": self.started,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "steps": self.steps,
+        }
+
+    async def _async_fade(
+        self,
+        start: int,
+        target: int,
+        duration: float,
+        on_step: Callable[[int], None],
+    ) -> None:
+        started_at = now = dt_util.utcnow()
+        volume = start
+        try:
+            while True:
+                elapsed = (now - started_at).total_seconds()
+                if elapsed >= duration:
+                    step = target
+                else:
+                    step = round(start + (target - start) * elapsed / duration)
+                # Steps that would not change the volume are skipped
+                if step != volume:
+                    await self._commands.async_send(
+                        partial(self._api.set_volume, step),
+                        key="volume",
+                        refresh=step == target,
+                    )
+                    volume = step
+                    self.steps += 1
+                    on_step(volume)
+                if volume == target:
+                    break
+                # Next step on the interval grid, a slow step does not slow
+                # down the fade, it makes the next step bigger
+                next_step = math.floor(elapsed / self._interval + 1) * self._interval
+                now = await self._async_wait_until(
+                    started_at + timedelta(seconds=min(next_step, duration))
+                )
+        except Exception as err:  # pylint: disable=broad-except
+            LOGGER.warning(
+                "Unable to fade the volume of YTMD at %s: %s", self._api.host, err
+            )
+        else:
+            self.completed += 1
+        finally:
+            if self._task is asyncio.current_task():
+                self._task = None
+
+    async def _async_wait_until(self, point: datetime) -> datetime:
+        """Wait on a timer of Home Assistant, returns the time it woke up."""
+        fired: asyncio.Future[None] = self._hass.loop.create_future()
+
+        @callback
+        def _async_fire(_now: datetime) -> None:
+            if not fired.done():
+                fired.set_result(None)
+
+        unsub = async_track_point_in_utc_time(self._hass, _async_fire, point)
+        try:
+            await fired
+        finally:
+            unsub()
+        # Later than the point when the step before took longer than planned
+        return max(point, dt_util.utcnow())
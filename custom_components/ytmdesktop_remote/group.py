@@ -0,0 +1,142 @@
+"""Grouped control for the YouTube Music Desktop Remote Control integration.
+
+YTMD can not play in sync with other instances. A group is a leader with
+members, commands sent to the leader are sent to all of them at the same
+time. Every member gets its own timeout and the failures are reported per
+member. The commands go through the dispatcher of each member, which
+refreshes the member once when its commands are done.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING
+
+import aioytmdesktopapi
+import async_timeout
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .client import YtmdClient
+from .const import DOMAIN, GROUP_MEMBER_TIMEOUT, LOGGER
+
+if TYPE_CHECKING:
+    from .coordinator import YtmdCoordinator
+
+# Sent with the config entry ids of a changed group
+SIGNAL_GROUP_CHANGED = f"{DOMAIN}_group_changed"
+
+
+class GroupCommandError(HomeAssistantError):
+    """Command failed on some members of a group."""
+
+    def __init__(self, failures: dict[str, Exception]) -> None:
+        super().__init__(
+            "Command failed on "
+            + ", ".join(
+                f"{host} ({str(err) or type(err).__name__})"
+                for host, err in failures.items()
+            )
+        )
+        self.failures = failures
+
+
+class YtmdGroups:
+    """Groups of YTMD instances, by config entry id of the leader."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._members: dict[str, list[str]] = {}
+
+    def members(self, leader: str) -> list[str]:
+        """Config entry ids of the members, without the leader."""
+        return list(self._members.get(leader, []))
+
+    def group_of(self, entry_id: str) -> list[str]:
+        """Config entry ids of the group the entry is in, leader first."""
+        for leader, members in self._members.items():
+            if entry_id == leader or entry_id in members:
+                return [leader, *members]
+        return []
+
+    @callback
+    def async_join(self, leader: str, members: list[str]) -> None:
+        """Add members to the group of the leader.
+
+        Members leave their current group, a member that leads a group
+        dissolves it. A leader that was a member itself leaves that group.
+        """
+        changed = {leader}
+        if leader not in self._members:
+            changed.update(self._async_remove(leader))
+        for member in members:
+            if member != leader:
+                changed.update(self._async_remove(member))
+        self._members.setdefault(leader, [])
+        for member in members:
+            if member != leader and member not in self._members[leader]:
+                self._members[leader].append(member)
+        changed.update(self._members[leader])
+        self._async_notify(changed)
+
+    @callback
+    def async_unjoin(self, entry_id: str) -> None:
+        """Leave the group, the group of a leader is dissolved."""
+        self._async_notify(self._async_remove(entry_id))
+
+    @callback
+    def _async_remove(self, entry_id: str) -> set[str]:
+        if (members := self._members.pop(entry_id, None)) is not None:
+            return {entry_id, *members}
+        for leader, members in self._members.items():
+            if entry_id in members:
+                members.remove(entry_id)
+                if not members:
+                    del self._members[leader]
+                return {leader, entry_id}
+        return set()
+
+    @callback
+    def _async_notify(self, entry_ids: set[str]) -> None:
+        if entry_ids:
+            async_dispatcher_send(self._hass, SIGNAL_GROUP_CHANGED, entry_ids)
+
+
+async def async_send_to_group(
+    coordinators: list[YtmdCoordinator],
+    command: Callable[[YtmdClient], Callable[[], Awaitable[None]]],
+    key: str | None = None,
+    timeout: float = GROUP_MEMBER_TIMEOUT,
+) -> None:
+    """Send a command to all coordinators at the same time.
+
+    Raises GroupCommandError with the failed members when it did not
+    succeed everywhere, the other members did get the command.
+    """
+
+    async def _async_send(coordinator: YtmdCoordinator) -> None:
+        async with async_timeout.timeout(timeout):
+            await coordinator.commands.async_send(command(coordinator.api), key)
+
+    results = await asyncio.gather(
+        *(_async_send(coordinator) for coordinator in coordinators),
+        return_exceptions=True,
+    )
+    failures: dict[str, Exception] = {}
+    for coordinator, result in zip(coordinators, results):
+        if not isinstance(result, Exception):
+            continue
+        failures[coordinator.api.host] = result
+        if isinstance(result, aioytmdesktopapi.Unauthorized):
+            if coordinator.config_entry is not None:
+                coordinator.config_entry.async_start_reauth(coordinator.hass)
+        LOGGER.warning(
+            "Group command failed on YTMD at %s: %s",
+            coordinator.api.host,
+            str(result) or type(result).__name__,
+        )
+    if failures:
+        raise GroupCommandError(failures)
@@ -0,0 +1,191 @@
+"""Play history for the YouTube Music Desktop Remote Control integration.
+
+The most recent plays are kept in a ring buffer. On disk each play is a
+line with a JSON array, new plays are appended. The file is only rewritten
+when it grew to a multiple of the number of plays kept.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+import datetime
+import json
+import os
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.util.dt import utc_from_timestamp
+
+from .const import DOMAIN, HISTORY_COMPACT_FACTOR, HISTORY_SIZE, LOGGER
+from .projection import YtmdState
+
+
+@dataclass(frozen=True, slots=True)
+class Play:
+    """Track that started playing."""
+
+    started_at: float
+    title: str
+    author: str
+    album: str
+    duration: int
+
+    @classmethod
+    def from_state(
+        cls, state: YtmdState | None, started_at: datetime.datetime
+    ) -> Play | None:
+        if state is None or not state.has_song:
+            return None
+        return cls(
+            started_at.timestamp(),
+            state.title,
+            state.author,
+            state.album,
+            state.duration,
+        )
+
+    def same_track(self, other: Play | None) -> bool:
+        return (
+            other is not None
+            and self.title == other.title
+            and self.author == other.author
+            and self.album == other.album
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "title": self.title,
+            "author": self.author,
+            "album": self.album,
+            "duration": self.duration,
+            "started_at": utc_from_timestamp(self.started_at).isoformat(),
+        }
+
+
+class PlayHistory:
+    """Recent plays of a YTMD instance."""
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, size: int = HISTORY_SIZE
+    ) -> None:
+        self._hass = hass
+        self._size = size
+        self.path = hass.config.path(STORAGE_DIR, f"{DOMAIN}.{entry_id}.history")
+        self.plays: deque[Play] = deque(maxlen=size)
+
+        self._lines_on_disk = 0
+        self._pending: list[Play] = []
+        self._writing: asyncio.Task[None] | None = None
+
+    @property
+    def last(self) -> Play | None:
+        return self.plays[-1] if self.plays else None
+
+    async def async_load(self) -> None:
+        plays, self._lines_on_disk = await self._hass.async_add_executor_job(
+            _read_plays, self.path, self._size
+        )
+        self.plays.extend(plays)
+
+    @callback
+    def async_add(self, play: Play) -> None:
+        """Add a play, it gets written in the background."""
+        self.plays.append(play)
+        self._pending.append(play)
+        if self._writing is None:
+            self._writing = self._hass.async_create_background_task(
+                self._async_write(), f"{DOMAIN} write history"
+            )
+
+    def recent(self, limit: int | None = None) -> list[Play]:
+        """Most recent plays first."""
+        plays = list(reversed(self.plays))
+        return plays if limit is None else plays[:limit]
+
+    async def async_flush(self) -> None:
+        """Wait until all plays are written."""
+        if self._writing is not None:
+            await asyncio.shield(self._writing)
+
+    async def async_remove(self) -> None:
+        await self.async_flush()
+        await self._hass.async_add_executor_job(_remove_file, self.path)
+
+    async def _async_write(self) -> None:
+        try:
+            while self._pending:
+                plays, self._pending = self._pending, []
+                if (
+                    self._lines_on_disk + len(plays)
+                    > self._size * HISTORY_COMPACT_FACTOR
+                ):
+                    # Snapshot taken here, the buffer changes while writing
+                    snapshot = list(self.plays)
+                    await self._hass.async_add_executor_job(
+                        _rewrite_plays, self.path, snapshot
+                    )
+                    self._lines_on_disk = len(snapshot)
+                else:
+                    await self._hass.async_add_executor_job(
+                        _append_plays, self.path, plays
+                    )
+                    self._lines_on_disk += len(plays)
+        except OSError as err:
+            LOGGER.warning("Unable to write play history %s: %s", self.path, err)
+        finally:
+            self._writing = None
+
+
+def _line(play: Play) -> str:
+    return (
+        json.dumps(
+            [play.started_at, play.title, play.author, play.album, play.duration],
+            separators=(",", ":"),
+        )
+        + "\n"
+    )
+
+
+def _read_plays(path: str, size: int) -> tuple[list[Play], int]:
+    try:
+        with open(path, "rb+") as file:
+            data = file.read()
+            if not data.endswith(b"\n"):
+                # Line cut off by a crash while appending, dropped so the
+                # next append does not continue it
+                data = data[: data.rfind(b"\n") + 1]
+                file.truncate(len(data))
+    except FileNotFoundError:
+        return [], 0
+
+    lines = data.decode("utf-8").splitlines()
+    plays: deque[Play] = deque(maxlen=size)
+    for line in lines:
+        try:
+            plays.append(Play(*json.loads(line)))
+        except (ValueError, TypeError):
+            continue
+    return list(plays), len(lines)
+
+
+def _append_plays(path: str, plays: list[Play]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a", encoding="utf-8") as file:
+        file.writelines(_line(play) for play in plays)
+
+
+def _rewrite_plays(path: str, plays: list[Play]) -> None:
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        file.writelines(_line(play) for play in plays)
+    os.replace(temp_path, path)
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,136 @@
+"""Hub for the YouTube Music Desktop Remote Control integration.
+
+The hub is shared by all config entries. Instead of every coordinator
+running its own timer, polls are put on a timer wheel with a slot per
+HUB_TIMER_RESOLUTION seconds and a single timer fires for the earliest
+slot. Polls get a bit of jitter and the number of state requests in
+flight over all YTMD instances is capped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import math
+import random
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    HUB_MAX_CONCURRENT_POLLS,
+    HUB_POLL_JITTER,
+    HUB_TIMER_RESOLUTION,
+)
+from .group import YtmdGroups
+
+if TYPE_CHECKING:
+    from .coordinator import YtmdCoordinator
+
+
+class YtmdHub:
+    """Schedules the polls of all YTMD instances."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_concurrent: int = HUB_MAX_CONCURRENT_POLLS,
+        jitter: float = HUB_POLL_JITTER,
+    ) -> None:
+        self._hass = hass
+        self._jitter = jitter
+        self.coordinators: dict[str, YtmdCoordinator] = {}
+        self.groups = YtmdGroups(hass)
+        # Shared by the coordinators to limit the requests in flight
+        self.poll_limit = asyncio.Semaphore(max_concurrent)
+
+        self._slots: dict[int, set[YtmdCoordinator]] = {}
+        self._timer_slot: int | None = None
+        self._unsub_timer: CALLBACK_TYPE | None = None
+
+        self.polls = 0
+        self.skipped = 0
+
+    @callback
+    def async_schedule(
+        self, coordinator: YtmdCoordinator, interval: datetime.timedelta
+    ) -> CALLBACK_TYPE:
+        """Schedule a poll of the coordinator, returns a callback to cancel it."""
+        delay = interval.total_seconds()
+        delay += random.uniform(0, delay * self._jitter)
+        slot = math.ceil((dt_util.utcnow().timestamp() + delay) / HUB_TIMER_RESOLUTION)
+        self._slots.setdefault(slot, set()).add(coordinator)
+        self._async_arm_timer()
+
+        @callback
+        def unschedule() -> None:
+            if (coordinators := self._slots.get(slot)) is None:
+                return
+            coordinators.discard(coordinator)
+            if not coordinators:
+                del self._slots[slot]
+                self._async_arm_timer()
+
+        return unschedule
+
+    @property
+    def scheduled(self) -> int:
+        """Number of polls waiting on the timer."""
+        return sum(len(coordinators) for coordinators in self._slots.values())
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "instances": len(self.coordinators),
+            "scheduled": self.scheduled,
+            "polls": self.polls,
+            "skipped": self.skipped,
+        }
+
+    @callback
+    def _async_arm_timer(self) -> None:
+        slot = min(self._slots, default=None)
+        if slot == self._timer_slot:
+            return
+
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._timer_slot = slot
+        if slot is not None:
+            self._unsub_timer = async_track_point_in_utc_time(
+                self._hass,
+                self._async_handle_timer,
+                dt_util.utc_from_timestamp(slot * HUB_TIMER_RESOLUTION),
+            )
+
+    @callback
+    def _async_handle_timer(self, now: datetime.datetime) -> None:
+        fired_slot = self._timer_slot
+        assert fired_slot is not None
+        self._unsub_timer = None
+        self._timer_slot = None
+
+        for slot in sorted(slot for slot in self._slots if slot <= fired_slot):
+            for coordinator in self._slots.pop(slot):
+                # Listeners went away after scheduling, nobody needs the data
+                if not coordinator.has_listeners:
+                    self.skipped += 1
+                    continue
+                self.polls += 1
+                self._hass.async_create_task(
+                    coordinator.async_handle_scheduled_refresh(),
+                    f"{DOMAIN} poll {coordinator.api.host}",
+                )
+
+        self._async_arm_timer()
+
+
+@callback
+def async_get_hub(hass: HomeAssistant) -> YtmdHub:
+    """Get the hub shared by all config entries."""
+    if (hub := hass.data.get(DOMAIN)) is None:
+        hub = hass.data[DOMAIN] = YtmdHub(hass)
+    return hub
@@ -0,0 +1,56 @@
+"""Idle tracking for the YouTube Music Desktop Remote Control integration."""
+
+from __future__ import annotations
+
+from enum import StrEnum
+from time import monotonic
+from typing import Any
+
+
+class IdleReason(StrEnum):
+    """Why updates of a YTMD instance are suspended."""
+
+    # All entities are disabled, nothing shows the state
+    NO_LISTENERS = "no_listeners"
+    # The config entry is set to dormant in its options
+    DORMANT = "dormant"
+
+
+class IdleTracker:
+    """Keep track of when and for how long updates are suspended."""
+
+    def __init__(self) -> None:
+        self.reason: IdleReason | None = None
+        self.suspensions = 0
+        self._suspended_since: float | None = None
+        self._suspended_total = 0.0
+
+    @property
+    def suspended(self) -> bool:
+        return self.reason is not None
+
+    @property
+    def suspended_time(self) -> float:
+        """Seconds spent suspended, including the current suspension."""
+        if self._suspended_since is None:
+            return self._suspended_total
+        return self._suspended_total + monotonic() - self._suspended_since
+
+    def suspend(self, reason: IdleReason) -> None:
+        if self.reason is None:
+            self.suspensions += 1
+            self._suspended_since = monotonic()
+        self.reason = reason
+
+    def resume(self) -> None:
+        if self._suspended_since is not None:
+            self._suspended_total += monotonic() - self._suspended_since
+        self._suspended_since = None
+        self.reason = None
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "reason": self.reason,
+            "suspensions": self.suspensions,
+            "suspended_time": self.suspended_time,
+        }
@@ -0,0 +1,87 @@
+"""Last known state for the YouTube Music Desktop Remote Control integration.
+
+The state is persisted so the integration can show it right away on the
+next start, without waiting for YTMD to respond.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, LAST_STATE_SAVE_DELAY
+from .projection import YtmdState
+
+STORAGE_VERSION = 1
+
+
+def _last_state(state: YtmdState | None) -> dict[str, Any] | None:
+    if state is None or not state.has_song:
+        return None
+    return {
+        "title": state.title,
+        "author": state.author,
+        "album": state.album,
+        "cover": state.cover,
+        "duration": state.duration,
+        "volume_percent": state.volume_percent,
+        "repeat_type": state.repeat_type,
+    }
+
+
+class LastStateStore:
+    """Persist the last known state of a YTMD instance."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}"
+        )
+        self._state: dict[str, Any] | None = None
+        self._unsaved = False
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Load the last known state, in the format YTMD returns it."""
+        if (state := await self._store.async_load()) is None:
+            return None
+        self._state = state
+        return {
+            "player": {
+                "hasSong": True,
+                # Do not pretend to know it is still playing
+                "isPaused": True,
+                "volumePercent": state["volume_percent"],
+                "seekbarCurrentPosition": 0,
+                "repeatType": state["repeat_type"],
+            },
+            "track": {
+                "title": state["title"],
+                "author": state["author"],
+                "album": state["album"],
+                "cover": state["cover"],
+                "duration": state["duration"],
+            },
+        }
+
+    @callback
+    def async_update(self, projection: YtmdState | None) -> None:
+        """Save the state after a while, if it changed."""
+        if (state := _last_state(projection)) is None or state == self._state:
+            return
+        self._state = state
+        self._unsaved = True
+        self._store.async_delay_save(self._data_to_save, LAST_STATE_SAVE_DELAY)
+
+    async def async_flush(self) -> None:
+        """Save a pending change right away."""
+        if self._unsaved:
+            await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        self._unsaved = False
+        return self._state  # type: ignore[return-value]
@@ -1,10 +1,18 @@
 from __future__ import annotations
 import asyncio
-from typing import Optional
+from collections.abc import AsyncIterator, Awaitable, Callable
+import contextlib
+from dataclasses import dataclass
+import datetime
+from functools import partial
+from typing import Any, Optional
 
 import aioytmdesktopapi
+import voluptuous as vol  # type: ignore[import]
 
 from homeassistant.components.media_player import (
+    DOMAIN as MP_DOMAIN,
+    BrowseMedia,
     MediaPlayerEntity,
     MediaPlayerEntityFeature,
     MediaPlayerState,
@@ -12,11 +20,19 @@ from homeassistant.components.media_player import (
     RepeatMode,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_platform, entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util.dt import utcnow
 
-from .const import DOMAIN
+from .artwork import async_get_artwork_cache
+from .browse_media import MediaBrowser, queue_index
+from .client import YtmdClient
+from .const import DOMAIN, FADE_MAX_DURATION, LOGGER
 from .coordinator import YtmdCoordinator
+from .group import SIGNAL_GROUP_CHANGED, GroupCommandError, async_send_to_group
 
 SUPPORTED_MEDIAPLAYER_COMMANDS = (
     MediaPlayerEntityFeature.VOLUME_SET
@@ -26,24 +42,48 @@ SUPPORTED_MEDIAPLAYER_COMMANDS = (
     | MediaPlayerEntityFeature.NEXT_TRACK
     | MediaPlayerEntityFeature.PREVIOUS_TRACK
     | MediaPlayerEntityFeature.REPEAT_SET
-    # | MediaPlayerEntityFeature.SEEK     API command not working, see https://github.com/ytmdesktop/ytmdesktop/issues/885
+    | MediaPlayerEntityFeature.BROWSE_MEDIA
+    | MediaPlayerEntityFeature.PLAY_MEDIA
+    | MediaPlayerEntityFeature.GROUPING
 )
 
+SERVICE_FADE_VOLUME = "fade_volume"
+
+ATTR_DURATION = "duration"
+ATTR_VOLUME_LEVEL = "volume_level"
+
+FADE_VOLUME_SCHEMA = {
+    vol.Required(ATTR_VOLUME_LEVEL): vol.All(
+        vol.Coerce(float), vol.Range(min=0, max=1)
+    ),
+    vol.Required(ATTR_DURATION): vol.All(
+        vol.Coerce(float), vol.Range(min=0, max=FADE_MAX_DURATION)
+    ),
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant, config_entry: ConfigEntry, async_add_entities
 ):
-    coordinator: YtmdCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator: YtmdCoordinator = hass.data[DOMAIN].coordinators[config_entry.entry_id]
     async_add_entities(
         [YtmDesktopMediaPlayer(coordinator, config_entry.entry_id)], True
     )
 
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_FADE_VOLUME, FADE_VOLUME_SCHEMA, "async_fade_volume"
+    )
+
 def schedule_ha_update(func):
     async def _decorator(self: YtmDesktopMediaPlayer, *args, **kwargs):
+        # Any command stops a running fade, a new fade replaces it
+        for coordinator in (self.coordinator, *self._group_member_coordinators()):
+            coordinator.fader.async_cancel()
         try:
+            # Commands go through the dispatcher which requests a refresh
+            # once all queued commands are done
             await func(self, *args, **kwargs)
-            # Use request_async_refresh so the debouncer is used to delay the request a bit
-            await self.coordinator.async_request_refresh()
         except aioytmdesktopapi.Unauthorized:
             entry = self.hass.config_entries.async_get_entry(self._attr_unique_id)  # type: ignore[arg-type]
             entry.async_start_reauth(self.hass)  # type: ignore[union-attr]
@@ -52,10 +92,20 @@ def schedule_ha_update(func):
     return _decorator
 
 
+@dataclass
+class OptimisticValue:
+    """Expected value of an attribute after a command."""
+
+    value: Any
+    # Set once the command was accepted by YTMD
+    sent_at: datetime.datetime | None = None
+
+
 class YtmDesktopMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
     """YouTube Music Desktop mediaplayer."""
 
-    _attr_media_image_remotely_accessible = True
+    # Artwork is served through the image proxy from the artwork cache
+    _attr_media_image_remotely_accessible = False
     _attr_name = None
     _attr_has_entity_name = True
 
@@ -69,70 +119,275 @@ class YtmDesktopMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
             "name": "YouTube Music Desktop",  # API does not expose a name. Pick a decent default, user can change
             "identifiers": {(DOMAIN, configentry_id)},
         }
+        self._artwork = async_get_artwork_cache(coordinator.hass)
+        self._browser = MediaBrowser(coordinator, self.get_browse_image_url)
+
+        self._optimistic: dict[str, OptimisticValue] = {}
+
+    async def async_added_to_hass(self) -> None:
+        """When entity is added to hass."""
+        await super().async_added_to_hass()
+        self._async_prefetch_artwork()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, SIGNAL_GROUP_CHANGED, self._async_handle_group_changed
+            )
+        )
+
+    @callback
+    def _async_handle_group_changed(self, entry_ids: set[str]) -> None:
+        if self._configentry_id in entry_ids:
+            self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._async_resolve_optimistic()
+        self._async_prefetch_artwork()
+        super()._handle_coordinator_update()
+
+    async def _async_send(
+        self, send: Callable[[], Awaitable[None]], key: str | None = None
+    ) -> None:
+        await self.coordinator.commands.async_send(send, key)
+
+    async def _async_send_group(
+        self,
+        command: Callable[[YtmdClient], Callable[[], Awaitable[None]]],
+        key: str | None = None,
+    ) -> None:
+        """Send a command to this YTMD and, when leading a group, its members."""
+        if not (members := self._group_member_coordinators()):
+            await self._async_send(command(self.coordinator.api), key)
+            return
+        await async_send_to_group([self.coordinator, *members], command, key)
+
+    def _group_member_coordinators(self) -> list[YtmdCoordinator]:
+        """Coordinators of the members, when leading a group."""
+        hub = self.hass.data[DOMAIN]
+        return [
+            hub.coordinators[entry_id]
+            for entry_id in hub.groups.members(self._configentry_id)
+            if entry_id in hub.coordinators
+        ]
+
+    @contextlib.asynccontextmanager
+    async def _async_optimistic(self, key: str, value: Any) -> AsyncIterator[None]:
+        """Show the expected value while the command runs and until confirmed."""
+        self._optimistic[key] = optimistic = OptimisticValue(value)
+        self.async_write_ha_state()
+        try:
+            yield
+        except GroupCommandError as err:
+            if self.coordinator.api.host in err.failures:
+                self._async_roll_back(key, optimistic)
+            else:
+                # Only members failed, this YTMD did get the command
+                optimistic.sent_at = utcnow()
+            raise
+        except Exception:
+            self._async_roll_back(key, optimistic)
+            raise
+        optimistic.sent_at = utcnow()
+
+    @callback
+    def _async_roll_back(self, key: str, optimistic: OptimisticValue) -> None:
+        if self._optimistic.get(key) is optimistic:
+            del self._optimistic[key]
+            self.async_write_ha_state()
+
+    def _optimistic_value(self, key: str, actual: Any) -> Any:
+        if (optimistic := self._optimistic.get(key)) is not None:
+            return optimistic.value
+        return actual
+
+    @callback
+    def _async_resolve_optimistic(self) -> None:
+        """Confirm or roll back optimistic values with the real state."""
+        if not self._optimistic:
+            return
+
+        if not self.coordinator.last_update_success or not (
+            projection := self.coordinator.projection
+        ):
+            self._optimistic = {
+                key: optimistic
+                for key, optimistic in self._optimistic.items()
+                if optimistic.sent_at is None
+            }
+            return
+
+        actual = {
+            "volume": projection.volume_percent,
+            "paused": projection.is_paused,
+            "repeat": projection.repeat_type,
+        }
+        requested_at = self.coordinator.data.requested_at
+        for key, optimistic in list(self._optimistic.items()):
+            if optimistic.sent_at is None or requested_at < optimistic.sent_at:
+                # Data does not include the effect of the command yet
+                continue
+            if actual[key] != optimistic.value:
+                LOGGER.debug(
+                    "Rolling back %s, expected %s but is %s",
+                    key,
+                    optimistic.value,
+                    actual[key],
+                )
+            del self._optimistic[key]
+
+    @callback
+    def _async_prefetch_artwork(self) -> None:
+        # Have the covers ready when the frontend or next track needs them
+        for url in (self.media_image_url, self.coordinator.api.next_cover):
+            if url:
+                self._artwork.async_prefetch(url)
 
     @property
     def state(self) -> MediaPlayerState | None:
         """Return the state of the entity."""
-        if not self.coordinator.api.player or not self.coordinator.api.player.has_song:
+        projection = self.coordinator.projection
+        if projection is None or not projection.has_song:
             return MediaPlayerState.IDLE
-        if self.coordinator.api.player.is_paused:
+        if self._optimistic_value("paused", projection.is_paused):
             return MediaPlayerState.PAUSED
         return MediaPlayerState.PLAYING
 
     @property
     def volume_level(self):
         """Volume level of the media player (0..1)."""
-        return self.coordinator.api.player.volume_percent / 100
+        if (projection := self.coordinator.projection) is None:
+            return None
+        return self._optimistic_value("volume", projection.volume_percent) / 100
 
     @property
     def supported_features(self):
         """Flag of media commands that are supported."""
+        # Not all YTMD versions honour seeking, see SeekController
+        if self.coordinator.seek.supported:
+            return SUPPORTED_MEDIAPLAYER_COMMANDS | MediaPlayerEntityFeature.SEEK
         return SUPPORTED_MEDIAPLAYER_COMMANDS
 
     @schedule_ha_update
     async def async_set_volume_level(self, volume) -> None:
         """Set volume level, convert range from 0..1."""
-        await self.coordinator.api.send_command.player_set_volume(int(volume * 100))
+        # Dragging a slider results in a burst of calls, only the latest gets sent
+        percent = round(volume * 100)
+        async with self._async_optimistic("volume", percent):
+            await self._async_send_group(
+                lambda api: partial(api.set_volume, percent), key="volume"
+            )
+
+    @schedule_ha_update
+    async def async_fade_volume(self, volume_level: float, duration: float) -> None:
+        """Fade the volume to the level (0..1) over the duration in seconds.
+
+        When leading a group, the members fade from their own volume.
+        """
+        if self.coordinator.projection is None:
+            raise HomeAssistantError("The volume of YTMD is not known yet")
+        target = round(volume_level * 100)
+        self.coordinator.fader.async_start(
+            round(self.volume_level * 100), target, duration, self._async_fade_step
+        )
+        for coordinator in self._group_member_coordinators():
+            if (projection := coordinator.projection) is None:
+                LOGGER.warning(
+                    "Not fading YTMD at %s, its volume is not known yet",
+                    coordinator.api.host,
+                )
+                continue
+            # Members show the volume once the final step refreshes them
+            coordinator.fader.async_start(
+                projection.volume_percent, target, duration, lambda volume: None
+            )
+
+    @callback
+    def _async_fade_step(self, volume: int) -> None:
+        # Shown until a refresh confirms it, the steps do not refresh
+        self._optimistic["volume"] = OptimisticValue(volume, utcnow())
+        self.async_write_ha_state()
 
     @schedule_ha_update
     async def async_volume_up(self) -> None:
         """Volume up media player."""
-        await self.coordinator.api.send_command.player_volume_up()
+        await self._async_send_group(lambda api: api.send_command.player_volume_up)
 
     @schedule_ha_update
     async def async_volume_down(self) -> None:
         """Volume down media player."""
-        await self.coordinator.api.send_command.player_volume_down()
+        await self._async_send_group(lambda api: api.send_command.player_volume_down)
 
     @schedule_ha_update
     async def async_media_play(self) -> None:
-        await self.coordinator.api.send_command.track_play()
+        async with self._async_optimistic("paused", False):
+            await self._async_send_group(lambda api: api.send_command.track_play)
 
     @schedule_ha_update
     async def async_media_pause(self) -> None:
-        await self.coordinator.api.send_command.track_pause()
+        async with self._async_optimistic("paused", True):
+            await self._async_send_group(lambda api: api.send_command.track_pause)
 
     @schedule_ha_update
     async def async_media_next_track(self) -> None:
-        await self.coordinator.api.send_command.track_next()
+        await self._async_send_group(lambda api: api.send_command.track_next)
 
     @schedule_ha_update
     async def async_media_previous_track(self) -> None:
-        await self.coordinator.api.send_command.track_previous()
+        await self._async_send_group(lambda api: api.send_command.track_previous)
 
     @schedule_ha_update
     async def async_media_seek(self, position) -> None:
-        if self.coordinator.api.track:
-            await self.coordinator.api.send_command.player_set_seekbar(int(position))
+        if self.coordinator.projection is not None:
+            # Show the new position right away, dragging is throttled
+            self.coordinator.seek.async_request(position)
+            self.async_write_ha_state()
+            await self.coordinator.seek.async_send()
+
+    async def async_browse_media(
+        self,
+        media_content_type: MediaType | str | None = None,
+        media_content_id: str | None = None,
+    ) -> BrowseMedia:
+        """Browse the queue and playlists."""
+        return await self._browser.async_browse(media_content_id)
+
+    async def async_get_browse_image(
+        self,
+        media_content_type: str,
+        media_content_id: str,
+        media_image_id: str | None = None,
+    ) -> tuple[bytes | None, str | None]:
+        """Fetch a thumbnail for the media browser."""
+        if (
+            media_image_id is None
+            or (url := self._browser.cover_url(media_image_id)) is None
+        ):
+            return None, None
+        return await self._artwork.async_get(url)
+
+    @schedule_ha_update
+    async def async_play_media(
+        self, media_type: MediaType | str, media_id: str, **kwargs: Any
+    ) -> None:
+        """Play a track from the queue."""
+        if (index := queue_index(media_id)) is None:
+            raise HomeAssistantError(f"Can not play {media_id}, only queued tracks")
+        await self._async_send(
+            partial(self.coordinator.api.set_queue, index), key="queue"
+        )
 
     @property
     def repeat(self) -> Optional[str]:
         """Return current repeat mode."""
-        if self.coordinator.api.player.repeat_type == aioytmdesktopapi.RepeatType.ONE:
+        if (projection := self.coordinator.projection) is None:
+            return None
+        repeat_type = self._optimistic_value("repeat", projection.repeat_type)
+        if repeat_type == aioytmdesktopapi.RepeatType.ONE:
             return RepeatMode.ONE
-        if self.coordinator.api.player.repeat_type == aioytmdesktopapi.RepeatType.ALL:
+        if repeat_type == aioytmdesktopapi.RepeatType.ALL:
             return RepeatMode.ALL
-        if self.coordinator.api.player.repeat_type == aioytmdesktopapi.RepeatType.NONE:
+        if repeat_type == aioytmdesktopapi.RepeatType.NONE:
             return RepeatMode.OFF
         return None
 
@@ -140,18 +395,50 @@ class YtmDesktopMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
     async def async_set_repeat(self, repeat) -> None:
         """Set repeat mode."""
         if repeat == RepeatMode.ALL:
-            await self.coordinator.api.send_command.player_repeat(
-                aioytmdesktopapi.RepeatType.ALL
-            )
+            repeat_type = aioytmdesktopapi.RepeatType.ALL
         elif repeat == RepeatMode.OFF:
-            await self.coordinator.api.send_command.player_repeat(
-                aioytmdesktopapi.RepeatType.NONE
-            )
+            repeat_type = aioytmdesktopapi.RepeatType.NONE
         elif repeat == RepeatMode.ONE:
-            await self.coordinator.api.send_command.player_repeat(
-                aioytmdesktopapi.RepeatType.ONE
+            repeat_type = aioytmdesktopapi.RepeatType.ONE
+        else:
+            return
+
+        async with self._async_optimistic("repeat", repeat_type):
+            await self._async_send_group(
+                lambda api: partial(api.send_command.player_repeat, repeat_type),
+                key="repeat",
             )
 
+    @property
+    def group_members(self) -> list[str]:
+        """Media players in the group of this one, the leader first."""
+        registry = er.async_get(self.hass)
+        return [
+            entity_id
+            for entry_id in self.hass.data[DOMAIN].groups.group_of(self._configentry_id)
+            if (entity_id := registry.async_get_entity_id(MP_DOMAIN, DOMAIN, entry_id))
+        ]
+
+    async def async_join_players(self, group_members: list[str]) -> None:
+        """Send the commands of this media player to the others as well."""
+        hub = self.hass.data[DOMAIN]
+        registry = er.async_get(self.hass)
+        entry_ids = []
+        for entity_id in group_members:
+            if (
+                (entity := registry.async_get(entity_id)) is None
+                or entity.platform != DOMAIN
+                or entity.config_entry_id not in hub.coordinators
+            ):
+                raise HomeAssistantError(
+                    f"{entity_id} is not a loaded YouTube Music Desktop media player"
+                )
+            entry_ids.append(entity.config_entry_id)
+        hub.groups.async_join(self._configentry_id, entry_ids)
+
+    async def async_unjoin_player(self) -> None:
+        self.hass.data[DOMAIN].groups.async_unjoin(self._configentry_id)
+
     # Media info
     @property
     def media_content_type(self) -> Optional[str]:
@@ -161,31 +448,37 @@ class YtmDesktopMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
     @property
     def media_title(self) -> Optional[str]:
         """Title of current playing media."""
-        return self.coordinator.api.track.title if self.coordinator.api.track else None
+        projection = self.coordinator.projection
+        return projection.title if projection else None
 
     @property
     def media_artist(self) -> Optional[str]:
         """Artist of current playing media, music track only."""
-        return self.coordinator.api.track.author if self.coordinator.api.track else None
+        projection = self.coordinator.projection
+        return projection.author if projection else None
 
     @property
     def media_album_name(self) -> Optional[str]:
         """Album name of current playing media, music track only."""
-        return self.coordinator.api.track.album if self.coordinator.api.track else None
+        projection = self.coordinator.projection
+        return projection.album if projection else None
 
     @property
     def media_image_url(self) -> Optional[str]:
         """Image url of current playing media."""
-        return self.coordinator.api.track.cover if self.coordinator.api.track else None
+        projection = self.coordinator.projection
+        return projection.cover if projection else None
+
+    async def async_get_media_image(self) -> tuple[bytes | None, str | None]:
+        """Fetch media image of current playing image."""
+        if (url := self.media_image_url) is None:
+            return None, None
+        return await self._artwork.async_get(url)
 
     @property
     def media_position(self):
         """Position of current playing media in seconds."""
-        return (
-            self.coordinator.api.player.seekbar_current_position
-            if self.coordinator.api.player
-            else None
-        )
+        return self.coordinator.position.position
 
     @property
     def media_position_updated_at(self):
@@ -194,11 +487,10 @@ class YtmDesktopMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
         Returns value from homeassistant.util.dt.utcnow().
         """
         if self.state == MediaPlayerState.PLAYING:
-            return self.coordinator.data.last_updated
+            return self.coordinator.position.updated_at
 
     @property
     def media_duration(self):
         """Time in seconds of current song duration."""
-        return (
-            self.coordinator.api.track.duration if self.coordinator.api.track else None
-        )
+        projection = self.coordinator.projection
+        return projection.duration if projection else None
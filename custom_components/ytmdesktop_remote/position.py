@@ -0,0 +1,59 @@
+"""Media position model for the YouTube Music Desktop Remote Control integration."""
+
+from __future__ import annotations
+
+import datetime
+
+from .const import POSITION_DRIFT_THRESHOLD
+
+
+class PositionModel:
+    """Extrapolate the media position between samples.
+
+    The position is only moved to a new sample when it drifts from the
+    prediction, so the position attributes stay the same while playing
+    normally and frontends can do the interpolation.
+    """
+
+    def __init__(self, threshold: float = POSITION_DRIFT_THRESHOLD) -> None:
+        self._threshold = threshold
+        self.position: float | None = None
+        self.updated_at: datetime.datetime | None = None
+        self.playing = False
+
+    def predict(self, at: datetime.datetime) -> float | None:
+        """Predicted position at the given time."""
+        if self.position is None or self.updated_at is None:
+            return None
+        if not self.playing:
+            return self.position
+        return self.position + (at - self.updated_at).total_seconds()
+
+    def seek(self, position: float, at: datetime.datetime) -> None:
+        """Move to a position requested by the user, playing continues."""
+        self.position = position
+        self.updated_at = at
+
+    def update(
+        self, position: float | None, sampled_at: datetime.datetime, playing: bool
+    ) -> bool:
+        """Process a sampled position, returns True when the model changed."""
+        if position is None:
+            changed = self.position is not None
+            self.position = None
+            self.updated_at = None
+            self.playing = False
+            return changed
+
+        predicted = self.predict(sampled_at)
+        if (
+            predicted is not None
+            and playing == self.playing
+            and abs(position - predicted) <= self._threshold
+        ):
+            return False
+
+        self.position = position
+        self.updated_at = sampled_at
+        self.playing = playing
+        return True
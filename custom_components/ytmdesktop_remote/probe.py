@@ -0,0 +1,82 @@
+"""Probe for the YouTube Music Desktop Remote Control integration.
+
+Used by the config flow to check a desktop can be reached with the given
+password. Results are kept for a short while, so submitting a form again or
+a reauth right after does not need another request. Concurrent probes of the
+same desktop share a single request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from time import monotonic
+
+import aiohttp
+import aioytmdesktopapi
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.singleton import singleton
+
+from .client import YtmdClient
+from .const import DOMAIN, PROBE_CACHE_TTL
+
+DATA_PROBE_CACHE = f"{DOMAIN}_probe"
+
+ProbeKey = tuple[str, str | None]
+
+
+class ProbeCache:
+    """Probe results by host and password."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        session: aiohttp.ClientSession,
+        ttl: float = PROBE_CACHE_TTL,
+    ) -> None:
+        self._hass = hass
+        self._session = session
+        self._ttl = ttl
+        # Expiry time and the error, None when the probe succeeded
+        self._results: dict[ProbeKey, tuple[float, Exception | None]] = {}
+        self._probing: dict[ProbeKey, asyncio.Task[None]] = {}
+
+    async def async_probe(self, host: str, password: str | None) -> None:
+        """Raise RequestError or Unauthorized when the desktop can not be used."""
+        key = (host, password)
+        if (result := self._results.get(key)) is not None:
+            expires, error = result
+            if expires > monotonic():
+                if error is not None:
+                    raise error
+                return
+            del self._results[key]
+
+        if (task := self._probing.get(key)) is None:
+            task = self._hass.async_create_task(self._async_probe(key))
+            self._probing[key] = task
+            task.add_done_callback(lambda _: self._probing.pop(key, None))
+        await asyncio.shield(task)
+
+    @callback
+    def async_invalidate(self, host: str, password: str | None) -> None:
+        self._results.pop((host, password), None)
+
+    async def _async_probe(self, key: ProbeKey) -> None:
+        host, password = key
+        try:
+            await YtmdClient(self._session, host, password).probe()
+        except aioytmdesktopapi.Unauthorized as err:
+            # Same password will keep failing, but the desktop not being
+            # reachable could be solved by starting YTMD, so try again then
+            self._results[key] = (monotonic() + self._ttl, err)
+            raise
+        self._results[key] = (monotonic() + self._ttl, None)
+
+
+@callback
+@singleton(DATA_PROBE_CACHE)
+def async_get_probe_cache(hass: HomeAssistant) -> ProbeCache:
+    """Get the probe cache shared by all config flows."""
+    return ProbeCache(hass, async_get_clientsession(hass))
@@ -0,0 +1,51 @@
+"""Projection of the YTMD state for the YouTube Music Desktop Remote Control integration.
+
+The state payload has many fields the integration does not use, like the
+lyrics. Only the used fields are copied into a single immutable record,
+which entities read instead of going through the player and track objects
+of aioytmdesktopapi.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class YtmdState:
+    """Fields of the YTMD state that end up in Home Assistant."""
+
+    has_song: bool
+    is_paused: bool
+    volume_percent: int
+    # Changes every second while playing, so it is left out when comparing
+    seekbar_position: int = field(compare=False)
+    repeat_type: str
+    title: str
+    author: str
+    album: str
+    cover: str
+    duration: int
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> YtmdState:
+        """Project a state payload, in the format the /query endpoint returns."""
+        player = payload["player"]
+        track = payload["track"]
+        return cls(
+            player["hasSong"],
+            player["isPaused"],
+            player["volumePercent"],
+            player["seekbarCurrentPosition"],
+            player["repeatType"],
+            track["title"],
+            track["author"],
+            track["album"],
+            track["cover"],
+            track["duration"],
+        )
+
+    @property
+    def playing(self) -> bool:
+        return self.has_song and not self.is_paused
@@ -0,0 +1,198 @@
+"""Realtime channel of the YouTube Music Desktop app.
+
+Next to the REST API YTMD runs a socket.io server on the same port.
+It emits a `tick` event containing the same player and track state
+as the /query endpoint returns, so there is no need to poll while
+the channel is connected.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import contextlib
+import json
+from time import monotonic
+from typing import Any
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    DOMAIN,
+    LOGGER,
+    REALTIME_RECONNECT_MAX_DELAY,
+    REALTIME_RECONNECT_MIN_DELAY,
+    YTMD_PORT,
+)
+from .stats import RequestStats
+
+# Engine.IO packet types
+EIO_OPEN = "0"
+EIO_CLOSE = "1"
+EIO_PING = "2"
+EIO_PONG = "3"
+EIO_MESSAGE = "4"
+
+# Socket.IO packet types, these are wrapped in an Engine.IO message
+SIO_CONNECT = "0"
+SIO_EVENT = "2"
+
+STATE_EVENT = "tick"
+
+# Used until the server tells us its values in the open packet
+DEFAULT_PING_INTERVAL = 25.0
+DEFAULT_PING_TIMEOUT = 20.0
+
+
+class YtmdRealtime:
+    """Maintain the socket.io connection to a YTMD instance."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        session: aiohttp.ClientSession,
+        host: str,
+        on_state: Callable[[dict[str, Any]], None],
+        on_connection: Callable[[bool], None],
+        stats: RequestStats | None = None,
+    ) -> None:
+        self._hass = hass
+        self._session = session
+        self._host = host
+        self._on_state = on_state
+        self._on_connection = on_connection
+        self._task: asyncio.Task | None = None
+        self._ping_sent_at: float | None = None
+        # Round trips of the pings, recorded as "ping" requests
+        self.stats = stats or RequestStats()
+
+        self.connected = False
+        self.connects = 0
+
+    @property
+    def url(self) -> str:
+        # YTMDv1 ships socket.io 2.x which talks Engine.IO protocol version 3
+        return f"http://{self._host}:{YTMD_PORT}/socket.io/?EIO=3&transport=websocket"
+
+    @property
+    def running(self) -> bool:
+        """The connection is kept, or being reconnected."""
+        return self._task is not None
+
+    @callback
+    def async_start(self) -> None:
+        """Start (and keep) the connection in the background."""
+        if self._task is None:
+            self._task = self._hass.async_create_background_task(
+                self._async_run(), f"{DOMAIN} realtime {self._host}"
+            )
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop reconnecting, the connection closes in the background.
+
+        It can be started again right away, without waiting for the close.
+        """
+        if (task := self._task) is None:
+            return
+        self._task = None
+        task.cancel()
+        self.connected = False
+
+    async def async_stop(self) -> None:
+        """Close the connection and stop reconnecting."""
+        task = self._task
+        self.async_cancel()
+        if task is not None:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def _async_run(self) -> None:
+        delay = REALTIME_RECONNECT_MIN_DELAY
+        while True:
+            try:
+                async with self._session.ws_connect(self.url) as ws:
+                    await self._async_listen(ws)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as err:
+                LOGGER.debug("Realtime connection to %s failed: %s", self._host, err)
+
+            if self.connected:
+                LOGGER.debug("Realtime connection to %s lost", self._host)
+                self._set_connected(False)
+                delay = REALTIME_RECONNECT_MIN_DELAY
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, REALTIME_RECONNECT_MAX_DELAY)
+
+    async def _async_listen(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        msg = await ws.receive(timeout=DEFAULT_PING_TIMEOUT)
+        if msg.type != aiohttp.WSMsgType.TEXT or not msg.data.startswith(EIO_OPEN):
+            raise ValueError(f"Unexpected handshake: {msg.data}")
+
+        handshake = json.loads(msg.data[1:])
+        ping_interval = (
+            handshake.get("pingInterval", DEFAULT_PING_INTERVAL * 1000) / 1000
+        )
+        ping_timeout = handshake.get("pingTimeout", DEFAULT_PING_TIMEOUT * 1000) / 1000
+
+        await ws.send_str(EIO_MESSAGE + SIO_CONNECT)
+        self._set_connected(True)
+
+        pinger = asyncio.create_task(self._async_ping(ws, ping_interval))
+        try:
+            while True:
+                msg = await ws.receive(timeout=ping_interval + ping_timeout)
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    return
+
+                if msg.data == EIO_PING:
+                    # Engine.IO 4 servers ping the client instead of the other way around
+                    await ws.send_str(EIO_PONG)
+                elif msg.data == EIO_PONG:
+                    self._handle_pong()
+                elif msg.data.startswith(EIO_MESSAGE + SIO_EVENT):
+                    self._handle_event(msg.data[2:])
+                elif msg.data == EIO_CLOSE:
+                    return
+        finally:
+            pinger.cancel()
+
+    async def _async_ping(
+        self, ws: aiohttp.ClientWebSocketResponse, interval: float
+    ) -> None:
+        # Pings right away, so the latency is known as soon as it connects
+        self._ping_sent_at = None
+        with contextlib.suppress(aiohttp.ClientError, ConnectionResetError):
+            while not ws.closed:
+                self._ping_sent_at = monotonic()
+                await ws.send_str(EIO_PING)
+                await asyncio.sleep(interval)
+
+    def _handle_pong(self) -> None:
+        if self._ping_sent_at is None:
+            return
+        self.stats.record("ping", monotonic() - self._ping_sent_at, round_trip=True)
+        self._ping_sent_at = None
+
+    def _handle_event(self, payload: str) -> None:
+        # Event payload can have an ack id before the actual data, skip it
+        try:
+            event, *args = json.loads(payload[payload.index("[") :])
+        except ValueError:
+            LOGGER.debug("Ignoring malformed realtime event: %s", payload)
+            return
+
+        if event != STATE_EVENT or not args:
+            return
+
+        state = args[0]
+        if isinstance(state, dict) and "player" in state and "track" in state:
+            self._on_state(state)
+
+    def _set_connected(self, connected: bool) -> None:
+        self.connected = connected
+        if connected:
+            self.connects += 1
+        self._on_connection(connected)
@@ -0,0 +1,218 @@
+"""Seeking for the YouTube Music Desktop Remote Control integration.
+
+Some YTMD versions ignore the seek command, see
+https://github.com/ytmdesktop/ytmdesktop/issues/885. Whether the connected
+YTMD honours it is found out by checking the position reported after a seek.
+A report after the track changed or playback paused or resumed tells nothing
+about the seek. Support is checked again after YTMD reconnected, it might
+have been updated in the meantime.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import datetime
+from enum import StrEnum
+from functools import partial
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util.dt import utcnow
+
+from .client import YtmdClient
+from .commands import CommandDispatcher
+from .const import (
+    DOMAIN,
+    LOGGER,
+    POSITION_DRIFT_THRESHOLD,
+    SEEK_IGNORED_LIMIT,
+    SEEK_MIN_INTERVAL,
+)
+from .position import PositionModel
+from .projection import YtmdState
+
+
+class SeekSupport(StrEnum):
+    """Whether the connected YTMD honours seek commands."""
+
+    UNKNOWN = "unknown"
+    SUPPORTED = "supported"
+    UNSUPPORTED = "unsupported"
+
+
+@dataclass
+class SentSeek:
+    """Seek command waiting for a position report to confirm it."""
+
+    position: float
+    # When YTMD should have been at the position
+    position_at: datetime.datetime
+    # When YTMD accepted the command, earlier reports do not include the seek
+    sent_at: datetime.datetime
+    # State when the seek was sent, to tell whether a report is comparable
+    state: YtmdState | None
+
+
+class SeekController:
+    """Send seeks at a limited rate and check if YTMD honours them.
+
+    The position model moves to the requested position right away. Position
+    reports from before the seek was sent are ignored so it does not jump
+    back in the meantime. The latest requested position always gets sent.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: YtmdClient,
+        commands: CommandDispatcher,
+        position: PositionModel,
+        interval: float = SEEK_MIN_INTERVAL,
+    ) -> None:
+        self._hass = hass
+        self._api = api
+        self._commands = commands
+        self._position = position
+        self._interval = datetime.timedelta(seconds=interval)
+
+        # Latest requested position and when it was requested
+        self._target: tuple[float, datetime.datetime] | None = None
+        self._sent: SentSeek | None = None
+        self._sending = False
+        self._last_sent_at: datetime.datetime | None = None
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._ignored = 0
+
+        self.support = SeekSupport.UNKNOWN
+        self.requested = 0
+        self.sent = 0
+
+    @property
+    def supported(self) -> bool:
+        return self.support is not SeekSupport.UNSUPPORTED
+
+    @callback
+    def async_request(self, position: float) -> None:
+        """Request a seek, the position model moves to it right away."""
+        now = utcnow()
+        self._position.seek(position, now)
+        self._target = (position, now)
+        self.requested += 1
+
+    async def async_send(self) -> None:
+        """Send the requested seek, unless a seek was just sent."""
+        if self._sending or self._unsub_timer is not None:
+            # Picked up when the current send or wait is done
+            return
+        if (
+            self._last_sent_at is not None
+            and (next_send := self._last_sent_at + self._interval) > utcnow()
+        ):
+            self._unsub_timer = async_track_point_in_utc_time(
+                self._hass, self._async_on_timer, next_send
+            )
+            return
+        await self._async_send_target()
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop a seek waiting to be sent."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._target = None
+
+    @callback
+    def async_reset_support(self) -> None:
+        """Find out again whether seeking works, e.g. after YTMD reconnected."""
+        self._ignored = 0
+        self.support = SeekSupport.UNKNOWN
+
+    @callback
+    def async_process_sample(
+        self, state: YtmdState, sampled_at: datetime.datetime
+    ) -> bool:
+        """Check a reported state, returns False when its position should be ignored."""
+        if self._target is not None or self._sending:
+            return False
+        if (sent := self._sent) is None:
+            return True
+        if sampled_at < sent.sent_at:
+            return False
+
+        self._sent = None
+        if not _comparable(sent.state, state):
+            # Another track or paused, it is not known whether the seek worked
+            return True
+        expected = sent.position
+        if self._position.playing:
+            expected += (sampled_at - sent.position_at).total_seconds()
+        if abs(state.seekbar_position - expected) <= POSITION_DRIFT_THRESHOLD:
+            self._ignored = 0
+            self.support = SeekSupport.SUPPORTED
+            return True
+
+        self._ignored += 1
+        if self._ignored >= SEEK_IGNORED_LIMIT and self.supported:
+            LOGGER.info(
+                "YTMD at %s ignores seek commands, seeking is disabled",
+                self._api.host,
+            )
+            self.support = SeekSupport.UNSUPPORTED
+        return True
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "support": self.support,
+            "requested": self.requested,
+            "sent": self.sent,
+        }
+
+    @callback
+    def _async_on_timer(self, _now: datetime.datetime) -> None:
+        self._unsub_timer = None
+        self._hass.async_create_task(
+            self._async_send_target(log_errors=True), f"{DOMAIN} seek"
+        )
+
+    async def _async_send_target(self, log_errors: bool = False) -> None:
+        if self._target is None:
+            return
+        position, requested_at = self._target
+        self._target = None
+        now = utcnow()
+        if self._position.playing:
+            # Playback continued while the seek waited for its turn
+            position += (now - requested_at).total_seconds()
+
+        self._sending = True
+        self._last_sent_at = now
+        try:
+            await self._commands.async_send(
+                partial(self._api.set_seekbar, int(position)), key="seek"
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            if not log_errors:
+                raise
+            LOGGER.warning("Unable to seek YTMD at %s: %s", self._api.host, err)
+        else:
+            self.sent += 1
+            self._sent = SentSeek(int(position), now, utcnow(), self._api.projection)
+        finally:
+            self._sending = False
+            if self._target is not None and self._unsub_timer is None:
+                # Fires right away when sending took longer than the interval
+                self._unsub_timer = async_track_point_in_utc_time(
+                    self._hass, self._async_on_timer, now + self._interval
+                )
+
+
+def _comparable(sent: YtmdState | None, reported: YtmdState) -> bool:
+    """Whether the reported position can confirm a seek sent in the sent state."""
+    return (
+        sent is not None
+        and sent.is_paused == reported.is_paused
+        and (sent.title, sent.author, sent.album)
+        == (reported.title, reported.author, reported.album)
+    )
@@ -0,0 +1,301 @@
+"""Sensors for the YouTube Music Desktop Remote Control integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .breaker import BreakerState
+from .const import DOMAIN
+from .coordinator import YtmdCoordinator
+from .entity import YtmdFieldEntity, ytmd_device_info
+from .stats import LatencyHistogram
+
+# The statistics change on every request, only sample them once in a while
+SCAN_INTERVAL = timedelta(minutes=1)
+
+
+def _latency_ms(histogram: LatencyHistogram, percentile: float = 95) -> StateType:
+    latency = histogram.percentile(percentile)
+    return round(latency * 1000) if latency is not None else None
+
+
+def _now_playing(coordinator: YtmdCoordinator) -> StateType:
+    if (projection := coordinator.projection) is None or not projection.has_song:
+        return None
+    return projection.title
+
+
+def _now_playing_attributes(coordinator: YtmdCoordinator) -> dict[str, Any] | None:
+    if (projection := coordinator.projection) is None or not projection.has_song:
+        return None
+    return {"artist": projection.author, "album": projection.album}
+
+
+def _projected_value(coordinator: YtmdCoordinator, value: str) -> StateType:
+    if (projection := coordinator.projection) is None:
+        return None
+    return getattr(projection, value)
+
+
+@dataclass(frozen=True, kw_only=True)
+class YtmdSensorDescription:
+    """Describes a YTMD sensor.
+
+    Not an entity description of Home Assistant, those do not type check
+    against homeassistant-stubs when subclassed.
+    """
+
+    key: str
+    name: str
+    value_fn: Callable[[YtmdCoordinator], StateType]
+    attributes_fn: Callable[[YtmdCoordinator], dict[str, Any] | None] | None = None
+    icon: str | None = None
+    device_class: SensorDeviceClass | None = None
+    native_unit_of_measurement: str | None = None
+    state_class: SensorStateClass | None = None
+    options: list[str] | None = None
+    entity_registry_enabled_default: bool = True
+
+
+STATE_SENSORS: tuple[YtmdSensorDescription, ...] = (
+    YtmdSensorDescription(
+        key="now_playing",
+        name="Now playing",
+        icon="mdi:music",
+        value_fn=_now_playing,
+        attributes_fn=_now_playing_attributes,
+    ),
+    YtmdSensorDescription(
+        key="volume",
+        name="Volume",
+        icon="mdi:volume-high",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: _projected_value(coordinator, "volume_percent"),
+    ),
+    YtmdSensorDescription(
+        key="repeat",
+        name="Repeat",
+        icon="mdi:repeat",
+        device_class=SensorDeviceClass.ENUM,
+        options=["none", "all", "one"],
+        value_fn=lambda coordinator: (
+            repeat_type.lower()
+            if (repeat_type := _projected_value(coordinator, "repeat_type"))
+            else None
+        ),
+    ),
+)
+
+SENSORS: tuple[YtmdSensorDescription, ...] = (
+    YtmdSensorDescription(
+        key="latency",
+        name="Latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        # Polls and realtime pings, one of them runs in any case
+        value_fn=lambda coordinator: _latency_ms(coordinator.stats.round_trip, 50),
+    ),
+    YtmdSensorDescription(
+        key="poll_latency",
+        name="Poll latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: _latency_ms(
+            coordinator.stats.get("update").latency
+        ),
+    ),
+    YtmdSensorDescription(
+        key="poll_timeouts",
+        name="Poll timeouts",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: coordinator.stats.get("update").timeouts,
+    ),
+    YtmdSensorDescription(
+        key="poll_errors",
+        name="Poll errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: coordinator.stats.get("update").failures,
+    ),
+    YtmdSensorDescription(
+        key="command_latency",
+        name="Command latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: _latency_ms(
+            coordinator.stats.get("command").latency
+        ),
+    ),
+    YtmdSensorDescription(
+        key="data_received",
+        name="Data received",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: coordinator.api.stats.bytes_received,
+    ),
+    YtmdSensorDescription(
+        key="suspended_time",
+        name="Time suspended",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: round(coordinator.idle.suspended_time),
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    coordinator: YtmdCoordinator = hass.data[DOMAIN].coordinators[config_entry.entry_id]
+    async_add_entities(
+        [
+            YtmdBreakerSensor(coordinator, config_entry.entry_id),
+            *(
+                YtmdStateSensor(coordinator, config_entry.entry_id, description)
+                for description in STATE_SENSORS
+            ),
+            *(
+                YtmdDiagnosticSensor(coordinator, config_entry.entry_id, description)
+                for description in SENSORS
+            ),
+        ]
+    )
+
+
+class YtmdDescribedSensor(SensorEntity):
+    """Sensor set up from a description."""
+
+    description: YtmdSensorDescription
+
+    def _apply_description(
+        self, configentry_id: str, description: YtmdSensorDescription
+    ) -> None:
+        self.description = description
+        self._attr_unique_id = f"{configentry_id}_{description.key}"
+        self._attr_name = description.name
+        self._attr_icon = description.icon
+        self._attr_device_class = description.device_class
+        self._attr_native_unit_of_measurement = description.native_unit_of_measurement
+        self._attr_state_class = description.state_class
+        self._attr_options = description.options
+        self._attr_entity_registry_enabled_default = (
+            description.entity_registry_enabled_default
+        )
+
+
+class YtmdStateSensor(YtmdFieldEntity, YtmdDescribedSensor):
+    """Sensor showing a field of the YTMD state."""
+
+    def __init__(
+        self,
+        coordinator: YtmdCoordinator,
+        configentry_id: str,
+        description: YtmdSensorDescription,
+    ) -> None:
+        self._apply_description(configentry_id, description)
+        super().__init__(coordinator, configentry_id)
+
+    def _read_value(self) -> tuple[StateType, dict[str, Any] | None]:
+        description = self.description
+        return (
+            description.value_fn(self.coordinator),
+            (
+                description.attributes_fn(self.coordinator)
+                if description.attributes_fn
+                else None
+            ),
+        )
+
+    @property
+    def native_value(self) -> StateType:
+        return self._value[0]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        return self._value[1]
+
+
+class YtmdBreakerSensor(CoordinatorEntity, SensorEntity):
+    """Sensor showing if YTMD is polled normally or only probed."""
+
+    coordinator: YtmdCoordinator
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_has_entity_name = True
+    _attr_name = "Circuit breaker"
+    _attr_options = [state.value for state in BreakerState]
+
+    def __init__(self, coordinator: YtmdCoordinator, configentry_id: str) -> None:
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{configentry_id}_breaker"
+        self._attr_device_info = ytmd_device_info(configentry_id)
+        self._attr_native_value = coordinator.breaker.state
+
+    @property
+    def available(self) -> bool:
+        # Most relevant when YTMD is not available
+        return True
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if self.coordinator.breaker.state != self._attr_native_value:
+            self._attr_native_value = self.coordinator.breaker.state
+            self.async_write_ha_state()
+
+
+class YtmdDiagnosticSensor(YtmdDescribedSensor):
+    """Sensor showing statistics of the requests to YTMD.
+
+    Polled instead of updated by the coordinator, so the statistics
+    do not cause a state write on every request.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: YtmdCoordinator,
+        configentry_id: str,
+        description: YtmdSensorDescription,
+    ) -> None:
+        self.coordinator = coordinator
+        self._apply_description(configentry_id, description)
+        self._attr_device_info = ytmd_device_info(configentry_id)
+
+    @property
+    def native_value(self) -> StateType:
+        return self.description.value_fn(self.coordinator)
@@ -0,0 +1,63 @@
+"""Services for the YouTube Music Desktop Remote Control integration."""
+
+from __future__ import annotations
+
+import voluptuous as vol  # type: ignore[import]
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+
+from .const import DOMAIN, HISTORY_SIZE
+from .coordinator import YtmdCoordinator
+
+SERVICE_GET_HISTORY = "get_history"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_LIMIT = "limit"
+
+GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=HISTORY_SIZE)
+        ),
+    }
+)
+
+
+def _get_coordinator(hass: HomeAssistant, entry_id: str) -> YtmdCoordinator:
+    if (
+        DOMAIN not in hass.data
+        or (coordinator := hass.data[DOMAIN].coordinators.get(entry_id)) is None
+    ):
+        raise HomeAssistantError(f"YTMD config entry {entry_id} is not loaded")
+    return coordinator
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    async def async_get_history(call: ServiceCall) -> ServiceResponse:
+        coordinator = _get_coordinator(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+        if coordinator.history is None:
+            return {"plays": []}
+        return {
+            "plays": [
+                play.as_dict()
+                for play in coordinator.history.recent(call.data.get(ATTR_LIMIT))
+            ]
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        async_get_history,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,133 @@
+"""Request statistics for the YouTube Music Desktop Remote Control integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter, deque
+from collections.abc import Iterator
+import contextlib
+from time import monotonic
+from typing import Any
+
+from .const import STATS_LATENCY_BUCKETS, STATS_SAMPLES
+
+
+class LatencyHistogram:
+    """Histogram over the most recent latency samples."""
+
+    def __init__(self, samples: int = STATS_SAMPLES) -> None:
+        self._samples: deque[float] = deque(maxlen=samples)
+
+    def record(self, latency: float) -> None:
+        self._samples.append(latency)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, percentile: float) -> float | None:
+        """Latency in seconds below which the given percentage of samples fall."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(int(len(ordered) * percentile / 100), len(ordered) - 1)]
+
+    def as_dict(self) -> dict[str, Any]:
+        buckets = dict.fromkeys((f"le_{bound}" for bound in STATS_LATENCY_BUCKETS), 0)
+        buckets["le_inf"] = 0
+        for latency in self._samples:
+            bound = next(
+                (bound for bound in STATS_LATENCY_BUCKETS if latency <= bound), "inf"
+            )
+            buckets[f"le_{bound}"] += 1
+        return {
+            "samples": len(self._samples),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "max": max(self._samples, default=None),
+            "buckets": buckets,
+        }
+
+
+class RequestTypeStats:
+    """Statistics for one type of request, e.g. polls or commands."""
+
+    def __init__(self) -> None:
+        self.latency = LatencyHistogram()
+        self.requests = 0
+        self.timeouts = 0
+        self.errors: Counter[str] = Counter()
+
+    @property
+    def failures(self) -> int:
+        return sum(self.errors.values())
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "timeouts": self.timeouts,
+            "timeout_rate": self.timeouts / self.requests if self.requests else None,
+            "errors": dict(self.errors),
+            "latency": self.latency.as_dict(),
+        }
+
+
+class RequestStats:
+    """Statistics for the requests to a YTMD instance, by type of request.
+
+    Round trips, the polls and the pings of the realtime channel, are also
+    kept together. Either of them runs, so the latency of the connection
+    is known whichever way the state gets updated.
+    """
+
+    def __init__(self) -> None:
+        self.types: dict[str, RequestTypeStats] = {}
+        self.round_trip = LatencyHistogram()
+
+    def get(self, request_type: str) -> RequestTypeStats:
+        if (stats := self.types.get(request_type)) is None:
+            stats = self.types[request_type] = RequestTypeStats()
+        return stats
+
+    def record(self, request_type: str, latency: float, round_trip: bool) -> None:
+        """Record the latency of a request that was timed elsewhere."""
+        self.get(request_type).requests += 1
+        self._record_latency(request_type, latency, round_trip)
+
+    @contextlib.contextmanager
+    def measure(self, request_type: str, round_trip: bool = False) -> Iterator[None]:
+        """Record the latency or error of the request done in the context."""
+        stats = self.get(request_type)
+        stats.requests += 1
+        start = monotonic()
+        try:
+            yield
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:  # pylint: disable=broad-except
+            if isinstance(err, asyncio.TimeoutError):
+                stats.timeouts += 1
+            stats.errors[_root_cause(err)] += 1
+            raise
+        self._record_latency(request_type, monotonic() - start, round_trip)
+
+    def _record_latency(
+        self, request_type: str, latency: float, round_trip: bool
+    ) -> None:
+        self.get(request_type).latency.record(latency)
+        if round_trip:
+            self.round_trip.record(latency)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            request_type: stats.as_dict() for request_type, stats in self.types.items()
+        }
+
+
+def _root_cause(err: BaseException) -> str:
+    # Errors get wrapped, e.g. aiohttp errors in RequestError in UpdateFailed.
+    # Timeouts are caused by cancelling the request, that is not of interest.
+    while (cause := err.__cause__ or err.__context__) is not None and not isinstance(
+        cause, asyncio.CancelledError
+    ):
+        err = cause
+    return type(err).__name__
@@ -1 +1,12 @@
 """Tests for the YouTube Music Desktop Remote Control integration."""
+import asyncio
+from typing import Callable
+
+import async_timeout
+
+
+async def wait_for(condition: Callable[[], bool], timeout: float = 2) -> None:
+    """Wait until the condition is met or fail the test."""
+    async with async_timeout.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.01)
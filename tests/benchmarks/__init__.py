@@ -0,0 +1,11 @@
+"""Benchmarks for the YouTube Music Desktop Remote Control integration.
+
+The benchmarks run against the fake YTMD server. In a normal test run each
+benchmark runs once without timing, to measure run:
+
+    pytest tests/benchmarks --benchmark-enable --benchmark-autosave
+
+Results are stored as JSON in .benchmarks, compare with an earlier run using
+--benchmark-compare. Figures that are not timings, like the number of state
+writes, are in the extra_info of each benchmark.
+"""
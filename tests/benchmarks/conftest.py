@@ -0,0 +1,15 @@
+"""Fixtures for the benchmarks."""
+
+import asyncio
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+import pytest
+
+
+@pytest.fixture
+def run(
+    event_loop: asyncio.AbstractEventLoop,
+) -> Callable[[Coroutine[Any, Any, Any]], Any]:
+    """Run a coroutine from a benchmark, benchmark tests are not async."""
+    return event_loop.run_until_complete
@@ -0,0 +1,101 @@
+"""Benchmark the hub polling many YTMD instances.
+
+Time runs SPEEDUP times faster than normal by shortening the poll interval
+and the timer resolution, so a simulated minute has the same number of
+polls as a real one. CPU time includes the fake server, which runs in the
+same process.
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.ytmdesktop_remote.client import YtmdClient
+from custom_components.ytmdesktop_remote.const import (
+    HUB_MAX_CONCURRENT_POLLS,
+    HUB_TIMER_RESOLUTION,
+    POLL_INTERVAL_PLAYING,
+)
+from custom_components.ytmdesktop_remote.coordinator import YtmdCoordinator
+from custom_components.ytmdesktop_remote.hub import YtmdHub
+
+from ..fake_ytmd import FakeYtmdServer
+
+INSTANCES = 50
+SPEEDUP = 10
+LAG_SAMPLE_INTERVAL = 0.01
+
+
+async def _sample_lag(loop: asyncio.AbstractEventLoop, lags: list[float]) -> None:
+    while True:
+        start = loop.time()
+        await asyncio.sleep(LAG_SAMPLE_INTERVAL)
+        lags.append(loop.time() - start - LAG_SAMPLE_INTERVAL)
+
+
+def test_hub_polls_50_instances(
+    benchmark, run, hass: HomeAssistant, fake_ytmd: FakeYtmdServer
+) -> None:
+    """CPU time and event loop lag for a minute of polling 50 instances."""
+    fake_ytmd.latency = 0.005
+    hub = YtmdHub(hass)
+    lags: list[float] = []
+    cpu_times: list[float] = []
+
+    async def poll_minute() -> None:
+        session = fake_ytmd.client_session()
+        coordinators = [
+            YtmdCoordinator(hass, YtmdClient(session, f"ytmd{i}.test"), session, hub)
+            for i in range(INSTANCES)
+        ]
+        # All instances start at the same time, like after a restart
+        await asyncio.gather(
+            *(coordinator.async_refresh() for coordinator in coordinators)
+        )
+        remove_listeners = [
+            coordinator.async_add_listener(lambda: None) for coordinator in coordinators
+        ]
+
+        sampler = asyncio.create_task(_sample_lag(hass.loop, lags))
+        cpu_start = time.process_time()
+        await asyncio.sleep(60 / SPEEDUP)
+        cpu_times.append(time.process_time() - cpu_start)
+        sampler.cancel()
+
+        # Like unloading, entities go away first
+        for remove_listener in remove_listeners:
+            remove_listener()
+        await hass.async_block_till_done()
+        for coordinator in coordinators:
+            await coordinator.async_shutdown()
+        await session.close()
+
+    with (
+        patch(
+            "custom_components.ytmdesktop_remote.coordinator.POLL_INTERVAL_PLAYING",
+            POLL_INTERVAL_PLAYING / SPEEDUP,
+        ),
+        patch(
+            "custom_components.ytmdesktop_remote.hub.HUB_TIMER_RESOLUTION",
+            HUB_TIMER_RESOLUTION / SPEEDUP,
+        ),
+    ):
+        benchmark.pedantic(lambda: run(poll_minute()), rounds=1)
+
+    polls_per_minute = hub.polls / len(cpu_times)
+    benchmark.extra_info.update(
+        {
+            "instances": INSTANCES,
+            "polls_per_minute": polls_per_minute,
+            "cpu_time_per_minute": sum(cpu_times) / len(cpu_times),
+            "loop_lag_max": max(lags),
+            "loop_lag_avg": sum(lags) / len(lags),
+            "max_requests_in_flight": fake_ytmd.max_in_flight,
+        }
+    )
+
+    # Every instance polled about every 6 to 6.6 seconds
+    assert polls_per_minute >= INSTANCES * 8
+    assert fake_ytmd.max_in_flight <= HUB_MAX_CONCURRENT_POLLS
@@ -0,0 +1,213 @@
+"""Benchmark the integration against the fake YTMD server."""
+
+import asyncio
+from datetime import timedelta
+import time
+import tracemalloc
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.components.media_player import DOMAIN as MP_DOMAIN
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    CONF_HOST,
+    EVENT_STATE_CHANGED,
+    SERVICE_MEDIA_PAUSE,
+    SERVICE_MEDIA_PLAY,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.dt import utcnow
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ytmdesktop_remote.const import DOMAIN, POLL_INTERVAL_PLAYING
+
+from ..fake_ytmd import FAKE_HOST, FakeYtmdServer
+
+ENTITY_ID = "media_player.youtube_music_desktop"
+
+POLLS_PER_HOUR = int(timedelta(hours=1) / POLL_INTERVAL_PLAYING)
+
+# Polls to average the allocated memory over, tracing makes them slow
+ALLOCATION_POLLS = 20
+
+# Latency of YTMD in seconds when measuring the setup time
+SETUP_LATENCY = 0.05
+
+LAST_STATE = {
+    "title": "Title",
+    "author": "Artist",
+    "album": "Album",
+    "cover": "http://cdn.test/cover.jpg",
+    "duration": 200,
+    "volume_percent": 50,
+    "repeat_type": "NONE",
+}
+
+
+@pytest.mark.parametrize("fast_start", [False, True], ids=["cold", "fast_start"])
+def test_setup_entry(
+    benchmark,
+    run,
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    fake_ytmd: FakeYtmdServer,
+    ytmd_patches,
+    fast_start: bool,
+) -> None:
+    """Time to set up a config entry, including the platforms.
+
+    With a last known state the first refresh does not hold up the setup.
+    """
+    fake_ytmd.latency = SETUP_LATENCY
+    entries: list[MockConfigEntry] = []
+
+    async def unload_previous() -> None:
+        if entries:
+            await hass.config_entries.async_unload(entries[-1].entry_id)
+            await hass.async_block_till_done()
+            hass_storage.clear()
+        entry = MockConfigEntry(domain=DOMAIN, data={CONF_HOST: FAKE_HOST})
+        entry.add_to_hass(hass)
+        entries.append(entry)
+        if fast_start:
+            hass_storage[f"{DOMAIN}.{entry.entry_id}"] = {
+                "version": 1,
+                "key": f"{DOMAIN}.{entry.entry_id}",
+                "data": LAST_STATE,
+            }
+
+    async def setup_entry() -> None:
+        assert await hass.config_entries.async_setup(entries[-1].entry_id)
+
+    benchmark.pedantic(
+        lambda: run(setup_entry()),
+        setup=lambda: run(unload_previous()),
+        rounds=20,
+    )
+    # Let the refresh started in the background by the fast start finish
+    run(hass.async_block_till_done())
+    run(hass.config_entries.async_unload(entries[-1].entry_id))
+
+
+def test_poll(benchmark, run, hass: HomeAssistant, integration) -> None:
+    """Time and CPU time of a single poll."""
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    run(coordinator.realtime.async_stop())
+
+    cpu_times: list[float] = []
+
+    def poll() -> None:
+        start = time.process_time()
+        run(coordinator._async_update_data())
+        cpu_times.append(time.process_time() - start)
+
+    benchmark.pedantic(poll, rounds=200, warmup_rounds=5)
+    # Includes the CPU time of the fake server, it runs in the same process
+    benchmark.extra_info["cpu_time_per_poll"] = sum(cpu_times) / len(cpu_times)
+
+    # Memory allocated while handling a poll, also includes the fake server
+    peaks: list[int] = []
+    tracemalloc.start()
+    try:
+        for _ in range(ALLOCATION_POLLS):
+            tracemalloc.reset_peak()
+            start, _ = tracemalloc.get_traced_memory()
+            run(coordinator._async_update_data())
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - start)
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info["peak_bytes_per_poll"] = sum(peaks) / len(peaks)
+
+
+def test_entity_state(benchmark, hass: HomeAssistant, integration) -> None:
+    """Time to build the state and attributes of the media player, on every write."""
+    entity = hass.data[MP_DOMAIN].get_entity(ENTITY_ID)
+
+    def build_state() -> None:
+        assert entity.state is not None
+        assert entity.state_attributes
+
+    benchmark(build_state)
+
+
+def test_state_writes_per_hour(
+    benchmark, run, hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    """Number of media player state changes for an hour of continuous playback."""
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    run(coordinator.realtime.async_stop())
+    duration = fake_ytmd.state["track"]["duration"]
+
+    state_writes = 0
+
+    @callback
+    def count_writes(event) -> None:
+        nonlocal state_writes
+        if event.data["entity_id"] == ENTITY_ID:
+            state_writes += 1
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, count_writes)
+
+    async def play_hour() -> None:
+        start = utcnow()
+        for poll in range(POLLS_PER_HOUR):
+            elapsed = poll * POLL_INTERVAL_PLAYING
+            track, position = divmod(int(elapsed.total_seconds()), duration)
+            fake_ytmd.state["player"]["seekbarCurrentPosition"] = position
+            fake_ytmd.state["track"]["title"] = f"Track {track}"
+            with patch(
+                "custom_components.ytmdesktop_remote.coordinator.utcnow",
+                return_value=start + elapsed,
+            ):
+                await coordinator.async_refresh()
+
+    benchmark.pedantic(lambda: run(play_hour()), rounds=1)
+    run(hass.async_block_till_done())
+
+    tracks = timedelta(hours=1).total_seconds() / duration
+    benchmark.extra_info["polls_per_hour"] = POLLS_PER_HOUR
+    benchmark.extra_info["state_writes_per_hour"] = state_writes
+    # One write per track change, not one per poll
+    assert state_writes <= tracks + 1
+
+
+@pytest.mark.parametrize("realtime", [True, False], ids=["realtime", "polling"])
+def test_command_to_state_latency(
+    benchmark,
+    run,
+    hass: HomeAssistant,
+    fake_ytmd: FakeYtmdServer,
+    integration,
+    realtime: bool,
+) -> None:
+    """Time from a command until the coordinator has the resulting state."""
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    if realtime:
+        run(fake_ytmd.wait_for_realtime_client())
+        fake_ytmd.push_on_command = True
+    else:
+        run(coordinator.realtime.async_stop())
+        coordinator._async_handle_realtime_connection(False)
+
+    async def toggle_and_wait() -> None:
+        paused = not coordinator.api.player.is_paused
+        confirmed = asyncio.Event()
+
+        @callback
+        def check_state() -> None:
+            if coordinator.api.player.is_paused == paused:
+                confirmed.set()
+
+        remove_listener = coordinator.async_add_listener(check_state)
+        await hass.services.async_call(
+            MP_DOMAIN,
+            SERVICE_MEDIA_PAUSE if paused else SERVICE_MEDIA_PLAY,
+            {ATTR_ENTITY_ID: ENTITY_ID},
+            blocking=True,
+        )
+        await confirmed.wait()
+        remove_listener()
+
+    benchmark.pedantic(lambda: run(toggle_and_wait()), rounds=10 if realtime else 3)
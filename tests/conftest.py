@@ -1,21 +1,89 @@
 """Fixtures for testing."""
+
+from datetime import timedelta
 from typing import Callable, NamedTuple, Type
 from unittest.mock import DEFAULT, Mock, create_autospec, patch
 
 import pytest
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry
+from homeassistant.util.dt import utcnow
 
 from pytest_homeassistant_custom_component.common import (
     MockConfigEntry,
+    async_fire_time_changed,
     mock_device_registry,
 )
 
 
 import custom_components.ytmdesktop_remote as ytmdesktop_remote
+from custom_components.ytmdesktop_remote.const import DOMAIN
+
+from .fake_ytmd import FAKE_HOST, FakeYtmdServer
 
 
 @pytest.fixture(autouse=True)
 def auto_enable_custom_integrations(enable_custom_integrations):
     yield
+
+
+@pytest.fixture(autouse=True)
+def mock_network_adapters():
+    """No network adapters to scan, so config flows do not scan the real network."""
+    with patch(
+        "homeassistant.components.network.async_get_adapters", return_value=[]
+    ) as mock_adapters:
+        yield mock_adapters
+
+
+@pytest.fixture
+async def fake_ytmd(socket_enabled):
+    """Fake YTMD server running on a local port."""
+    server = FakeYtmdServer()
+    await server.start()
+    yield server
+    await server.close()
+
+
+@pytest.fixture
+async def ytmd_patches(hass: HomeAssistant, fake_ytmd: FakeYtmdServer, tmp_path):
+    """Make config entries set up against the fake YTMD server."""
+    session = fake_ytmd.client_session()
+
+    with (
+        fake_ytmd.patch_connector(),
+        patch(
+            "custom_components.ytmdesktop_remote.async_get_clientsession",
+            return_value=session,
+        ),
+        patch(
+            "custom_components.ytmdesktop_remote.artwork.async_get_clientsession",
+            return_value=session,
+        ),
+        patch.object(hass.config, "config_dir", str(tmp_path)),
+        patch(
+            "custom_components.ytmdesktop_remote.realtime.REALTIME_RECONNECT_MIN_DELAY",
+            0.1,
+        ),
+    ):
+        yield
+
+    await session.close()
+
+
+@pytest.fixture
+async def integration(hass: HomeAssistant, ytmd_patches):
+    """Integration set up against the fake YTMD server."""
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_HOST: FAKE_HOST})
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    # Flush the debounced refresh requested when the entity gets added
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    yield entry
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,266 @@
+"""Fake YouTube Music Desktop Remote Control server for tests."""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+from functools import partial
+import json
+import socket
+from typing import Any
+from unittest.mock import patch
+
+import aiohttp
+from aiohttp import web
+from aiohttp.abc import AbstractResolver
+from aiohttp.test_utils import TestServer
+
+FAKE_HOST = "ytmd.test"
+
+DEFAULT_STATE: dict[str, Any] = {
+    "player": {
+        "hasSong": True,
+        "isPaused": False,
+        "volumePercent": 50,
+        "seekbarCurrentPosition": 10,
+        "seekbarCurrentPositionHuman": "0:10",
+        "statePercent": 0.05,
+        "likeStatus": "INDIFFERENT",
+        "repeatType": "NONE",
+    },
+    "track": {
+        "author": "Artist",
+        "title": "Title",
+        "album": "Album",
+        "cover": "http://cdn.test/cover.jpg",
+        "duration": 200,
+        "durationHuman": "3:20",
+        "url": "https://music.youtube.com/watch?v=abc",
+        "id": "abc",
+        "isVideo": False,
+        "isAdvertisement": False,
+        "inLibrary": False,
+    },
+    "queue": {
+        "automix": False,
+        "currentIndex": 0,
+        "list": [
+            {
+                "cover": "http://cdn.test/cover.jpg",
+                "title": "Title",
+                "author": "Artist",
+                "duration": "3:20",
+            },
+            {
+                "cover": "http://cdn.test/next.jpg",
+                "title": "Next",
+                "author": "Artist",
+                "duration": "2:10",
+            },
+        ],
+    },
+}
+
+
+class FakeResolver(AbstractResolver):
+    """Resolve every hostname to the fake server."""
+
+    def __init__(self, port: int) -> None:
+        self._port = port
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        return [
+            {
+                "hostname": host,
+                "host": "127.0.0.1",
+                "port": self._port,
+                "family": socket.AF_INET,
+                "proto": 0,
+                "flags": socket.AI_NUMERICHOST,
+            }
+        ]
+
+    async def close(self) -> None:
+        pass
+
+
+class FakeYtmdServer:
+    """Serves the YTMD REST API and realtime channel on a local port."""
+
+    def __init__(self) -> None:
+        self.state = copy.deepcopy(DEFAULT_STATE)
+        self.password: str | None = None
+        self.commands: list[dict[str, Any]] = []
+        self.state_requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.latency = 0.0
+        self.command_latency = 0.0
+        # Number of upcoming state requests on which the connection gets dropped
+        self.disconnects = 0
+        # Number of upcoming commands that are handled, but whose connection
+        # gets dropped before the response
+        self.command_disconnects = 0
+        self.command_status = 200
+        # Hosts the commands were sent to, and hosts that fail them
+        self.command_hosts: list[str] = []
+        self.failing_hosts: set[str] = set()
+        # Set to False to simulate a YTMD ignoring commands
+        self.apply_commands = True
+        # Emit the state on the realtime channel right after a command
+        self.push_on_command = False
+        # Set to False to refuse realtime connections
+        self.realtime_available = True
+        self.cover_requests: list[str] = []
+        self.playlists = ["Liked", "Workout"]
+        self.queue_requests = 0
+        self.playlist_requests = 0
+
+        self._websockets: set[web.WebSocketResponse] = set()
+        self._connected = asyncio.Event()
+
+        app = web.Application()
+        app.router.add_get("/query", self._handle_get_state)
+        app.router.add_post("/query", self._handle_post_command)
+        app.router.add_get("/query/queue", self._handle_get_queue)
+        app.router.add_get("/query/playlist", self._handle_get_playlists)
+        app.router.add_get("/socket.io/", self._handle_socketio)
+        # Also act as the CDN serving the covers
+        app.router.add_get("/{name}.jpg", self._handle_cover)
+        self._server = TestServer(app)
+
+    async def start(self) -> None:
+        await self._server.start_server()
+
+    async def close(self) -> None:
+        await self.drop_realtime()
+        await self._server.close()
+
+    def client_session(self) -> aiohttp.ClientSession:
+        """Create a session that connects to this server for any hostname."""
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(resolver=FakeResolver(self._server.port))
+        )
+
+    def patch_connector(self):
+        """Make sessions created by the integration connect to this server."""
+        return patch(
+            "aiohttp.TCPConnector",
+            partial(aiohttp.TCPConnector, resolver=FakeResolver(self._server.port)),
+        )
+
+    @property
+    def port(self) -> int:
+        return self._server.port
+
+    @property
+    def realtime_clients(self) -> int:
+        return len(self._websockets)
+
+    async def wait_for_realtime_client(self) -> None:
+        await self._connected.wait()
+
+    async def push_state(self) -> None:
+        """Emit the current state on the realtime channel."""
+        message = "42" + json.dumps(["tick", self.state])
+        for ws in list(self._websockets):
+            await ws.send_str(message)
+
+    async def drop_realtime(self) -> None:
+        """Close all realtime connections."""
+        self._connected.clear()
+        for ws in list(self._websockets):
+            await ws.close()
+
+    async def _handle_get_state(self, request: web.Request) -> web.Response:
+        self.state_requests += 1
+        if self.disconnects:
+            self.disconnects -= 1
+            request.transport.close()
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        return web.Response(text=json.dumps(self.state), content_type="text/json")
+
+    async def _handle_get_queue(self, request: web.Request) -> web.Response:
+        self.queue_requests += 1
+        return web.Response(
+            text=json.dumps(self.state["queue"]), content_type="text/json"
+        )
+
+    async def _handle_get_playlists(self, request: web.Request) -> web.Response:
+        self.playlist_requests += 1
+        return web.Response(
+            text=json.dumps({"list": self.playlists}), content_type="text/json"
+        )
+
+    async def _handle_post_command(self, request: web.Request) -> web.Response:
+        if (
+            self.password
+            and request.headers.get("Authorization") != f"Bearer {self.password}"
+        ):
+            return web.Response(status=401, text="Unauthorized")
+        if self.command_latency:
+            await asyncio.sleep(self.command_latency)
+        if self.command_status != 200:
+            return web.Response(status=self.command_status, text="Error")
+        if request.url.host in self.failing_hosts:
+            return web.Response(status=500, text="Error")
+
+        command = await request.json()
+        self.commands.append(command)
+        self.command_hosts.append(request.url.host)
+        if self.apply_commands:
+            self._apply_command(command["command"], command.get("value"))
+        if self.push_on_command:
+            await self.push_state()
+        if self.command_disconnects:
+            self.command_disconnects -= 1
+            request.transport.close()
+        return web.Response(text="{}", content_type="text/json")
+
+    def _apply_command(self, command: str, value: Any) -> None:
+        player = self.state["player"]
+        if command == "track-play":
+            player["isPaused"] = False
+        elif command == "track-pause":
+            player["isPaused"] = True
+        elif command == "player-set-volume":
+            player["volumePercent"] = value
+        elif command == "player-repeat":
+            player["repeatType"] = value
+        elif command == "player-set-seekbar":
+            player["seekbarCurrentPosition"] = value
+        elif command == "player-set-queue":
+            queue = self.state["queue"]
+            queue["currentIndex"] = value
+            self.state["track"]["title"] = queue["list"][value]["title"]
+
+    async def _handle_cover(self, request: web.Request) -> web.Response:
+        name = request.match_info["name"]
+        self.cover_requests.append(name)
+        return web.Response(body=f"jpeg:{name}".encode(), content_type="image/jpeg")
+
+    async def _handle_socketio(self, request: web.Request) -> web.StreamResponse:
+        if not self.realtime_available:
+            return web.Response(status=503, text="Unavailable")
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await ws.send_str(
+            "0"
+            + json.dumps({"sid": "fake", "pingInterval": 25000, "pingTimeout": 5000})
+        )
+        self._websockets.add(ws)
+        try:
+            async for msg in ws:
+                if msg.data == "40":
+                    self._connected.set()
+                elif msg.data == "2":
+                    await ws.send_str("3")
+        finally:
+            self._websockets.discard(ws)
+        return ws
@@ -0,0 +1,128 @@
+"""Test the artwork cache of the YouTube Music Desktop Remote Control integration."""
+
+import os
+
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ytmdesktop_remote.artwork import (
+    ARTWORK_CACHE_DIR,
+    ArtworkCache,
+)
+from custom_components.ytmdesktop_remote.const import DOMAIN
+
+from . import wait_for
+from .fake_ytmd import FAKE_HOST, FakeYtmdServer
+
+ENTITY_ID = "media_player.youtube_music_desktop"
+
+
+async def test_memory_and_disk_tiers(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, tmp_path
+) -> None:
+    async with fake_ytmd.client_session() as session:
+        cache = ArtworkCache(hass, session, str(tmp_path))
+        assert await cache.async_get("http://cdn.test/a.jpg") == (
+            b"jpeg:a",
+            "image/jpeg",
+        )
+        assert await cache.async_get("http://cdn.test/a.jpg") == (
+            b"jpeg:a",
+            "image/jpeg",
+        )
+        assert fake_ytmd.cover_requests == ["a"]
+        assert cache.memory_hits == 1
+
+        # New cache instance (e.g. after restart) reads from disk
+        cache = ArtworkCache(hass, session, str(tmp_path))
+        assert await cache.async_get("http://cdn.test/a.jpg") == (
+            b"jpeg:a",
+            "image/jpeg",
+        )
+        assert fake_ytmd.cover_requests == ["a"]
+        assert cache.disk_hits == 1
+
+
+async def test_eviction(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, tmp_path
+) -> None:
+    async with fake_ytmd.client_session() as session:
+        cache = ArtworkCache(hass, session, str(tmp_path), max_bytes=12, max_files=2)
+        for name in ("a", "b", "c"):
+            await cache.async_get(f"http://cdn.test/{name}.jpg")
+
+        assert len(list(tmp_path.iterdir())) == 2
+
+        # Only the most recent fits in memory, oldest file is gone from disk
+        await cache.async_get("http://cdn.test/c.jpg")
+        assert cache.memory_hits == 1
+        await cache.async_get("http://cdn.test/a.jpg")
+        assert fake_ytmd.cover_requests == ["a", "b", "c", "a"]
+
+
+async def test_concurrent_requests_fetch_once(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, tmp_path
+) -> None:
+    async with fake_ytmd.client_session() as session:
+        cache = ArtworkCache(hass, session, str(tmp_path))
+        cache.async_prefetch("http://cdn.test/a.jpg")
+        assert await cache.async_get("http://cdn.test/a.jpg") == (
+            b"jpeg:a",
+            "image/jpeg",
+        )
+        await hass.async_block_till_done()
+        assert fake_ytmd.cover_requests == ["a"]
+
+
+async def test_fetch_failure_is_not_cached(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, tmp_path
+) -> None:
+    async with fake_ytmd.client_session() as session:
+        cache = ArtworkCache(hass, session, str(tmp_path))
+        assert await cache.async_get("http://cdn.test/missing.png") == (None, None)
+        assert not list(tmp_path.iterdir())
+
+
+async def test_entity_serves_cached_artwork(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    # Current and next cover are prefetched
+    await wait_for(lambda: sorted(fake_ytmd.cover_requests) == ["cover", "next"])
+
+    state = hass.states.get(ENTITY_ID)
+    assert state.attributes["entity_picture"].startswith(
+        f"/api/media_player_proxy/{ENTITY_ID}"
+    )
+
+    entity = hass.data["media_player"].get_entity(ENTITY_ID)
+    assert await entity.async_get_media_image() == (b"jpeg:cover", "image/jpeg")
+    assert sorted(fake_ytmd.cover_requests) == ["cover", "next"]
+
+
+async def test_removing_last_entry_removes_covers(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, ytmd_patches
+) -> None:
+    entries = [
+        MockConfigEntry(domain=DOMAIN, data={CONF_HOST: host})
+        for host in (FAKE_HOST, "ytmd2.test")
+    ]
+    for entry in entries:
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+    await wait_for(lambda: sorted(fake_ytmd.cover_requests) == ["cover", "next"])
+    await hass.async_block_till_done()
+
+    # Not kept with the stored state that goes into backups
+    path = hass.config.path(*ARTWORK_CACHE_DIR)
+    assert ".storage" not in path
+    assert len(os.listdir(path)) == 2
+
+    # Still used by the other entry
+    await hass.config_entries.async_remove(entries[0].entry_id)
+    await hass.async_block_till_done()
+    assert os.path.isdir(path)
+
+    await hass.config_entries.async_remove(entries[1].entry_id)
+    await hass.async_block_till_done()
+    assert not os.path.exists(path)
@@ -0,0 +1,108 @@
+"""Test the circuit breaker of the YouTube Music Desktop Remote Control integration."""
+
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant
+import pytest
+
+from custom_components.ytmdesktop_remote.breaker import BreakerState, CircuitBreaker
+from custom_components.ytmdesktop_remote.const import (
+    BREAKER_PROBE_INTERVAL_MIN,
+    DOMAIN,
+    POLL_INTERVAL_PLAYING,
+    REQUEST_TIMEOUT_DEFAULT,
+    REQUEST_TIMEOUT_MAX,
+    REQUEST_TIMEOUT_MIN,
+)
+
+from . import wait_for
+from .fake_ytmd import FakeYtmdServer
+
+BREAKER_ENTITY_ID = "sensor.youtube_music_desktop_circuit_breaker"
+
+
+def test_breaker_opens_and_backs_off() -> None:
+    breaker = CircuitBreaker(
+        threshold=3,
+        probe_interval_min=timedelta(seconds=30),
+        probe_interval_max=timedelta(seconds=100),
+    )
+    assert breaker.failed() is None
+    assert breaker.failed() is None
+    assert breaker.state is BreakerState.CLOSED
+
+    intervals = [breaker.failed().total_seconds() for _ in range(4)]
+    assert intervals == [30, 60, 100, 100]
+    assert breaker.state is BreakerState.OPEN
+
+    assert breaker.succeeded() is True
+    assert breaker.state is BreakerState.CLOSED
+    assert breaker.succeeded() is False
+
+    # Needs the full number of failures to open again, starting slow probing over
+    assert breaker.failed() is None
+    assert breaker.failed() is None
+    assert breaker.failed() == timedelta(seconds=30)
+    assert breaker.opened == 2
+
+
+async def test_request_timeout_follows_latency(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    latency = coordinator.stats.round_trip
+    assert coordinator.request_timeout == REQUEST_TIMEOUT_DEFAULT
+
+    for _ in range(20):
+        latency.record(0.001)
+    assert coordinator.request_timeout == REQUEST_TIMEOUT_MIN
+
+    for _ in range(20):
+        latency.record(0.2)
+    assert coordinator.request_timeout == pytest.approx(0.6)
+
+    for _ in range(20):
+        latency.record(10)
+    assert coordinator.request_timeout == REQUEST_TIMEOUT_MAX
+
+
+async def test_unreachable_desktop_is_probed(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    await fake_ytmd.wait_for_realtime_client()
+    # Realtime channel keeps reconnecting until the breaker opens
+    fake_ytmd.realtime_available = False
+    await fake_ytmd.drop_realtime()
+    await wait_for(lambda: not coordinator.realtime.connected)
+    assert coordinator.realtime.running
+    assert hass.states.get(BREAKER_ENTITY_ID).state == "closed"
+
+    # Every request gets its connection dropped
+    fake_ytmd.disconnects = 1000
+    for _ in range(3):
+        await coordinator.async_refresh()
+
+    assert coordinator.breaker.state is BreakerState.OPEN
+    assert not coordinator.realtime.running
+    assert coordinator.update_interval == BREAKER_PROBE_INTERVAL_MIN
+    assert hass.states.get(BREAKER_ENTITY_ID).state == "open"
+    assert hass.states.get("media_player.youtube_music_desktop").state == "unavailable"
+
+    await coordinator.async_refresh()
+    assert coordinator.update_interval == BREAKER_PROBE_INTERVAL_MIN * 2
+
+    # A successful probe recovers right away
+    fake_ytmd.disconnects = 0
+    fake_ytmd.realtime_available = True
+    await coordinator.async_refresh()
+
+    assert coordinator.breaker.state is BreakerState.CLOSED
+    assert coordinator.update_interval == POLL_INTERVAL_PLAYING
+    assert hass.states.get(BREAKER_ENTITY_ID).state == "closed"
+    assert hass.states.get("media_player.youtube_music_desktop").state == "playing"
+
+    # And reconnects the realtime channel
+    assert coordinator.realtime.running
+    await fake_ytmd.wait_for_realtime_client()
+    await wait_for(lambda: coordinator.update_interval is None)
@@ -0,0 +1,162 @@
+"""Test the media browser of the YouTube Music Desktop Remote Control integration."""
+
+from homeassistant.components.media_player import BrowseError
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+import pytest
+
+from custom_components.ytmdesktop_remote.browse_media import MediaBrowser
+from custom_components.ytmdesktop_remote.const import DOMAIN
+
+from . import wait_for
+from .fake_ytmd import FakeYtmdServer
+
+ENTITY_ID = "media_player.youtube_music_desktop"
+
+
+def get_entity(hass: HomeAssistant):
+    return hass.data["media_player"].get_entity(ENTITY_ID)
+
+
+async def test_browse_and_play_queue(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    entity = get_entity(hass)
+
+    root = await entity.async_browse_media()
+    assert [child.media_content_id for child in root.children] == [
+        "queue",
+        "playlists",
+    ]
+
+    queue = await entity.async_browse_media("playlist", "queue")
+    assert [child.title for child in queue.children] == [
+        "Title - Artist",
+        "Next - Artist",
+    ]
+    # The queue comes with the state, it does not need to be requested
+    assert fake_ytmd.queue_requests == 0
+
+    # Thumbnails are served from the artwork cache through the image proxy
+    thumbnail = queue.children[1].thumbnail
+    assert thumbnail.startswith(f"/api/media_player_proxy/{ENTITY_ID}/browse_media")
+    media_image_id = thumbnail.split("media_image_id=")[1]
+    assert await entity.async_get_browse_image("track", "queue/1", media_image_id) == (
+        b"jpeg:next",
+        "image/jpeg",
+    )
+    assert await entity.async_get_browse_image("track", "queue/1", "unknown") == (
+        None,
+        None,
+    )
+
+    await entity.async_play_media("track", "queue/1")
+    await wait_for(
+        lambda: hass.states.get(ENTITY_ID).attributes["media_title"] == "Next"
+    )
+    # Thumbnails the frontend still shows resolve after the track changed
+    await entity.async_browse_media()
+    assert await entity.async_get_browse_image("track", "queue/1", media_image_id) == (
+        b"jpeg:next",
+        "image/jpeg",
+    )
+    # The first track has index 0, that value is sent as well
+    await entity.async_play_media("track", "queue/0")
+    assert fake_ytmd.commands[-2:] == [
+        {"command": "player-set-queue", "value": 1},
+        {"command": "player-set-queue", "value": 0},
+    ]
+
+    with pytest.raises(HomeAssistantError):
+        await entity.async_play_media("playlist", "playlists/0")
+
+
+async def test_long_queue_is_paged_and_cached(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    fake_ytmd.state["queue"]["list"] = [
+        {"cover": f"http://cdn.test/{index}.jpg", "title": f"Track {index}"}
+        for index in range(500)
+    ]
+    await coordinator.async_refresh()
+    entity = get_entity(hass)
+
+    queue = await entity.async_browse_media("playlist", "queue")
+    assert len(queue.children) == 5
+    assert queue.children[4].title == "Tracks 401-500"
+    # Tracks are only built for the pages that get expanded
+    assert queue.children[4].children is None
+
+    page = await entity.async_browse_media("playlist", "queue_page/4")
+    assert len(page.children) == 100
+    assert page.children[0].media_content_id == "queue/400"
+    assert page.children[0].title == "Track 400"
+
+    # Expanding again uses the same tree, until the track changes
+    assert await entity.async_browse_media("playlist", "queue_page/4") is page
+    await coordinator.async_refresh()
+    assert await entity.async_browse_media("playlist", "queue_page/4") is page
+
+    fake_ytmd.state["track"]["title"] = "Track 1"
+    fake_ytmd.state["queue"]["currentIndex"] = 1
+    await coordinator.async_refresh()
+    assert await entity.async_browse_media("playlist", "queue_page/4") is not page
+
+    with pytest.raises(BrowseError):
+        await entity.async_browse_media("playlist", "queue_page/5")
+
+
+async def test_least_recently_used_covers_dropped(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    fake_ytmd.state["queue"]["list"] = [
+        {"cover": f"http://cdn.test/{index}.jpg", "title": f"Track {index}"}
+        for index in range(300)
+    ]
+    await coordinator.async_refresh()
+    browser = MediaBrowser(
+        coordinator, lambda *args: args[2], page_size=100, max_covers=150
+    )
+
+    first = (await browser.async_browse("queue_page/0")).children
+    assert browser.cover_url(first[0].thumbnail) == "http://cdn.test/0.jpg"
+    await browser.async_browse("queue_page/1")
+
+    # Looked up recently, unlike the rest of the first page
+    assert browser.cover_url(first[0].thumbnail) == "http://cdn.test/0.jpg"
+    assert browser.cover_url(first[1].thumbnail) is None
+    assert browser.cover_url(first[99].thumbnail) == "http://cdn.test/99.jpg"
+
+
+async def test_browse_playlists(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    entity = get_entity(hass)
+
+    playlists = await entity.async_browse_media("playlist", "playlists")
+    assert [child.title for child in playlists.children] == ["Liked", "Workout"]
+    assert not playlists.children[0].can_play
+
+    await entity.async_browse_media("playlist", "playlists")
+    assert fake_ytmd.playlist_requests == 1
+
+    fake_ytmd.state["track"]["title"] = "Other"
+    await coordinator.async_refresh()
+    await entity.async_browse_media("playlist", "playlists")
+    assert fake_ytmd.playlist_requests == 2
+
+
+async def test_queue_requested_when_not_in_state(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    queue = fake_ytmd.state.pop("queue")
+    await coordinator.async_refresh()
+    fake_ytmd.state["queue"] = queue
+
+    browsed = await get_entity(hass).async_browse_media("playlist", "queue")
+    assert len(browsed.children) == 2
+    assert fake_ytmd.queue_requests == 1
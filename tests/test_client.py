@@ -0,0 +1,125 @@
+"""Test the client of the YouTube Music Desktop Remote Control integration."""
+
+import aioytmdesktopapi
+import pytest
+
+from custom_components.ytmdesktop_remote.client import (
+    ConnectionStats,
+    YtmdClient,
+    create_session,
+)
+
+from .fake_ytmd import DEFAULT_STATE, FAKE_HOST, FakeYtmdServer
+
+
+async def test_connection_is_reused(fake_ytmd: FakeYtmdServer) -> None:
+    stats = ConnectionStats()
+    with fake_ytmd.patch_connector():
+        session = create_session(stats)
+    async with session:
+        client = YtmdClient(session, FAKE_HOST, None, stats)
+        await client.update()
+        await client.update()
+        await client.send_command.track_pause()
+
+    assert stats.connections_created == 1
+    assert stats.connections_reused == 2
+    assert client.player.is_paused is False
+
+
+async def test_retry_on_stale_connection(fake_ytmd: FakeYtmdServer) -> None:
+    stats = ConnectionStats()
+    with fake_ytmd.patch_connector():
+        session = create_session(stats)
+    async with session:
+        client = YtmdClient(session, FAKE_HOST, None, stats)
+        fake_ytmd.disconnects = 1
+        await client.update()
+        assert client.player is not None
+        assert stats.retries == 1
+
+        # Only retried once
+        fake_ytmd.disconnects = 2
+        with pytest.raises(aioytmdesktopapi.RequestError):
+            await client.update()
+        assert stats.retries == 2
+
+
+async def test_no_retry_of_commands(fake_ytmd: FakeYtmdServer) -> None:
+    stats = ConnectionStats()
+    with fake_ytmd.patch_connector():
+        session = create_session(stats)
+    async with session:
+        client = YtmdClient(session, FAKE_HOST, None, stats)
+        fake_ytmd.command_disconnects = 1
+        with pytest.raises(aioytmdesktopapi.RequestError):
+            await client.send_command.track_next()
+    assert fake_ytmd.commands == [{"command": "track-next"}]
+    assert stats.retries == 0
+
+
+async def test_no_retry_when_unreachable(socket_enabled) -> None:
+    stats = ConnectionStats()
+    session = create_session(stats)
+    async with session:
+        client = YtmdClient(session, "127.0.0.1", None, stats)
+        with pytest.raises(aioytmdesktopapi.RequestError):
+            await client.update()
+    assert stats.retries == 0
+
+
+async def test_state_is_projected(fake_ytmd: FakeYtmdServer) -> None:
+    stats = ConnectionStats()
+    with fake_ytmd.patch_connector():
+        session = create_session(stats)
+    async with session:
+        client = YtmdClient(session, FAKE_HOST, None, stats)
+        await client.update()
+        first = client.projection
+        assert first.title == "Title"
+        assert first.volume_percent == 50
+        assert first.playing
+
+        # Only the seekbar moved, the projections compare equal
+        fake_ytmd.state["player"]["seekbarCurrentPosition"] = 20
+        await client.update()
+        assert client.projection.seekbar_position == 20
+        assert client.projection == first
+
+        fake_ytmd.state["player"]["volumePercent"] = 20
+        await client.update()
+        assert client.projection != first
+
+
+async def test_request_errors(fake_ytmd: FakeYtmdServer) -> None:
+    with fake_ytmd.patch_connector():
+        session = create_session(ConnectionStats())
+    async with session:
+        fake_ytmd.password = "secret"
+        client = YtmdClient(session, FAKE_HOST, "wrong")
+        with pytest.raises(aioytmdesktopapi.Unauthorized):
+            await client.send_command.track_pause()
+
+        fake_ytmd.command_status = 500
+        client = YtmdClient(session, FAKE_HOST, "secret")
+        with pytest.raises(aioytmdesktopapi.RequestError):
+            await client.send_command.track_pause()
+
+
+def test_player_and_track_built_on_demand() -> None:
+    """Test applying a state only builds the aioytmdesktopapi objects when used."""
+    client = YtmdClient(None, FAKE_HOST)
+    client.apply_state(DEFAULT_STATE)
+    assert client._player is None
+    assert client.projection.volume_percent == 50
+
+    assert client.player.volume_percent == 50
+    assert client.track.title == "Title"
+    assert client.player is client.player
+
+    # A new state replaces them
+    client.apply_state(
+        {**DEFAULT_STATE, "track": {**DEFAULT_STATE["track"], "title": "Next"}}
+    )
+    assert client._track is None
+    assert client.track.title == "Next"
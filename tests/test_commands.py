@@ -0,0 +1,169 @@
+"""Test the command dispatcher of the YouTube Music Desktop Remote Control integration."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+import pytest
+
+from custom_components.ytmdesktop_remote.commands import CommandDispatcher
+from custom_components.ytmdesktop_remote.stats import RequestStats
+
+from . import wait_for
+
+
+class Recorder:
+    """Records commands and lets them block until released."""
+
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.release = asyncio.Event()
+
+    def command(self, name: str):
+        async def _send() -> None:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await self.release.wait()
+            self.sent.append(name)
+            self.in_flight -= 1
+
+        return _send
+
+
+async def test_commands_sent_in_order_one_at_a_time(hass: HomeAssistant) -> None:
+    on_idle = AsyncMock()
+    dispatcher = CommandDispatcher(hass, on_idle)
+    recorder = Recorder()
+
+    tasks = [
+        hass.async_create_task(dispatcher.async_send(recorder.command(name)))
+        for name in ("volume_up", "next", "pause")
+    ]
+    await asyncio.sleep(0)
+    assert dispatcher.depth == 2
+
+    recorder.release.set()
+    await asyncio.gather(*tasks)
+    await hass.async_block_till_done()
+
+    assert recorder.sent == ["volume_up", "next", "pause"]
+    assert recorder.max_in_flight == 1
+    on_idle.assert_awaited_once()
+
+    metrics = dispatcher.metrics()
+    assert metrics["sent"] == 3
+    assert metrics["max_depth"] == 2
+    assert metrics["wait_time_max"] >= 0
+
+
+async def test_latency_without_queue_wait(hass: HomeAssistant) -> None:
+    """Test the command latency does not include the wait for a turn."""
+    stats = RequestStats()
+    dispatcher = CommandDispatcher(hass, AsyncMock(), stats=stats)
+    recorder = Recorder()
+    clock = [0.0]
+
+    with patch("custom_components.ytmdesktop_remote.stats.monotonic", lambda: clock[0]):
+        tasks = [
+            hass.async_create_task(dispatcher.async_send(recorder.command(name)))
+            for name in ("next", "pause")
+        ]
+        await wait_for(lambda: recorder.in_flight == 1)
+        clock[0] = 1.0
+        recorder.release.set()
+        await asyncio.gather(*tasks)
+
+    command = stats.get("command")
+    assert command.requests == 2
+    assert sorted(command.latency._samples) == [0.0, 1.0]
+
+
+async def test_latest_value_wins(hass: HomeAssistant) -> None:
+    on_idle = AsyncMock()
+    dispatcher = CommandDispatcher(hass, on_idle)
+    recorder = Recorder()
+
+    tasks = [
+        hass.async_create_task(
+            dispatcher.async_send(recorder.command(f"volume {volume}"), "volume")
+        )
+        for volume in range(10)
+    ]
+    tasks.append(
+        hass.async_create_task(dispatcher.async_send(recorder.command("next")))
+    )
+    await asyncio.sleep(0)
+
+    recorder.release.set()
+    await asyncio.gather(*tasks)
+    await hass.async_block_till_done()
+
+    assert recorder.sent == ["volume 0", "volume 9", "next"]
+    assert dispatcher.replaced == 8
+    on_idle.assert_awaited_once()
+
+
+async def test_concurrency_limit(hass: HomeAssistant) -> None:
+    dispatcher = CommandDispatcher(hass, AsyncMock(), max_concurrent=2)
+    recorder = Recorder()
+
+    tasks = [
+        hass.async_create_task(dispatcher.async_send(recorder.command(str(index))))
+        for index in range(5)
+    ]
+    await asyncio.sleep(0.01)
+    recorder.release.set()
+    await asyncio.gather(*tasks)
+
+    assert recorder.max_in_flight == 2
+    assert sorted(recorder.sent) == ["0", "1", "2", "3", "4"]
+
+
+async def test_queue_full(hass: HomeAssistant) -> None:
+    dispatcher = CommandDispatcher(hass, AsyncMock(), max_queued=1)
+    recorder = Recorder()
+
+    first = hass.async_create_task(dispatcher.async_send(recorder.command("1")))
+    second = hass.async_create_task(dispatcher.async_send(recorder.command("2")))
+    await asyncio.sleep(0)
+
+    with pytest.raises(HomeAssistantError):
+        await dispatcher.async_send(recorder.command("3"))
+    assert dispatcher.rejected == 1
+
+    recorder.release.set()
+    await asyncio.gather(first, second)
+
+
+async def test_failing_command(hass: HomeAssistant) -> None:
+    on_idle = AsyncMock()
+    dispatcher = CommandDispatcher(hass, on_idle)
+
+    with pytest.raises(ValueError):
+        await dispatcher.async_send(AsyncMock(side_effect=ValueError))
+    await hass.async_block_till_done()
+
+    on_idle.assert_awaited_once()
+    assert dispatcher.sent == 0
+
+
+async def test_commands_without_refresh(hass: HomeAssistant) -> None:
+    on_idle = AsyncMock()
+    dispatcher = CommandDispatcher(hass, on_idle)
+    recorder = Recorder()
+    recorder.release.set()
+
+    for volume in (40, 30, 20):
+        await dispatcher.async_send(
+            recorder.command(f"volume {volume}"), "volume", refresh=False
+        )
+    await hass.async_block_till_done()
+    on_idle.assert_not_awaited()
+
+    # The final step refreshes once
+    await dispatcher.async_send(recorder.command("volume 10"), "volume")
+    await hass.async_block_till_done()
+    on_idle.assert_awaited_once()
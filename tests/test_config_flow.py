@@ -1,13 +1,21 @@
 """Test the YouTube Music Desktop Remote Control config flow."""
 from unittest.mock import patch
 
+import pytest
+
 from homeassistant import config_entries
-from custom_components.ytmdesktop_remote.const import DOMAIN
+from custom_components.ytmdesktop_remote.client import YtmdClient
+from custom_components.ytmdesktop_remote.const import CONF_DORMANT, DOMAIN
+from custom_components.ytmdesktop_remote.idle import IdleReason
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
 
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
 import aioytmdesktopapi
 
+from .fake_ytmd import FAKE_HOST, FakeYtmdServer
+
 
 async def test_form(hass: HomeAssistant) -> None:
     """Test we get the form."""
@@ -17,9 +25,9 @@ async def test_form(hass: HomeAssistant) -> None:
     assert result["type"] == FlowResultType.FORM
     assert result["errors"] is None
 
-    with patch("aioytmdesktopapi.YtmDesktop.initialize", return_value=True,), patch(
-        "aioytmdesktopapi.send_command.SendCommand.track_pause",
-        return_value=True,
+    with patch(
+        "custom_components.ytmdesktop_remote.client.YtmdClient.probe",
+        return_value=None,
     ), patch(
         "custom_components.ytmdesktop_remote.async_setup_entry",
         return_value=True,
@@ -49,7 +57,7 @@ async def test_form_invalid_auth(hass: HomeAssistant) -> None:
     )
 
     with patch(
-        "aioytmdesktopapi.YtmDesktop.initialize",
+        "custom_components.ytmdesktop_remote.client.YtmdClient.probe",
         side_effect=aioytmdesktopapi.errors.Unauthorized,
     ):
         result2 = await hass.config_entries.flow.async_configure(
@@ -71,7 +79,7 @@ async def test_form_cannot_connect(hass: HomeAssistant) -> None:
     )
 
     with patch(
-        "aioytmdesktopapi.YtmDesktop.initialize",
+        "custom_components.ytmdesktop_remote.client.YtmdClient.probe",
         side_effect=aioytmdesktopapi.errors.RequestError,
     ):
         result2 = await hass.config_entries.flow.async_configure(
@@ -84,3 +92,120 @@ async def test_form_cannot_connect(hass: HomeAssistant) -> None:
 
     assert result2["type"] == FlowResultType.FORM
     assert result2["errors"] == {"base": "cannot_connect"}
+
+
+@pytest.fixture
+async def probe_session(fake_ytmd: FakeYtmdServer):
+    """Make the config flow probe the fake YTMD server."""
+    session = fake_ytmd.client_session()
+    with patch(
+        "custom_components.ytmdesktop_remote.probe.async_get_clientsession",
+        return_value=session,
+    ):
+        yield
+    await session.close()
+
+
+async def configure(hass: HomeAssistant, data: dict) -> dict:
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    with patch(
+        "custom_components.ytmdesktop_remote.async_setup_entry",
+        return_value=True,
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], data
+        )
+        await hass.async_block_till_done()
+    return result
+
+
+async def test_probe_does_not_touch_playback(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, probe_session
+) -> None:
+    """Test validating sends a single request that leaves playback alone."""
+    fake_ytmd.password = "test-password"
+    state = fake_ytmd.state["player"].copy()
+
+    result = await configure(hass, {"host": FAKE_HOST, "password": "test-password"})
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert fake_ytmd.commands == [{"command": "show-lyrics-hidden"}]
+    assert fake_ytmd.state_requests == 0
+    assert fake_ytmd.state["player"] == state
+
+
+async def test_probe_result_is_reused(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, probe_session
+) -> None:
+    """Test submitting the same input again does not probe again."""
+    fake_ytmd.password = "test-password"
+
+    with patch(
+        "custom_components.ytmdesktop_remote.client.YtmdClient.probe",
+        autospec=True,
+        side_effect=YtmdClient.probe,
+    ) as mock_probe:
+        for password in ("wrong", "wrong", "test-password", "test-password"):
+            result = await configure(hass, {"host": FAKE_HOST, "password": password})
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert len(mock_probe.mock_calls) == 2
+
+
+async def test_probe_retries_unreachable_desktop(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, probe_session
+) -> None:
+    """Test an unreachable desktop is probed again, it may have been started."""
+    with patch(
+        "custom_components.ytmdesktop_remote.client.YtmdClient.probe",
+        side_effect=aioytmdesktopapi.errors.RequestError,
+    ):
+        result = await configure(hass, {"host": FAKE_HOST})
+    assert result["errors"] == {"base": "cannot_connect"}
+
+    result = await configure(hass, {"host": FAKE_HOST})
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert len(fake_ytmd.commands) == 1
+
+
+async def test_reauth_probes_again(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, probe_session
+) -> None:
+    """Test reauth does not trust an earlier successful probe."""
+    await configure(hass, {"host": FAKE_HOST, "password": "test-password"})
+    fake_ytmd.password = "new-password"
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={"host": FAKE_HOST, "password": "test-password"}
+    )
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN,
+        context={"source": config_entries.SOURCE_REAUTH, "entry_id": entry.entry_id},
+        data=entry.data,
+    )
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], {})
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"base": "invalid_auth"}
+
+
+async def test_options_flow(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    result = await hass.config_entries.options.async_init(integration.entry_id)
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_DORMANT: True}
+    )
+    await hass.async_block_till_done()
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert integration.options == {CONF_DORMANT: True}
+
+    # Reloaded to apply it
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    assert coordinator.idle.reason is IdleReason.DORMANT
@@ -0,0 +1,93 @@
+"""Test the coordinator of the YouTube Music Desktop Remote Control integration."""
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.ytmdesktop_remote.const import (
+    DOMAIN,
+    POLL_INTERVAL_MAX,
+    POLL_INTERVAL_MIN,
+    POLL_INTERVAL_PLAYING,
+)
+from custom_components.ytmdesktop_remote.coordinator import PollScheduler
+from custom_components.ytmdesktop_remote.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.ytmdesktop_remote.projection import YtmdState
+
+from .fake_ytmd import FakeYtmdServer
+
+
+def mock_state(has_song=True, is_paused=False, position=10, duration=200):
+    return YtmdState(
+        has_song, is_paused, 50, position, "NONE", "Title", "", "", "", duration
+    )
+
+
+def test_poll_interval_playing() -> None:
+    scheduler = PollScheduler()
+    assert scheduler.updated(mock_state()) == POLL_INTERVAL_PLAYING
+
+
+def test_poll_interval_near_track_end() -> None:
+    scheduler = PollScheduler()
+    assert scheduler.updated(mock_state(position=197)) == timedelta(seconds=3.5)
+    assert scheduler.updated(mock_state(position=200)) == POLL_INTERVAL_MIN
+
+
+def test_poll_interval_backs_off_while_paused() -> None:
+    scheduler = PollScheduler()
+    paused = mock_state(is_paused=True)
+    intervals = [scheduler.updated(paused).total_seconds() for _ in range(6)]
+    assert intervals == [6, 12, 24, 48, 60, 60]
+    assert scheduler.updated(mock_state(has_song=False)) == POLL_INTERVAL_MAX
+
+    # Playing again polls at the normal rate immediately
+    assert scheduler.updated(mock_state()) == POLL_INTERVAL_PLAYING
+    assert scheduler.updated(paused) == POLL_INTERVAL_PLAYING
+
+
+def test_poll_interval_backs_off_on_failure() -> None:
+    scheduler = PollScheduler()
+    assert scheduler.failed() == POLL_INTERVAL_PLAYING
+    assert scheduler.failed() == POLL_INTERVAL_PLAYING * 2
+    assert scheduler.updated(mock_state()) == POLL_INTERVAL_PLAYING
+
+
+async def test_diagnostics_report_interval(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    await coordinator.realtime.async_stop()
+    coordinator._async_handle_realtime_connection(False)
+    fake_ytmd.state["player"]["isPaused"] = True
+    await coordinator.async_refresh()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, integration)
+
+    assert diagnostics["coordinator"]["realtime_connected"] is False
+    assert diagnostics["coordinator"]["update_interval"] == 6
+    assert diagnostics["coordinator"]["last_update_success"] is True
+
+
+async def test_unchanged_state_does_not_notify(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    sent = coordinator.notifications_sent
+    skipped = coordinator.notifications_skipped
+
+    fake_ytmd.state["player"]["seekbarCurrentPosition"] += 1
+    await coordinator.async_refresh()
+    assert coordinator.notifications_sent == sent
+    assert coordinator.notifications_skipped == skipped + 1
+
+    fake_ytmd.state["player"]["volumePercent"] = 20
+    await coordinator.async_refresh()
+    assert coordinator.notifications_sent == sent + 1
+    assert (
+        hass.states.get("media_player.youtube_music_desktop").attributes[
+            "volume_level"
+        ]
+        == 0.2
+    )
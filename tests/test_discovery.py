@@ -0,0 +1,190 @@
+"""Test the discovery of the YouTube Music Desktop Remote Control integration."""
+
+import asyncio
+import time
+from unittest.mock import Mock, patch
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from homeassistant import config_entries
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+import pytest
+import pytest_socket
+
+from custom_components.ytmdesktop_remote.const import DOMAIN
+from custom_components.ytmdesktop_remote.discovery import (
+    DATA_DISCOVERY,
+    YtmdScanner,
+    _scan_networks,
+)
+
+from .fake_ytmd import FakeYtmdServer
+
+LOOPBACK_ADAPTER = {
+    "name": "lo",
+    "index": 1,
+    "enabled": True,
+    "auto": True,
+    "default": True,
+    "ipv6": [],
+    "ipv4": [{"address": "127.0.0.1", "network_prefix": 8}],
+}
+
+
+def adapter(address: str, prefix: int, enabled: bool = True) -> dict:
+    return {
+        **LOOPBACK_ADAPTER,
+        "enabled": enabled,
+        "ipv4": [{"address": address, "network_prefix": prefix}],
+    }
+
+
+def test_scan_networks() -> None:
+    networks = _scan_networks(
+        [
+            adapter("192.168.1.20", 24),
+            # Larger networks are limited to the /24 around the address
+            adapter("10.1.2.3", 16),
+            adapter("192.168.2.20", 28),
+            adapter("192.168.1.30", 24),
+            adapter("172.16.0.1", 24, enabled=False),
+        ]
+    )
+    assert [str(network) for network in networks] == [
+        "192.168.1.0/24",
+        "10.1.2.0/24",
+        "192.168.2.16/28",
+    ]
+
+
+@pytest.fixture
+def loopback_network(socket_enabled):
+    """Allow connecting to the whole loopback /24, not just 127.0.0.1."""
+    pytest_socket.socket_allow_hosts([f"127.0.0.{host}" for host in range(256)])
+    yield
+    pytest_socket.socket_allow_hosts(["127.0.0.1"])
+
+
+@pytest.fixture
+async def scanner(
+    hass: HomeAssistant,
+    loopback_network,
+    fake_ytmd: FakeYtmdServer,
+    mock_network_adapters: Mock,
+):
+    """Scanner looking for the fake YTMD server on the loopback network.
+
+    Another web server that is not YTMD listens on 127.0.0.2.
+    """
+    mock_network_adapters.return_value = [LOOPBACK_ADAPTER]
+
+    app = web.Application()
+
+    async def handle_query(request: web.Request) -> web.Response:
+        return web.Response(text="<html>")
+
+    app.router.add_get("/query", handle_query)
+    other_server = TestServer(app, host="127.0.0.2", port=fake_ytmd.port)
+    await other_server.start_server()
+
+    session = fake_ytmd.client_session()
+    hass.data[DATA_DISCOVERY] = scanner = YtmdScanner(hass, session, fake_ytmd.port)
+    yield scanner
+    await session.close()
+    await other_server.close()
+
+
+async def test_scan(
+    hass: HomeAssistant, mock_network_adapters: Mock, scanner: YtmdScanner
+) -> None:
+    start = time.monotonic()
+    assert await scanner.async_scan() == ["127.0.0.1"]
+    assert time.monotonic() - start < 5
+
+    # Found hosts are reused
+    mock_network_adapters.reset_mock()
+    assert await scanner.async_scan() == ["127.0.0.1"]
+    mock_network_adapters.assert_not_called()
+
+
+async def test_flow_picks_discovered_host(
+    hass: HomeAssistant, scanner: YtmdScanner
+) -> None:
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "user"
+
+    # Without a host the network gets searched
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], {})
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "pick_device"
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"host": "127.0.0.1"}
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "user"
+    schema_keys = {key.schema: key for key in result["data_schema"].schema}
+    assert schema_keys["host"].description == {"suggested_value": "127.0.0.1"}
+
+    with (
+        patch(
+            "custom_components.ytmdesktop_remote.client.YtmdClient.probe",
+            return_value=None,
+        ),
+        patch(
+            "custom_components.ytmdesktop_remote.async_setup_entry",
+            return_value=True,
+        ),
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {"host": "127.0.0.1"}
+        )
+        await hass.async_block_till_done()
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"] == {"host": "127.0.0.1"}
+
+
+async def test_flow_skips_configured_hosts(
+    hass: HomeAssistant, scanner: YtmdScanner
+) -> None:
+    MockConfigEntry(domain=DOMAIN, data={"host": "127.0.0.1"}).add_to_hass(hass)
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], {})
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "user"
+    assert result["errors"] == {"base": "no_devices_found"}
+
+
+async def test_flow_does_not_wait_for_scan(
+    hass: HomeAssistant, scanner: YtmdScanner
+) -> None:
+    """Test the host can be entered while the scan runs, a recent scan is offered."""
+    scan_done = asyncio.Event()
+    scan = scanner._async_scan
+
+    async def slow_scan() -> list[str]:
+        await scan_done.wait()
+        return await scan()
+
+    with patch.object(scanner, "_async_scan", slow_scan):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": config_entries.SOURCE_USER}
+        )
+        assert result["type"] == FlowResultType.FORM
+        assert result["step_id"] == "user"
+        scan_done.set()
+        assert await scanner.async_scan() == ["127.0.0.1"]
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "pick_device"
@@ -0,0 +1,97 @@
+"""Test volume fades of the YouTube Music Desktop Remote Control integration."""
+
+from datetime import timedelta
+
+from homeassistant.components.media_player import DOMAIN as MP_DOMAIN
+from homeassistant.const import ATTR_ENTITY_ID, SERVICE_MEDIA_PAUSE
+from homeassistant.core import HomeAssistant
+from homeassistant.util.dt import utcnow
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.ytmdesktop_remote.const import DOMAIN
+
+from . import wait_for
+from .fake_ytmd import FakeYtmdServer
+from .test_media_player import ENTITY_ID, flush_refresh
+
+
+async def fade_volume(hass: HomeAssistant, volume: float, duration: float) -> None:
+    await hass.services.async_call(
+        DOMAIN,
+        "fade_volume",
+        {ATTR_ENTITY_ID: ENTITY_ID, "volume_level": volume, "duration": duration},
+        blocking=True,
+    )
+
+
+def fire_step(hass: HomeAssistant, seconds: float) -> None:
+    """Fire the timer of the step that many seconds after the fade started."""
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=seconds))
+
+
+def volumes(fake_ytmd: FakeYtmdServer) -> list[int]:
+    return [
+        command["value"]
+        for command in fake_ytmd.commands
+        if command["command"] == "player-set-volume"
+    ]
+
+
+async def test_fade_refreshes_once(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    await fake_ytmd.drop_realtime()
+    state_requests = fake_ytmd.state_requests
+
+    await fade_volume(hass, 0, 1)
+    assert coordinator.fader.fading
+    fire_step(hass, 0.5)
+    await wait_for(lambda: coordinator.fader.steps == 1)
+    fire_step(hass, 1)
+    await wait_for(lambda: not coordinator.fader.fading)
+
+    # A step every half second, ending at exactly the target
+    assert volumes(fake_ytmd) == [25, 0]
+    assert hass.states.get(ENTITY_ID).attributes["volume_level"] == 0
+    assert fake_ytmd.state_requests == state_requests
+
+    await flush_refresh(hass)
+    assert fake_ytmd.state_requests == state_requests + 1
+    assert hass.states.get(ENTITY_ID).attributes["volume_level"] == 0
+    assert coordinator.fader.metrics()["completed"] == 1
+
+
+async def test_fade_cancelled_by_command(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+
+    await fade_volume(hass, 1, 10)
+    fire_step(hass, 0.5)
+    await wait_for(lambda: coordinator.fader.steps)
+    assert hass.states.get(ENTITY_ID).attributes["volume_level"] == 0.52
+
+    await hass.services.async_call(
+        MP_DOMAIN, SERVICE_MEDIA_PAUSE, {ATTR_ENTITY_ID: ENTITY_ID}, blocking=True
+    )
+    assert not coordinator.fader.fading
+    fire_step(hass, 1)
+    await hass.async_block_till_done()
+    assert volumes(fake_ytmd) == [52]
+    assert coordinator.fader.metrics()["cancelled"] == 1
+
+
+async def test_new_fade_replaces_running_fade(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+
+    await fade_volume(hass, 1, 10)
+    await fade_volume(hass, 0.5, 0)
+    await wait_for(lambda: not coordinator.fader.fading)
+
+    # Already at the target of the second fade, nothing to send
+    assert volumes(fake_ytmd) == []
+    assert coordinator.fader.metrics()["started"] == 2
+    assert coordinator.fader.metrics()["cancelled"] == 1
@@ -0,0 +1,194 @@
+"""Test grouped control of the YouTube Music Desktop Remote Control integration."""
+
+from homeassistant.components.media_player import (
+    ATTR_GROUP_MEMBERS,
+    ATTR_MEDIA_VOLUME_LEVEL,
+    DOMAIN as MP_DOMAIN,
+    SERVICE_JOIN,
+    SERVICE_UNJOIN,
+    SERVICE_VOLUME_SET,
+)
+from homeassistant.const import ATTR_ENTITY_ID, CONF_HOST, SERVICE_MEDIA_PAUSE
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ytmdesktop_remote.const import DOMAIN
+from custom_components.ytmdesktop_remote.group import YtmdGroups
+
+from . import wait_for
+from .fake_ytmd import FAKE_HOST, FakeYtmdServer
+from .test_fade import fade_volume, fire_step
+from .test_media_player import ENTITY_ID, flush_refresh
+
+MEMBER_HOST = "ytmd2.test"
+MEMBER_ENTITY_ID = "media_player.youtube_music_desktop_2"
+
+
+@pytest.fixture
+async def member(hass: HomeAssistant, integration):
+    """Second YTMD instance, set up against the same fake server."""
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_HOST: MEMBER_HOST})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await flush_refresh(hass)
+    yield entry
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def join(hass: HomeAssistant) -> None:
+    await hass.services.async_call(
+        MP_DOMAIN,
+        SERVICE_JOIN,
+        {ATTR_ENTITY_ID: ENTITY_ID, ATTR_GROUP_MEMBERS: [MEMBER_ENTITY_ID]},
+        blocking=True,
+    )
+
+
+async def pause(hass: HomeAssistant, entity_id: str = ENTITY_ID) -> None:
+    await hass.services.async_call(
+        MP_DOMAIN, SERVICE_MEDIA_PAUSE, {ATTR_ENTITY_ID: entity_id}, blocking=True
+    )
+
+
+def group_members(hass: HomeAssistant, entity_id: str) -> list[str]:
+    return hass.states.get(entity_id).attributes[ATTR_GROUP_MEMBERS]
+
+
+async def test_commands_sent_to_members(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, member
+) -> None:
+    await join(hass)
+    assert group_members(hass, ENTITY_ID) == [ENTITY_ID, MEMBER_ENTITY_ID]
+    assert group_members(hass, MEMBER_ENTITY_ID) == [ENTITY_ID, MEMBER_ENTITY_ID]
+
+    await fake_ytmd.drop_realtime()
+    state_requests = fake_ytmd.state_requests
+    await pause(hass)
+    await hass.services.async_call(
+        MP_DOMAIN,
+        SERVICE_VOLUME_SET,
+        {ATTR_ENTITY_ID: ENTITY_ID, ATTR_MEDIA_VOLUME_LEVEL: 0.2},
+        blocking=True,
+    )
+    assert sorted(fake_ytmd.command_hosts) == [
+        FAKE_HOST,
+        FAKE_HOST,
+        MEMBER_HOST,
+        MEMBER_HOST,
+    ]
+
+    # One refresh per member for both commands
+    await flush_refresh(hass)
+    assert fake_ytmd.state_requests - state_requests == 2
+    assert hass.states.get(MEMBER_ENTITY_ID).state == "paused"
+    assert hass.states.get(MEMBER_ENTITY_ID).attributes["volume_level"] == 0.2
+
+    # Commands on a member are not sent to the group
+    fake_ytmd.command_hosts.clear()
+    await pause(hass, MEMBER_ENTITY_ID)
+    assert fake_ytmd.command_hosts == [MEMBER_HOST]
+
+
+async def test_fade_on_members(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, member
+) -> None:
+    faders = [
+        coordinator.fader for coordinator in hass.data[DOMAIN].coordinators.values()
+    ]
+    await join(hass)
+
+    await fade_volume(hass, 0, 1)
+    fire_step(hass, 0.5)
+    await wait_for(lambda: all(fader.steps == 1 for fader in faders))
+    fire_step(hass, 1)
+    await wait_for(lambda: not any(fader.fading for fader in faders))
+    assert sorted(fake_ytmd.command_hosts) == [
+        FAKE_HOST,
+        FAKE_HOST,
+        MEMBER_HOST,
+        MEMBER_HOST,
+    ]
+    await flush_refresh(hass)
+    assert hass.states.get(MEMBER_ENTITY_ID).attributes["volume_level"] == 0
+
+    # Commands to the group stop the fade on the members as well
+    await fade_volume(hass, 1, 10)
+    await pause(hass)
+    assert not any(fader.fading for fader in faders)
+
+
+async def test_failure_reported_per_member(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, member
+) -> None:
+    await join(hass)
+    fake_ytmd.failing_hosts.add(MEMBER_HOST)
+
+    with pytest.raises(HomeAssistantError, match=MEMBER_HOST) as err:
+        await pause(hass)
+    assert list(err.value.failures) == [MEMBER_HOST]
+    # The other members did get the command, the leader keeps showing it
+    assert fake_ytmd.command_hosts == [FAKE_HOST]
+    assert hass.states.get(ENTITY_ID).state == "paused"
+
+    # Unless it failed on the leader
+    fake_ytmd.failing_hosts = {FAKE_HOST}
+    with pytest.raises(HomeAssistantError, match=FAKE_HOST):
+        await hass.services.async_call(
+            MP_DOMAIN,
+            SERVICE_VOLUME_SET,
+            {ATTR_ENTITY_ID: ENTITY_ID, ATTR_MEDIA_VOLUME_LEVEL: 0.2},
+            blocking=True,
+        )
+    assert hass.states.get(ENTITY_ID).attributes["volume_level"] == 0.5
+
+
+async def test_unjoin(hass: HomeAssistant, fake_ytmd: FakeYtmdServer, member) -> None:
+    await join(hass)
+    await hass.services.async_call(
+        MP_DOMAIN, SERVICE_UNJOIN, {ATTR_ENTITY_ID: MEMBER_ENTITY_ID}, blocking=True
+    )
+    assert group_members(hass, ENTITY_ID) == []
+    assert group_members(hass, MEMBER_ENTITY_ID) == []
+
+    await pause(hass)
+    assert fake_ytmd.command_hosts == [FAKE_HOST]
+
+
+async def test_unloaded_member_leaves_group(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, member
+) -> None:
+    await join(hass)
+    await hass.config_entries.async_unload(member.entry_id)
+    await hass.async_block_till_done()
+    assert group_members(hass, ENTITY_ID) == []
+
+
+async def test_join_other_entity(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            MP_DOMAIN,
+            SERVICE_JOIN,
+            {ATTR_ENTITY_ID: ENTITY_ID, ATTR_GROUP_MEMBERS: ["media_player.other"]},
+            blocking=True,
+        )
+
+
+async def test_members_move_between_groups(hass: HomeAssistant) -> None:
+    groups = YtmdGroups(hass)
+    groups.async_join("a", ["b", "c"])
+    groups.async_join("d", ["c"])
+    assert groups.group_of("a") == ["a", "b"]
+    assert groups.group_of("c") == ["d", "c"]
+
+    # A leader joining another group dissolves its own
+    groups.async_join("a", ["d"])
+    assert groups.group_of("a") == ["a", "b", "d"]
+    assert groups.group_of("c") == []
+
+    groups.async_unjoin("a")
+    assert groups.group_of("b") == []
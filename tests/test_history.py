@@ -0,0 +1,113 @@
+"""Test the play history of the YouTube Music Desktop Remote Control integration."""
+
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from pytest_homeassistant_custom_component.common import async_capture_events
+import pytest
+
+from custom_components.ytmdesktop_remote.const import DOMAIN, EVENT_TRACK_CHANGED
+from custom_components.ytmdesktop_remote.history import Play, PlayHistory
+
+from .fake_ytmd import FakeYtmdServer
+
+
+async def get_history(hass: HomeAssistant, entry_id: str, **data) -> list[str]:
+    response = await hass.services.async_call(
+        DOMAIN,
+        "get_history",
+        {"config_entry_id": entry_id, **data},
+        blocking=True,
+        return_response=True,
+    )
+    return [play["title"] for play in response["plays"]]
+
+
+async def test_track_change_event_and_history(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    events = async_capture_events(hass, EVENT_TRACK_CHANGED)
+    assert await get_history(hass, integration.entry_id) == ["Title"]
+
+    fake_ytmd.state["track"]["title"] = "Next"
+    await coordinator.async_refresh()
+    # Other changes are not a track change
+    fake_ytmd.state["player"]["volumePercent"] = 10
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert len(events) == 1
+    assert events[0].data["entry_id"] == integration.entry_id
+    assert events[0].data["previous"]["title"] == "Title"
+    assert events[0].data["current"]["title"] == "Next"
+    assert events[0].data["current"]["author"] == "Artist"
+    assert "started_at" in events[0].data["current"]
+
+    assert await get_history(hass, integration.entry_id) == ["Next", "Title"]
+    assert await get_history(hass, integration.entry_id, limit=1) == ["Next"]
+
+    with pytest.raises(HomeAssistantError):
+        await get_history(hass, "unknown")
+
+
+async def test_history_survives_restart(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    fake_ytmd.state["track"]["title"] = "Next"
+    await coordinator.async_refresh()
+
+    events = async_capture_events(hass, EVENT_TRACK_CHANGED)
+    await hass.config_entries.async_reload(integration.entry_id)
+    await hass.async_block_till_done()
+
+    # Still the same track, it is not played again
+    assert await get_history(hass, integration.entry_id) == ["Next", "Title"]
+    assert events == []
+
+    with open(
+        hass.data[DOMAIN].coordinators[integration.entry_id].history.path
+    ) as file:
+        assert len(file.readlines()) == 2
+
+
+async def test_history_file_is_compacted(hass: HomeAssistant, tmp_path) -> None:
+    with patch.object(hass.config, "config_dir", str(tmp_path)):
+        history = PlayHistory(hass, "entry", size=3)
+        line_counts = []
+        for number in range(7):
+            history.async_add(Play(number, f"Track {number}", "Artist", "Album", 100))
+            await history.async_flush()
+            with open(history.path) as file:
+                line_counts.append(len(file.readlines()))
+
+        # Appended until there are twice as many lines as plays kept
+        assert line_counts == [1, 2, 3, 4, 5, 6, 3]
+
+        # A line cut off while writing is skipped
+        with open(history.path, "a") as file:
+            file.write('[7,"Track')
+
+        loaded = PlayHistory(hass, "entry", size=3)
+        await loaded.async_load()
+        assert [play.title for play in loaded.recent()] == [
+            "Track 6",
+            "Track 5",
+            "Track 4",
+        ]
+
+        # The next play does not end up on the cut off line
+        loaded.async_add(Play(8, "Track 8", "Artist", "Album", 100))
+        await loaded.async_flush()
+        loaded = PlayHistory(hass, "entry", size=3)
+        await loaded.async_load()
+        assert [play.title for play in loaded.recent()] == [
+            "Track 8",
+            "Track 6",
+            "Track 5",
+        ]
+
+        await loaded.async_remove()
+        assert not list((tmp_path / ".storage").iterdir())
@@ -0,0 +1,107 @@
+"""Test the hub of the YouTube Music Desktop Remote Control integration."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util.dt import utcnow
+from pytest_homeassistant_custom_component.common import (
+    async_fire_time_changed,
+    async_fire_time_changed_exact,
+)
+
+from custom_components.ytmdesktop_remote.client import YtmdClient
+from custom_components.ytmdesktop_remote.const import DOMAIN
+from custom_components.ytmdesktop_remote.coordinator import YtmdCoordinator
+from custom_components.ytmdesktop_remote.hub import YtmdHub
+
+from .fake_ytmd import FakeYtmdServer
+
+
+def mock_coordinator(has_listeners=True):
+    coordinator = Mock()
+    coordinator.has_listeners = has_listeners
+    coordinator.async_handle_scheduled_refresh = AsyncMock()
+    return coordinator
+
+
+async def test_polls_from_one_timer(hass: HomeAssistant) -> None:
+    hub = YtmdHub(hass)
+    coordinators = [mock_coordinator() for _ in range(20)]
+    for coordinator in coordinators:
+        hub.async_schedule(coordinator, timedelta(seconds=6))
+
+    # Jitter spreads the polls over several slots
+    assert hub.scheduled == 20
+    assert len(hub._slots) > 1
+
+    async_fire_time_changed_exact(hass, utcnow() + timedelta(seconds=5.9))
+    await hass.async_block_till_done()
+    assert hub.polls == 0
+
+    # The timer fires once per slot
+    for _ in range(len(hub._slots)):
+        async_fire_time_changed(hass, utcnow() + timedelta(seconds=7))
+        await hass.async_block_till_done()
+    assert hub.polls == 20
+    assert hub.scheduled == 0
+    for coordinator in coordinators:
+        coordinator.async_handle_scheduled_refresh.assert_awaited_once()
+
+
+async def test_unschedule_and_skip(hass: HomeAssistant) -> None:
+    hub = YtmdHub(hass)
+    cancelled = mock_coordinator()
+    unschedule = hub.async_schedule(cancelled, timedelta(seconds=6))
+    without_listeners = mock_coordinator(has_listeners=False)
+    hub.async_schedule(without_listeners, timedelta(seconds=6))
+
+    unschedule()
+    assert hub.scheduled == 1
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=7))
+    await hass.async_block_till_done()
+
+    assert hub.skipped == 1
+    assert hub.polls == 0
+    cancelled.async_handle_scheduled_refresh.assert_not_awaited()
+    without_listeners.async_handle_scheduled_refresh.assert_not_awaited()
+
+
+async def test_concurrent_polls_are_capped(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer
+) -> None:
+    fake_ytmd.latency = 0.05
+    session = fake_ytmd.client_session()
+    hub = YtmdHub(hass, max_concurrent=2)
+    coordinators = [
+        YtmdCoordinator(hass, YtmdClient(session, f"ytmd{i}.test"), session, hub)
+        for i in range(6)
+    ]
+
+    await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators))
+
+    assert all(coordinator.last_update_success for coordinator in coordinators)
+    assert fake_ytmd.state_requests == 6
+    assert fake_ytmd.max_in_flight == 2
+    await session.close()
+
+
+async def test_entries_share_the_hub(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    hub = hass.data[DOMAIN]
+    coordinator = hub.coordinators[integration.entry_id]
+
+    assert coordinator.hub is hub
+    assert hub.metrics()["instances"] == 1
+
+
+async def test_hub_removed_with_last_entry(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    assert await hass.config_entries.async_unload(integration.entry_id)
+    await hass.async_block_till_done()
+
+    assert DOMAIN not in hass.data
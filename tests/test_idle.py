@@ -0,0 +1,175 @@
+"""Test idle suspension of the YouTube Music Desktop Remote Control integration."""
+
+from datetime import timedelta
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.components.media_player import DOMAIN as MP_DOMAIN
+from homeassistant.const import ATTR_ENTITY_ID, CONF_HOST, SERVICE_MEDIA_PAUSE
+from homeassistant.core import HomeAssistant
+from homeassistant.util.dt import utcnow
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.ytmdesktop_remote.const import (
+    CONF_DORMANT,
+    DOMAIN,
+    IDLE_SUSPEND_DELAY,
+)
+from custom_components.ytmdesktop_remote.idle import IdleReason
+
+from . import wait_for
+from .fake_ytmd import FAKE_HOST, FakeYtmdServer
+from .test_last_state import STORED_STATE, storage_key
+from .test_media_player import ENTITY_ID
+
+
+async def setup_entry(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_suspended_without_listeners(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, ytmd_patches
+) -> None:
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_HOST: FAKE_HOST})
+    # Like all entities being disabled
+    with patch("custom_components.ytmdesktop_remote.PLATFORMS", []):
+        await setup_entry(hass, entry)
+    coordinator = hass.data[DOMAIN].coordinators[entry.entry_id]
+
+    assert coordinator.idle.reason is IdleReason.NO_LISTENERS
+    assert fake_ytmd.realtime_clients == 0
+    state_requests = fake_ytmd.state_requests
+    async_fire_time_changed(hass, utcnow() + timedelta(minutes=5))
+    await hass.async_block_till_done()
+    assert fake_ytmd.state_requests == state_requests
+
+    # A listener resumes with an immediate refresh
+    remove_listener = coordinator.async_add_listener(lambda: None)
+    await hass.async_block_till_done()
+    assert not coordinator.idle.suspended
+    assert fake_ytmd.state_requests == state_requests + 1
+    await fake_ytmd.wait_for_realtime_client()
+
+    # Suspended again a while after the last listener is gone
+    remove_listener()
+    assert not coordinator.idle.suspended
+    session = coordinator.api.session
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=IDLE_SUSPEND_DELAY + 1))
+    await hass.async_block_till_done()
+    assert coordinator.idle.reason is IdleReason.NO_LISTENERS
+    await wait_for(lambda: fake_ytmd.realtime_clients == 0)
+    # Without keeping the REST connection alive
+    assert session.closed
+    assert not coordinator.api.session.closed
+
+    metrics = coordinator.idle.metrics()
+    assert metrics["suspensions"] == 2
+    assert metrics["suspended_time"] > 0
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_listener_right_after_suspend(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, ytmd_patches
+) -> None:
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_HOST: FAKE_HOST})
+    with patch("custom_components.ytmdesktop_remote.PLATFORMS", []):
+        await setup_entry(hass, entry)
+    coordinator = hass.data[DOMAIN].coordinators[entry.entry_id]
+    remove_listener = coordinator.async_add_listener(lambda: None)
+    await wait_for(lambda: coordinator.realtime.connected)
+
+    remove_listener()
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=IDLE_SUSPEND_DELAY + 1))
+    assert coordinator.idle.suspended
+    # Back before the realtime channel got to close
+    remove_listener = coordinator.async_add_listener(lambda: None)
+    await hass.async_block_till_done()
+
+    assert not coordinator.idle.suspended
+    await wait_for(lambda: coordinator.realtime.connected)
+    remove_listener()
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_listener_returning_in_time(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    entity = hass.data[MP_DOMAIN].get_entity(ENTITY_ID)
+
+    # Reloading the entities removes and adds the listeners
+    await entity.async_remove()
+    remove_listener = coordinator.async_add_listener(lambda: None)
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=IDLE_SUSPEND_DELAY + 1))
+    await hass.async_block_till_done()
+    assert coordinator.idle.suspensions == 0
+    remove_listener()
+
+
+async def test_dormant_entry(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    fake_ytmd: FakeYtmdServer,
+    ytmd_patches,
+) -> None:
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={CONF_HOST: FAKE_HOST}, options={CONF_DORMANT: True}
+    )
+    hass_storage[storage_key(entry)] = {
+        "version": 1,
+        "key": storage_key(entry),
+        "data": STORED_STATE,
+    }
+    await setup_entry(hass, entry)
+    coordinator = hass.data[DOMAIN].coordinators[entry.entry_id]
+
+    assert coordinator.idle.reason is IdleReason.DORMANT
+    assert hass.states.get(ENTITY_ID).attributes["media_title"] == "Stored title"
+    # Not even the refresh requested when the entities got added
+    async_fire_time_changed(hass, utcnow() + timedelta(minutes=5))
+    await hass.async_block_till_done()
+    assert fake_ytmd.state_requests == 0
+    assert fake_ytmd.realtime_clients == 0
+
+    # A command still gets its refresh, right away
+    await hass.services.async_call(
+        MP_DOMAIN, SERVICE_MEDIA_PAUSE, {ATTR_ENTITY_ID: ENTITY_ID}, blocking=True
+    )
+    await hass.async_block_till_done()
+    assert fake_ytmd.state_requests == 1
+    assert hass.states.get(ENTITY_ID).state == "paused"
+    assert coordinator.idle.suspended
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_polling_disabled_keeps_realtime(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, ytmd_patches
+) -> None:
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={CONF_HOST: FAKE_HOST}, pref_disable_polling=True
+    )
+    await setup_entry(hass, entry)
+    coordinator = hass.data[DOMAIN].coordinators[entry.entry_id]
+
+    assert not coordinator.idle.suspended
+    await fake_ytmd.wait_for_realtime_client()
+
+    # Does not fall back to polling when the channel drops
+    fake_ytmd.realtime_available = False
+    await fake_ytmd.drop_realtime()
+    await wait_for(lambda: not coordinator.realtime.connected)
+    assert coordinator.hub.scheduled == 0
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
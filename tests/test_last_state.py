@@ -0,0 +1,127 @@
+"""Test the fast start of the YouTube Music Desktop Remote Control integration."""
+
+import time
+from typing import Any
+
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ytmdesktop_remote.const import DOMAIN
+
+from . import wait_for
+from .fake_ytmd import FAKE_HOST, FakeYtmdServer
+
+ENTITY_ID = "media_player.youtube_music_desktop"
+
+STORED_STATE = {
+    "title": "Stored title",
+    "author": "Stored artist",
+    "album": "Stored album",
+    "cover": "http://cdn.test/stored.jpg",
+    "duration": 180,
+    "volume_percent": 30,
+    "repeat_type": "ALL",
+}
+
+
+def storage_key(entry: MockConfigEntry) -> str:
+    return f"{DOMAIN}.{entry.entry_id}"
+
+
+async def test_last_state_is_saved(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    fake_ytmd: FakeYtmdServer,
+    integration,
+) -> None:
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    fake_ytmd.state["track"]["title"] = "Saved title"
+    await coordinator.async_refresh()
+
+    await coordinator.last_state.async_flush()
+
+    stored = hass_storage[storage_key(integration)]["data"]
+    assert stored["title"] == "Saved title"
+    assert stored["volume_percent"] == 50
+    assert stored["repeat_type"] == "NONE"
+
+
+async def test_fast_start_from_last_state(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    fake_ytmd: FakeYtmdServer,
+    ytmd_patches,
+) -> None:
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_HOST: FAKE_HOST})
+    entry.add_to_hass(hass)
+    hass_storage[storage_key(entry)] = {
+        "version": 1,
+        "key": storage_key(entry),
+        "data": STORED_STATE,
+    }
+    fake_ytmd.latency = 1
+
+    start = time.monotonic()
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    assert time.monotonic() - start < 0.5
+
+    state = hass.states.get(ENTITY_ID)
+    assert state.state == "paused"
+    assert state.attributes["media_title"] == "Stored title"
+    assert state.attributes["volume_level"] == 0.3
+    assert state.attributes["repeat"] == "all"
+
+    # The real state replaces it once YTMD responded
+    await wait_for(
+        lambda: hass.states.get(ENTITY_ID).attributes["media_title"] == "Title",
+        timeout=3,
+    )
+    assert hass.states.get(ENTITY_ID).state == "playing"
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_fast_start_with_desktop_off(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    fake_ytmd: FakeYtmdServer,
+    ytmd_patches,
+) -> None:
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_HOST: FAKE_HOST})
+    entry.add_to_hass(hass)
+    hass_storage[storage_key(entry)] = {
+        "version": 1,
+        "key": storage_key(entry),
+        "data": STORED_STATE,
+    }
+    fake_ytmd.disconnects = 1000
+
+    # Set up instead of retrying setup, the entity becomes unavailable
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.states.get(ENTITY_ID).state == "unavailable"
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_remove_entry_removes_last_state(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    fake_ytmd: FakeYtmdServer,
+    ytmd_patches,
+) -> None:
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_HOST: FAKE_HOST})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    # Saved on unload
+    assert storage_key(entry) in hass_storage
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert storage_key(entry) not in hass_storage
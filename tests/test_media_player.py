@@ -0,0 +1,102 @@
+"""Test the media player of the YouTube Music Desktop Remote Control integration."""
+
+import asyncio
+from datetime import timedelta
+
+import aioytmdesktopapi
+from homeassistant.components.media_player import (
+    ATTR_MEDIA_VOLUME_LEVEL,
+    DOMAIN as MP_DOMAIN,
+    SERVICE_VOLUME_SET,
+)
+from homeassistant.const import ATTR_ENTITY_ID, SERVICE_MEDIA_PAUSE
+from homeassistant.core import HomeAssistant
+from homeassistant.util.dt import utcnow
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from .fake_ytmd import FakeYtmdServer
+
+ENTITY_ID = "media_player.youtube_music_desktop"
+
+
+async def set_volume(hass: HomeAssistant, volume: float) -> None:
+    await hass.services.async_call(
+        MP_DOMAIN,
+        SERVICE_VOLUME_SET,
+        {ATTR_ENTITY_ID: ENTITY_ID, ATTR_MEDIA_VOLUME_LEVEL: volume},
+        blocking=True,
+    )
+
+
+async def flush_refresh(hass: HomeAssistant) -> None:
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+
+
+async def test_optimistic_state_confirmed(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    await fake_ytmd.drop_realtime()
+    await hass.services.async_call(
+        MP_DOMAIN, SERVICE_MEDIA_PAUSE, {ATTR_ENTITY_ID: ENTITY_ID}, blocking=True
+    )
+    assert hass.states.get(ENTITY_ID).state == "paused"
+    assert fake_ytmd.state_requests == 2
+
+    await flush_refresh(hass)
+    assert fake_ytmd.state_requests == 3
+    assert hass.states.get(ENTITY_ID).state == "paused"
+
+    entity = hass.data[MP_DOMAIN].get_entity(ENTITY_ID)
+    assert not entity._optimistic
+
+
+async def test_optimistic_state_rolled_back(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    fake_ytmd.apply_commands = False
+
+    await set_volume(hass, 0.3)
+    assert hass.states.get(ENTITY_ID).attributes["volume_level"] == 0.3
+
+    await flush_refresh(hass)
+    assert hass.states.get(ENTITY_ID).attributes["volume_level"] == 0.5
+
+
+async def test_failed_command_rolled_back(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    fake_ytmd.command_status = 500
+
+    with pytest.raises(aioytmdesktopapi.RequestError):
+        await set_volume(hass, 0.3)
+    assert hass.states.get(ENTITY_ID).attributes["volume_level"] == 0.5
+
+
+async def test_volume_burst_is_coalesced(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    fake_ytmd.command_latency = 0.05
+
+    await asyncio.gather(*(set_volume(hass, volume / 100) for volume in range(1, 31)))
+
+    # At most the one that was in flight and the final value
+    assert len(fake_ytmd.commands) <= 2
+    assert fake_ytmd.commands[-1]["value"] == 30
+    assert hass.states.get(ENTITY_ID).attributes["volume_level"] == 0.3
+
+    await flush_refresh(hass)
+    assert hass.states.get(ENTITY_ID).attributes["volume_level"] == 0.3
+
+
+async def test_volume_is_rounded_and_can_be_muted(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    # 0.29 * 100 is 28.999999999999996
+    await set_volume(hass, 0.29)
+    await set_volume(hass, 0)
+
+    assert [command["value"] for command in fake_ytmd.commands] == [29, 0]
+    await flush_refresh(hass)
+    assert hass.states.get(ENTITY_ID).attributes["volume_level"] == 0
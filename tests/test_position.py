@@ -0,0 +1,50 @@
+"""Test the media position model."""
+from datetime import timedelta
+
+from homeassistant.util.dt import utcnow
+
+from custom_components.ytmdesktop_remote.position import PositionModel
+
+
+def test_position_extrapolated_while_playing() -> None:
+    model = PositionModel(threshold=2)
+    start = utcnow()
+
+    assert model.update(10, start, True)
+    assert model.predict(start + timedelta(seconds=5)) == 15
+
+    # Within threshold of the prediction, keep the original sample
+    assert not model.update(16, start + timedelta(seconds=5), True)
+    assert model.position == 10
+    assert model.updated_at == start
+
+
+def test_position_drift_updates_sample() -> None:
+    model = PositionModel(threshold=2)
+    start = utcnow()
+    model.update(10, start, True)
+
+    later = start + timedelta(seconds=5)
+    assert model.update(60, later, True)
+    assert model.position == 60
+    assert model.updated_at == later
+
+
+def test_position_paused() -> None:
+    model = PositionModel(threshold=2)
+    start = utcnow()
+    model.update(10, start, True)
+
+    # Pausing always updates, after that position does not move
+    assert model.update(12, start + timedelta(seconds=2), False)
+    assert not model.update(12, start + timedelta(seconds=60), False)
+    assert model.predict(start + timedelta(seconds=60)) == 12
+
+
+def test_position_cleared() -> None:
+    model = PositionModel()
+    assert not model.update(None, utcnow(), False)
+    model.update(10, utcnow(), True)
+    assert model.update(None, utcnow(), False)
+    assert model.position is None
+    assert model.updated_at is None
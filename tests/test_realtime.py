@@ -0,0 +1,116 @@
+"""Test the realtime channel of the YouTube Music Desktop Remote Control integration."""
+from datetime import timedelta
+import time
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util.dt import utcnow
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.ytmdesktop_remote.const import DOMAIN, POLL_INTERVAL_PLAYING
+
+from . import wait_for
+from .fake_ytmd import FakeYtmdServer
+
+ENTITY_ID = "media_player.youtube_music_desktop"
+
+
+async def test_pushed_state_updates_entity(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    """Test state pushed by the server reaches the entity without polling."""
+    await fake_ytmd.wait_for_realtime_client()
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    await wait_for(lambda: coordinator.update_interval is None)
+    requests_before = fake_ytmd.state_requests
+
+    fake_ytmd.state["track"]["title"] = "Next song"
+    start = time.monotonic()
+    await fake_ytmd.push_state()
+    await wait_for(
+        lambda: hass.states.get(ENTITY_ID).attributes["media_title"] == "Next song"
+    )
+
+    assert time.monotonic() - start < 0.5
+    assert fake_ytmd.state_requests == requests_before
+
+
+async def test_position_only_push_is_ignored(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    """Test a push that only moves the seekbar as predicted is not passed on."""
+    await fake_ytmd.wait_for_realtime_client()
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    last_updated = coordinator.data.last_updated
+
+    fake_ytmd.state["player"]["seekbarCurrentPosition"] = 11
+    await fake_ytmd.push_state()
+    fake_ytmd.state["player"]["isPaused"] = True
+    await fake_ytmd.push_state()
+    await wait_for(lambda: hass.states.get(ENTITY_ID).state == "paused")
+
+    assert coordinator.data.last_updated != last_updated
+    assert coordinator.api.player.seekbar_current_position == 11
+
+
+async def test_position_drift_push_updates_entity(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    """Test a seek on the desktop shows up immediately."""
+    await fake_ytmd.wait_for_realtime_client()
+
+    fake_ytmd.state["player"]["seekbarCurrentPosition"] = 100
+    await fake_ytmd.push_state()
+    await wait_for(
+        lambda: hass.states.get(ENTITY_ID).attributes["media_position"] == 100
+    )
+
+
+async def test_fallback_to_polling_and_reconnect(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    """Test polling is used while the stream is down and stops after reconnect."""
+    await fake_ytmd.wait_for_realtime_client()
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    await wait_for(lambda: coordinator.realtime.connects == 1)
+
+    await fake_ytmd.drop_realtime()
+    await wait_for(lambda: coordinator.update_interval == POLL_INTERVAL_PLAYING)
+
+    await wait_for(lambda: coordinator.realtime.connects == 2)
+    assert coordinator.update_interval is None
+
+    # No polling while connected
+    requests_before = fake_ytmd.state_requests
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=30))
+    await hass.async_block_till_done()
+    assert fake_ytmd.state_requests == requests_before
+
+
+async def test_polls_while_stream_is_down(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    """Test the coordinator polls when the realtime channel is unavailable."""
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    await coordinator.realtime.async_stop()
+    coordinator._async_handle_realtime_connection(False)
+    requests_before = fake_ytmd.state_requests
+
+    fake_ytmd.state["track"]["title"] = "Polled song"
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=7))
+    await hass.async_block_till_done()
+
+    assert fake_ytmd.state_requests == requests_before + 1
+    assert hass.states.get(ENTITY_ID).attributes["media_title"] == "Polled song"
+
+
+async def test_pings_measure_latency(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    """Test the latency stays known while the state is pushed instead of polled."""
+    await fake_ytmd.wait_for_realtime_client()
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    await wait_for(lambda: coordinator.stats.get("ping").requests == 1)
+
+    ping = coordinator.stats.get("ping").latency.percentile(50)
+    assert ping is not None
+    assert ping in coordinator.stats.round_trip._samples
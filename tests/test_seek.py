@@ -0,0 +1,126 @@
+"""Test seeking with the YouTube Music Desktop Remote Control integration."""
+
+from datetime import timedelta
+
+from homeassistant.components.media_player import MediaPlayerEntityFeature
+from homeassistant.const import ATTR_SUPPORTED_FEATURES
+from homeassistant.core import HomeAssistant
+from homeassistant.util.dt import utcnow
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.ytmdesktop_remote.const import DOMAIN, SEEK_MIN_INTERVAL
+from custom_components.ytmdesktop_remote.seek import SeekSupport
+
+from . import wait_for
+from .fake_ytmd import FakeYtmdServer
+
+ENTITY_ID = "media_player.youtube_music_desktop"
+
+
+def seeks(fake_ytmd: FakeYtmdServer) -> list[int]:
+    return [
+        command["value"]
+        for command in fake_ytmd.commands
+        if command["command"] == "player-set-seekbar"
+    ]
+
+
+async def fire_throttled(hass: HomeAssistant) -> None:
+    """Let the throttled seek be sent."""
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=SEEK_MIN_INTERVAL))
+    await hass.async_block_till_done()
+
+
+def supports_seek(hass: HomeAssistant) -> bool:
+    features = hass.states.get(ENTITY_ID).attributes[ATTR_SUPPORTED_FEATURES]
+    return bool(features & MediaPlayerEntityFeature.SEEK)
+
+
+async def test_seek_is_throttled_and_confirmed(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    # Paused, so the positions do not move while the test runs
+    fake_ytmd.state["player"]["isPaused"] = True
+    await coordinator.async_refresh()
+    entity = hass.data["media_player"].get_entity(ENTITY_ID)
+    assert supports_seek(hass)
+
+    await entity.async_media_seek(50)
+    assert hass.states.get(ENTITY_ID).attributes["media_position"] == 50
+    assert seeks(fake_ytmd) == [50]
+
+    # Dragging the seek bar, only the final position gets sent
+    for position in (60, 70, 80, 90):
+        await entity.async_media_seek(position)
+        assert hass.states.get(ENTITY_ID).attributes["media_position"] == position
+    assert seeks(fake_ytmd) == [50]
+    await fire_throttled(hass)
+    assert seeks(fake_ytmd) == [50, 90]
+
+    await coordinator.async_refresh()
+    assert coordinator.seek.support is SeekSupport.SUPPORTED
+    assert hass.states.get(ENTITY_ID).attributes["media_position"] == 90
+
+    # Seeking to the start sends the value 0 as well
+    await entity.async_media_seek(0)
+    await fire_throttled(hass)
+    assert seeks(fake_ytmd) == [50, 90, 0]
+
+
+async def test_seek_disabled_when_ignored(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    fake_ytmd.state["player"]["isPaused"] = True
+    fake_ytmd.apply_commands = False
+    await coordinator.async_refresh()
+    entity = hass.data["media_player"].get_entity(ENTITY_ID)
+
+    await entity.async_media_seek(50)
+    assert hass.states.get(ENTITY_ID).attributes["media_position"] == 50
+
+    # YTMD did not move, so the position goes back
+    await coordinator.async_refresh()
+    assert hass.states.get(ENTITY_ID).attributes["media_position"] == 10
+    assert coordinator.seek.support is SeekSupport.UNKNOWN
+    assert supports_seek(hass)
+
+    await entity.async_media_seek(50)
+    await fire_throttled(hass)
+    await coordinator.async_refresh()
+
+    assert coordinator.seek.support is SeekSupport.UNSUPPORTED
+    assert hass.states.get(ENTITY_ID).attributes["media_position"] == 10
+    assert not supports_seek(hass)
+
+    # YTMD might have been updated when it reconnects
+    await fake_ytmd.drop_realtime()
+    await wait_for(lambda: coordinator.realtime.connects == 2)
+    await fake_ytmd.push_state()
+    await wait_for(lambda: supports_seek(hass))
+    assert coordinator.seek.support is SeekSupport.UNKNOWN
+
+
+async def test_seek_not_judged_after_track_change(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    """Test a track change or pause right after a seek does not count as ignored."""
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    fake_ytmd.state["player"]["isPaused"] = True
+    fake_ytmd.apply_commands = False
+    await coordinator.async_refresh()
+    entity = hass.data["media_player"].get_entity(ENTITY_ID)
+
+    await entity.async_media_seek(50)
+    fake_ytmd.state["track"]["title"] = "Next"
+    await coordinator.async_refresh()
+
+    await entity.async_media_seek(50)
+    await fire_throttled(hass)
+    fake_ytmd.state["player"]["isPaused"] = False
+    await coordinator.async_refresh()
+
+    assert coordinator.seek.sent == 2
+    assert coordinator.seek.support is SeekSupport.UNKNOWN
+    assert supports_seek(hass)
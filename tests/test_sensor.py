@@ -0,0 +1,87 @@
+"""Test the sensors of the YouTube Music Desktop Remote Control integration."""
+
+import contextlib
+from unittest.mock import patch
+
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.util.dt import utcnow
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.ytmdesktop_remote.const import DOMAIN
+from custom_components.ytmdesktop_remote.sensor import SCAN_INTERVAL
+
+from . import wait_for
+from .fake_ytmd import FakeYtmdServer
+
+NOW_PLAYING = "sensor.youtube_music_desktop_now_playing"
+VOLUME = "sensor.youtube_music_desktop_volume"
+REPEAT = "sensor.youtube_music_desktop_repeat"
+LATENCY = "sensor.youtube_music_desktop_latency"
+PLAYING = "binary_sensor.youtube_music_desktop_playing"
+# Entities written by the coordinator
+FIELD_ENTITIES = (NOW_PLAYING, VOLUME, REPEAT, PLAYING)
+
+
+async def test_state_sensors(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    state = hass.states.get(NOW_PLAYING)
+    assert state.state == "Title"
+    assert state.attributes["artist"] == "Artist"
+    assert state.attributes["album"] == "Album"
+    assert hass.states.get(VOLUME).state == "50"
+    assert hass.states.get(REPEAT).state == "none"
+    assert hass.states.get(PLAYING).state == "on"
+
+    # Latency is polled, pings measure it while the state is pushed
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    await fake_ytmd.wait_for_realtime_client()
+    await wait_for(lambda: coordinator.stats.get("ping").requests == 1)
+    async_fire_time_changed(hass, utcnow() + SCAN_INTERVAL)
+    await hass.async_block_till_done()
+    latency = coordinator.stats.round_trip.percentile(50)
+    assert hass.states.get(LATENCY).state == str(round(latency * 1000))
+
+
+async def test_sensors_write_only_own_field(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    with contextlib.ExitStack() as stack:
+        writes = {}
+        for entity_id in (*FIELD_ENTITIES, LATENCY):
+            entity = hass.data[entity_id.split(".")[0]].get_entity(entity_id)
+            writes[entity_id] = stack.enter_context(
+                patch.object(
+                    entity, "async_write_ha_state", wraps=entity.async_write_ha_state
+                )
+            )
+
+        fake_ytmd.state["player"]["volumePercent"] = 20
+        await coordinator.async_refresh()
+        assert hass.states.get(VOLUME).state == "20"
+        assert {entity_id: mock.call_count for entity_id, mock in writes.items()} == {
+            NOW_PLAYING: 0,
+            VOLUME: 1,
+            REPEAT: 0,
+            PLAYING: 0,
+            # Polled, it changes on every request
+            LATENCY: 0,
+        }
+
+        fake_ytmd.state["player"]["isPaused"] = True
+        await coordinator.async_refresh()
+        assert hass.states.get(PLAYING).state == "off"
+        assert writes[PLAYING].call_count == 1
+        assert writes[VOLUME].call_count == 1
+
+        # Becoming unavailable is written once for all of them
+        fake_ytmd.disconnects = 1000
+        await coordinator.async_refresh()
+        await coordinator.async_refresh()
+        for entity_id in FIELD_ENTITIES:
+            assert hass.states.get(entity_id).state == STATE_UNAVAILABLE
+        assert writes[NOW_PLAYING].call_count == 1
+        assert writes[PLAYING].call_count == 2
+        assert writes[LATENCY].call_count == 0
@@ -0,0 +1,82 @@
+"""Test the request statistics of the YouTube Music Desktop Remote Control integration."""
+
+import asyncio
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.update_coordinator import UpdateFailed
+import pytest
+
+from custom_components.ytmdesktop_remote.const import DOMAIN
+from custom_components.ytmdesktop_remote.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.ytmdesktop_remote.stats import LatencyHistogram, RequestStats
+
+from .fake_ytmd import FakeYtmdServer
+
+
+def test_latency_histogram() -> None:
+    histogram = LatencyHistogram(samples=10)
+    for latency in (0.005, 0.02, 0.02, 0.3, 5):
+        histogram.record(latency)
+
+    result = histogram.as_dict()
+    assert result["samples"] == 5
+    assert result["p50"] == 0.02
+    assert result["max"] == 5
+    assert result["buckets"]["le_0.01"] == 1
+    assert result["buckets"]["le_0.025"] == 2
+    assert result["buckets"]["le_0.5"] == 1
+    assert result["buckets"]["le_inf"] == 1
+
+    # Only the most recent samples are kept
+    for _ in range(10):
+        histogram.record(0.001)
+    assert histogram.as_dict()["max"] == 0.001
+
+
+def test_measure_errors() -> None:
+    stats = RequestStats()
+
+    with stats.measure("update"):
+        pass
+    with pytest.raises(UpdateFailed), stats.measure("update"):
+        try:
+            raise ConnectionResetError
+        except ConnectionResetError:
+            raise UpdateFailed("Error communicating with API")
+    with pytest.raises(asyncio.TimeoutError), stats.measure("update"):
+        try:
+            raise asyncio.CancelledError
+        except asyncio.CancelledError:
+            raise asyncio.TimeoutError
+
+    update = stats.get("update")
+    assert update.requests == 3
+    assert update.timeouts == 1
+    assert update.errors == {"ConnectionResetError": 1, "TimeoutError": 1}
+    assert len(update.latency) == 1
+    assert stats.as_dict()["update"]["timeout_rate"] == pytest.approx(1 / 3)
+
+
+async def test_diagnostics_and_sensors(
+    hass: HomeAssistant, fake_ytmd: FakeYtmdServer, integration
+) -> None:
+    coordinator = hass.data[DOMAIN].coordinators[integration.entry_id]
+    await coordinator.async_refresh()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, integration)
+    assert diagnostics["requests"]["initialize"]["requests"] == 1
+    assert diagnostics["requests"]["update"]["latency"]["samples"] >= 1
+    assert diagnostics["connections"]["bytes_received"] > 0
+
+    # Diagnostic sensors are disabled by default
+    entity_registry = er.async_get(hass)
+    entity_id = "sensor.youtube_music_desktop_poll_errors"
+    assert entity_registry.async_get(entity_id).disabled_by is not None
+
+    entity_registry.async_update_entity(entity_id, disabled_by=None)
+    await hass.config_entries.async_reload(integration.entry_id)
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == "0"